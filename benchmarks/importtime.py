@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cold-start benchmark of the Storm Workbench CLI.
+
+Each command is executed in a new Python interpreter (with ``-X importtime``)
+to measure the wall time and the time spent importing modules. Examples:
+
+    $ python benchmarks/importtime.py
+    $ python benchmarks/importtime.py --workbench-dir my-project --repeat 10
+    $ python benchmarks/importtime.py --output importtime.jsonl
+
+The ``index ls`` command requires an initialized Workbench (``--workbench-dir``).
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCHMARK_COMMANDS = {
+    "help": ["--help"],
+    "index-ls": ["index", "ls"],
+}
+"""Benchmarked CLI commands."""
+
+IMPORTTIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<name>\s*\S+)$"
+)
+"""Line format produced by the ``-X importtime`` option."""
+
+CLI_RUNNER = (
+    "import sys; from storm_workbench.cli.cli import workbench_cli; "
+    "workbench_cli(sys.argv[1:], prog_name='workbench')"
+)
+"""Code used to invoke the CLI in the benchmark interpreter."""
+
+
+def run_command(arguments, cwd):
+    """Run a CLI command in a new interpreter.
+
+    Args:
+        arguments (List[str]): CLI arguments.
+
+        cwd (Path): Directory where the command is executed.
+
+    Returns:
+        Tuple[float, List[Tuple[str, int]]]: Wall time (in seconds) and the top-level
+        imported modules with their cumulative import time (in microseconds).
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CLI_RUNNER, *arguments],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall_time = time.perf_counter() - start
+
+    imports = []
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+
+        # only the top-level imports (the nested are included in the cumulative time)
+        if match and not match.group("name").startswith("  "):
+            imports.append((match.group("name").strip(), int(match.group("cumulative"))))
+
+    return wall_time, imports
+
+
+def benchmark(name, arguments, cwd, repeat, top):
+    """Benchmark a CLI command.
+
+    Args:
+        name (str): Benchmark name.
+
+        arguments (List[str]): CLI arguments.
+
+        cwd (Path): Directory where the command is executed.
+
+        repeat (int): Number of executions.
+
+        top (int): Number of modules (with the highest import time) reported.
+
+    Returns:
+        dict: Benchmark results.
+    """
+    wall_times, import_times, modules = [], [], {}
+
+    for _ in range(repeat):
+        wall_time, imports = run_command(arguments, cwd)
+
+        wall_times.append(wall_time)
+        import_times.append(sum(cumulative for _, cumulative in imports) / 1e6)
+
+        for module, cumulative in imports:
+            modules.setdefault(module, []).append(cumulative / 1e6)
+
+    slowest_modules = sorted(
+        ((module, statistics.median(times)) for module, times in modules.items()),
+        key=lambda x: x[1],
+        reverse=True,
+    )[:top]
+
+    return {
+        "name": name,
+        "command": " ".join(arguments),
+        "repeat": repeat,
+        "wall_time": statistics.median(wall_times),
+        "import_time": statistics.median(import_times),
+        "slowest_modules": slowest_modules,
+    }
+
+
+def main():
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Executions by command.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules reported.")
+    parser.add_argument(
+        "--workbench-dir",
+        type=Path,
+        default=None,
+        help="Initialized Workbench directory (required by ``index ls``).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="JSON Lines file where the results are appended (to track them over time).",
+    )
+    args = parser.parse_args()
+
+    results = []
+    for name, arguments in BENCHMARK_COMMANDS.items():
+        if name == "index-ls" and args.workbench_dir is None:
+            print(f"{name}: skipped (``--workbench-dir`` is not defined)")
+            continue
+
+        result = benchmark(
+            name, arguments, args.workbench_dir or Path.cwd(), args.repeat, args.top
+        )
+        results.append(result)
+
+        print(
+            f"{name} (workbench {result['command']}): "
+            f"wall {result['wall_time'] * 1e3:.1f} ms, "
+            f"imports {result['import_time'] * 1e3:.1f} ms"
+        )
+        for module, import_time in result["slowest_modules"]:
+            print(f"    {import_time * 1e3:8.1f} ms  {module}")
+
+    if args.output:
+        with args.output.open("a") as output_file:
+            for result in results:
+                result["date"] = datetime.now().isoformat()
+                output_file.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
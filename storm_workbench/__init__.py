@@ -9,9 +9,17 @@
 
 from .version import __version__
 
-from .workbench import Workbench
-
 __all__ = (
     "__version__",
     "Workbench",
 )
+
+
+def __getattr__(name):
+    """Load the Workbench API on the first access (avoid the heavy imports on startup)."""
+    if name == "Workbench":
+        from .workbench import Workbench
+
+        return Workbench
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,10 +5,13 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
-from storm_core import ReproducibleSession
+from typing import TYPE_CHECKING
 
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 
+if TYPE_CHECKING:
+    from storm_core import ReproducibleSession
+
 
 class BaseAccessor:
     """Base Accessor class."""
@@ -23,7 +26,7 @@ class BaseAccessor:
 
 
 class SessionAccessor(BaseAccessor):
-    def __init__(self, config: WorkbenchDefinitionFile, session: ReproducibleSession):
+    def __init__(self, config: WorkbenchDefinitionFile, session: "ReproducibleSession"):
         """Initializer.
 
         Args:
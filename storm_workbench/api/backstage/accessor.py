@@ -7,17 +7,22 @@
 
 from copy import deepcopy
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dynaconf import Dynaconf
 from pydash import py_
-from storm_client import Storm as StormClient
-from storm_core import ReproducibleSession
 
 from storm_workbench.api.accessor import BaseAccessor, SessionAccessor
+from storm_workbench.api.backstage.lookup import IndexLookupTable
 from storm_workbench.api.backstage.session import SessionService
+from storm_workbench.api.backstage.store import ContentStore
+from storm_workbench.workbench.components import WorkbenchComponents
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 from storm_workbench.workbench.store import pass_config
 
+if TYPE_CHECKING:
+    from storm_core import ReproducibleSession
+
 
 class ExecutionAccessor(SessionAccessor):
     """Execution Accessor class.
@@ -28,17 +33,25 @@ class ExecutionAccessor(SessionAccessor):
     <https://github.com/storm-platform/storm-core>.
     """
 
-    def __init__(self, config: WorkbenchDefinitionFile, session: ReproducibleSession):
+    def __init__(
+        self,
+        config: WorkbenchDefinitionFile,
+        session: "ReproducibleSession",
+        index_lookup: IndexLookupTable = None,
+    ):
         """Initializer.
 
         Args:
             config (Dynaconf): Workbench configuration object.
 
             session (ReproducibleSession): Reproducible Session object.
+
+            index_lookup (IndexLookupTable): Name-keyed lookup table of the index.
         """
         super(SessionAccessor, self).__init__(config)
 
         self._session = session
+        self._index_lookup = index_lookup or IndexLookupTable(session)
 
     @property
     def index(self):
@@ -50,6 +63,11 @@ class ExecutionAccessor(SessionAccessor):
         """Reproducible Operations."""
         return self._session.op
 
+    @property
+    def lookup(self):
+        """Name-keyed lookup table of the execution index."""
+        return self._index_lookup
+
 
 class WebServiceAccessor(BaseAccessor):
     """Storm Service Accessor class.
@@ -73,6 +91,8 @@ class WebServiceAccessor(BaseAccessor):
     @property
     def client(self):
         """Storm WS service client."""
+        from storm_client import Storm as StormClient
+
         service_url = py_.get(self._config.definitions, "tool.storm.ws.url")
         service_access_token = py_.get(self._config.definitions, "access-token")
 
@@ -97,7 +117,7 @@ class BackstageAccessor(BaseAccessor):
     def __init__(
         self,
         reproducible_storage: Path,
-        session: ReproducibleSession,
+        components: WorkbenchComponents,
         config: WorkbenchDefinitionFile,
     ):
         """Initializer.
@@ -106,13 +126,14 @@ class BackstageAccessor(BaseAccessor):
             reproducible_storage (Path): Directory where the Workbench session files (e.g., Configuration
             file, database file and so on) are stored.
 
-            config (WorkbenchDefinitionFile): Workbench configuration object.
+            components (WorkbenchComponents): Workbench components (session, graph index and database),
+            created on demand.
 
-            session (ReproducibleSession): Reproducible Session object.
+            config (WorkbenchDefinitionFile): Workbench configuration object.
         """
         super(BackstageAccessor, self).__init__(config)
 
-        self._session = session
+        self._components = components
         self._reproducible_storage = reproducible_storage
 
     @property
@@ -120,6 +141,44 @@ class BackstageAccessor(BaseAccessor):
         """Storage to store the Workbench configuration files."""
         return deepcopy(self._reproducible_storage)  # read-only!
 
+    @property
+    def database(self):
+        """Workbench database, initialized on the first access."""
+        return self._components.database
+
+    @property
+    def checksums(self):
+        """Checksum cache (stored in the Workbench database)."""
+        from storm_workbench.api.backstage.checksum import ChecksumCache
+
+        self._components.database  # initializing the database (if required)
+
+        return ChecksumCache()
+
+    @property
+    def cache(self):
+        """Shared execution cache, defined in the ``[tool.storm.cache]`` section.
+
+        If the cache directory is not defined, None is returned.
+        """
+        cache_definitions = self._config.definitions.tool.storm.get("cache") or {}
+
+        if not cache_definitions.get("path"):
+            return None
+
+        from storm_workbench.api.backstage.cache import ExecutionCache
+
+        return ExecutionCache(
+            cache_definitions.get("path"),
+            max_size=(cache_definitions.get("max_size") or 0) * 1024 * 1024,
+            link_mode=cache_definitions.get("link", "reflink"),
+        )
+
+    @property
+    def store(self):
+        """Content-addressed store with the compendia packages."""
+        return ContentStore(self._reproducible_storage / "objects", self.checksums)
+
     @property
     def ws(self):
         """Service class for Web Services."""
@@ -128,9 +187,15 @@ class BackstageAccessor(BaseAccessor):
     @property
     def execution(self):
         """Execution management service."""
-        return ExecutionAccessor(self._config, self._session)
+        return ExecutionAccessor(
+            self._config, self._components.session, self._components.index_lookup
+        )
 
     @property
     def session(self):
         """Workbench session management service."""
-        return SessionService(self._reproducible_storage, self._session)
+        return SessionService(
+            self._reproducible_storage,
+            self._components.session,
+            self._components.graph_storage,
+        )
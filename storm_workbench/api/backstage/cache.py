@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Shared execution cache."""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from storm_workbench.api.backstage.store import link_file
+
+CACHE_LOCK_FILE = ".lock"
+"""Lock file of the cache (shared by publishes and checkouts, exclusive in evictions)."""
+
+CACHE_MANIFEST_FILE = "manifest.json"
+"""Description of a cache entry (its last modification is the last use of the entry)."""
+
+CACHE_DOCUMENTS_FILE = "documents.pickle"
+"""File with the indexed documents of the compendia of a cache entry."""
+
+
+def _unique_name(name: str) -> str:
+    """Temporary name unique by process and thread (concurrent writers are safe)."""
+    return f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class ExecutionCache:
+    """Shared execution cache.
+
+    The cache is a directory shared by many workbenches (e.g., of the analysts of a
+    server), where the finished executions are published. Each entry describes the
+    compendia produced by an execution request (with their fingerprints) and references
+    the compendia packages and outputs, stored by content
+    (``objects/<algorithm>/<checksum[:2]>/<checksum>``).
+
+    Entries are created in a temporary directory and published with a rename, so
+    the concurrent writers never expose partial entries. When the cache exceeds its
+    maximum size, the least recently used entries (and the objects only used by them)
+    are removed.
+
+    Note:
+        With the ``hardlink`` link mode, the files linked from the cache share its content.
+        So, they must not be modified in place (the linked files are verified on checkout,
+        and the corrupted entries are removed). The default ``reflink`` mode (copy-on-write,
+        with a copy fallback) never shares the content with the workbench files.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], max_size: int = None, link_mode: str = "reflink"
+    ):
+        """Initializer.
+
+        Args:
+            path (Union[str, Path]): Cache directory.
+
+            max_size (int): Maximum size of the cache (in bytes). If not defined, the
+            cache is not bounded.
+
+            link_mode (str): Mode used to link the cached files in the workbench (see
+            ``storm_workbench.api.backstage.store.link_file``).
+        """
+        self._path = Path(path).expanduser()
+        self._max_size = max_size
+        self._link_mode = link_mode
+
+    @property
+    def path(self) -> Path:
+        """Cache directory."""
+        return self._path
+
+    def _object_path(self, algorithm: str, checksum: str) -> Path:
+        """Path of an object in the cache."""
+        return self._path / "objects" / algorithm / checksum[:2] / checksum
+
+    def _entry_dir(self, entry_id: str) -> Path:
+        """Directory of an entry."""
+        return self._path / "entries" / entry_id
+
+    def _request_dir(self, request: str) -> Path:
+        """Directory with the entries (markers) of a request."""
+        return self._path / "requests" / request
+
+    @contextmanager
+    def _lock(self, exclusive: bool = False):
+        """Lock the cache (only available in POSIX systems)."""
+        self._path.mkdir(parents=True, exist_ok=True)
+
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+
+        with (self._path / CACHE_LOCK_FILE).open("a") as lock_file:
+            fcntl.flock(
+                lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            )
+
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _entry_objects(entry: Dict) -> List[Tuple[str, str]]:
+        """Objects (hash algorithm and checksum) referenced by an entry."""
+        objects = []
+
+        for compendium in entry["compendia"]:
+            objects.append(
+                (compendium["package"]["algorithm"], compendium["package"]["checksum"])
+            )
+            objects.extend(
+                (output["algorithm"], output["checksum"])
+                for output in compendium["outputs"]
+            )
+
+        return objects
+
+    def entries(self, request: str) -> List[Dict]:
+        """Entries published for an execution request.
+
+        Args:
+            request (str): Request digest.
+
+        Returns:
+            List[Dict]: Entries (most recently used first).
+        """
+        request_dir = self._request_dir(request)
+
+        if not request_dir.is_dir():
+            return []
+
+        entries = []
+
+        for marker in request_dir.iterdir():
+            manifest_file = self._entry_dir(marker.name) / CACHE_MANIFEST_FILE
+
+            try:
+                entries.append(
+                    (
+                        manifest_file.stat().st_mtime,
+                        json.loads(manifest_file.read_text()),
+                    )
+                )
+            except (OSError, ValueError):
+                continue
+
+        entries = sorted(entries, key=lambda x: x[0], reverse=True)
+        return [entry for _, entry in entries]
+
+    def documents(self, entry: Dict) -> List[object]:
+        """Indexed documents of the compendia of an entry.
+
+        Args:
+            entry (Dict): Cache entry.
+
+        Returns:
+            List[object]: Indexed compendia (in execution order).
+        """
+        with (self._entry_dir(entry["id"]) / CACHE_DOCUMENTS_FILE).open("rb") as ifile:
+            return pickle.load(ifile)
+
+    def publish(
+        self,
+        request: str,
+        working_directory: Union[str, Path],
+        compendia: List[Dict],
+        documents: List[object],
+        files: Dict[Tuple[str, str], Path],
+    ) -> bool:
+        """Publish an execution.
+
+        Args:
+            request (str): Request digest.
+
+            working_directory (Union[str, Path]): Working directory of the execution.
+
+            compendia (List[Dict]): Description of the compendia (``name``, ``command``, ``fingerprint``,
+            ``inputs``, ``outputs`` and ``package``).
+
+            documents (List[object]): Indexed documents of the compendia (in execution order).
+
+            files (Dict[Tuple[str, str], Path]): Files (by hash algorithm and checksum) of the
+            compendia packages and outputs.
+
+        Returns:
+            bool: Flag indicating if the entry was published. If the entry is already
+            published (e.g., by other workbench), it is only marked as used.
+        """
+        entry_id = hashlib.sha256(
+            json.dumps(
+                [request, sorted(compendium["fingerprint"] for compendium in compendia)]
+            ).encode("utf-8")
+        ).hexdigest()
+
+        entry_dir = self._entry_dir(entry_id)
+
+        if entry_dir.is_dir():
+            self.touch({"id": entry_id})
+            return False
+
+        with self._lock():
+            # objects: the files are copied (or cloned), so the published objects
+            # don't share the content with the workbench files.
+            for (algorithm, checksum), file in files.items():
+                object_path = self._object_path(algorithm, checksum)
+
+                if not object_path.is_file():
+                    object_path.parent.mkdir(parents=True, exist_ok=True)
+                    object_tmp = object_path.with_name(_unique_name(checksum))
+
+                    link_file(file, object_tmp, mode="reflink")
+                    os.replace(object_tmp, object_path)
+
+            # entry: created in a temporary directory and published with a rename.
+            entry_tmp = self._path / "entries" / _unique_name(entry_id)
+            entry_tmp.mkdir(parents=True)
+
+            with (entry_tmp / CACHE_DOCUMENTS_FILE).open("wb") as ofile:
+                pickle.dump(documents, ofile, protocol=pickle.HIGHEST_PROTOCOL)
+            (entry_tmp / CACHE_MANIFEST_FILE).write_text(
+                json.dumps(
+                    {
+                        "id": entry_id,
+                        "request": request,
+                        "created": datetime.now().isoformat(),
+                        "working_directory": str(working_directory),
+                        "compendia": compendia,
+                    },
+                    indent=2,
+                )
+            )
+
+            try:
+                os.rename(entry_tmp, entry_dir)
+            except OSError:
+                # published by other writer.
+                shutil.rmtree(entry_tmp, ignore_errors=True)
+                return False
+
+            request_dir = self._request_dir(request)
+            request_dir.mkdir(parents=True, exist_ok=True)
+
+            (request_dir / entry_id).touch()
+
+        self.evict()
+        return True
+
+    def checkout(
+        self, entry: Dict, files: Iterable[Tuple[str, str, Union[str, Path]]]
+    ) -> bool:
+        """Link the files of an entry in the workbench.
+
+        Args:
+            entry (Dict): Cache entry.
+
+            files (Iterable[Tuple[str, str, Union[str, Path]]]): Files (hash algorithm, checksum
+            and target path) to be linked.
+
+        Returns:
+            bool: Flag indicating if all files were linked. If any object was evicted, False
+            is returned.
+        """
+        with self._lock():
+            if not self._entry_dir(entry["id"]).is_dir():
+                return False
+
+            for algorithm, checksum, target in files:
+                object_path = self._object_path(algorithm, checksum)
+
+                if not object_path.is_file():
+                    return False
+
+                target = Path(target)
+                target.parent.mkdir(parents=True, exist_ok=True)
+
+                link_file(object_path, target, mode=self._link_mode)
+
+        self.touch(entry)
+        return True
+
+    def touch(self, entry: Dict):
+        """Mark an entry as used (for the LRU eviction)."""
+        try:
+            os.utime(self._entry_dir(entry["id"]) / CACHE_MANIFEST_FILE)
+        except OSError:
+            pass
+
+    def remove(self, entry: Dict):
+        """Remove an entry (e.g., with corrupted objects).
+
+        The objects not used by other entries are removed in the next eviction.
+        """
+        with self._lock(exclusive=True):
+            self._remove_entry(entry)
+
+    def _remove_entry(self, entry: Dict):
+        """Remove an entry (the cache must be locked)."""
+        (self._request_dir(entry["request"]) / entry["id"]).unlink(missing_ok=True)
+
+        entry_dir = self._entry_dir(entry["id"])
+
+        if entry_dir.is_dir():
+            entry_tmp = entry_dir.with_name(_unique_name(entry["id"]))
+
+            os.rename(entry_dir, entry_tmp)
+            shutil.rmtree(entry_tmp, ignore_errors=True)
+
+    def evict(self) -> int:
+        """Remove the least recently used entries while the cache exceeds its maximum size.
+
+        Returns:
+            int: Number of bytes released.
+        """
+        released = 0
+
+        if not self._max_size:
+            return released
+
+        with self._lock(exclusive=True):
+            # temporary files of interrupted publishes (no publish is running).
+            for temp_path in self._path.glob("entries/.*"):
+                shutil.rmtree(temp_path, ignore_errors=True)
+
+            for temp_path in self._path.glob("objects/*/*/.*"):
+                temp_path.unlink(missing_ok=True)
+
+            entries = []
+
+            for manifest_file in self._path.glob(f"entries/*/{CACHE_MANIFEST_FILE}"):
+                try:
+                    entries.append(
+                        (
+                            manifest_file.stat().st_mtime,
+                            json.loads(manifest_file.read_text()),
+                        )
+                    )
+                except (OSError, ValueError):
+                    continue
+
+            entries = [entry for _, entry in sorted(entries, key=lambda x: x[0])]
+
+            references = Counter(
+                cache_object
+                for entry in entries
+                for cache_object in set(self._entry_objects(entry))
+            )
+
+            # objects size (the objects not referenced are removed).
+            objects_size = {}
+
+            for object_path in self._path.glob("objects/*/*/*"):
+                cache_object = (object_path.parent.parent.name, object_path.name)
+
+                if references[cache_object]:
+                    objects_size[cache_object] = object_path.stat().st_size
+                else:
+                    released += object_path.stat().st_size
+                    object_path.unlink()
+
+            cache_size = sum(objects_size.values())
+
+            for entry in entries:
+                if cache_size <= self._max_size:
+                    break
+
+                self._remove_entry(entry)
+
+                for cache_object in set(self._entry_objects(entry)):
+                    references[cache_object] -= 1
+
+                    if not references[cache_object] and cache_object in objects_size:
+                        self._object_path(*cache_object).unlink(missing_ok=True)
+
+                        released += objects_size[cache_object]
+                        cache_size -= objects_size.pop(cache_object)
+
+        return released
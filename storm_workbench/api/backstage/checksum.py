@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Checksum cache of the workbench files."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+import peewee
+
+from storm_workbench.api.backstage.database import db
+from storm_workbench.api.backstage.database.model import FileChecksumModel
+from storm_workbench.api.backstage.store import hash_file
+
+
+def _file_identity(path: Path) -> Dict[str, int]:
+    """File identity and state used to validate a cached checksum."""
+    file_stat = os.stat(path)
+
+    return {
+        "inode": file_stat.st_ino,
+        "size": file_stat.st_size,
+        "mtime_ns": file_stat.st_mtime_ns,
+    }
+
+
+class ChecksumCache:
+    """Checksum cache.
+
+    The checksums generated by the Workbench are stored in the Workbench
+    database, keyed by the file path, inode, size and modification time (in
+    nanoseconds). So, a file is hashed again only when it is replaced or modified.
+
+    Note:
+        The cache uses the Workbench database. So, it must be initialized before the
+        cache usage (e.g., with the ``BackstageAccessor.database``).
+    """
+
+    def get(self, path: Union[str, Path], algorithm: str) -> Union[None, str]:
+        """Get the cached checksum of a file.
+
+        Args:
+            path (Union[str, Path]): File path.
+
+            algorithm (str): Hash algorithm.
+
+        Returns:
+            Union[None, str]: The cached checksum. If the file is not cached (or it was
+            modified after the checksum generation), ``None`` is returned.
+        """
+        path = Path(path).absolute()
+
+        record = FileChecksumModel.get_or_none(
+            FileChecksumModel.path == str(path),
+            FileChecksumModel.algorithm == algorithm,
+        )
+
+        if record and _file_identity(path) == {
+            "inode": record.inode,
+            "size": record.size,
+            "mtime_ns": record.mtime_ns,
+        }:
+            return record.checksum
+
+        return None
+
+    def put(self, path: Union[str, Path], algorithm: str, checksum: str):
+        """Cache the checksum of a file.
+
+        Args:
+            path (Union[str, Path]): File path.
+
+            algorithm (str): Hash algorithm.
+
+            checksum (str): File checksum (generated with the current file content).
+        """
+        self.put_many([(path, algorithm, checksum)])
+
+    def put_many(self, checksums: Iterable[tuple]):
+        """Cache the checksum of many files (in one transaction).
+
+        Args:
+            checksums (Iterable[tuple]): Tuples with the file path, the hash algorithm
+            and the file checksum.
+        """
+        records = []
+
+        for path, algorithm, checksum in checksums:
+            path = Path(path).absolute()
+
+            records.append(
+                dict(
+                    path=str(path),
+                    algorithm=algorithm,
+                    checksum=checksum,
+                    **_file_identity(path),
+                )
+            )
+
+        with db.atomic():
+            for batch in peewee.chunked(records, 100):
+                FileChecksumModel.replace_many(batch).execute()
+
+    def digest(self, path: Union[str, Path], algorithm: str) -> str:
+        """Get the checksum of a file (it is generated only if not cached).
+
+        Args:
+            path (Union[str, Path]): File path.
+
+            algorithm (str): Hash algorithm.
+
+        Returns:
+            str: File checksum.
+        """
+        return self.digest_many([path], algorithm)[0]
+
+    def digest_many(
+        self, paths: Iterable[Union[str, Path]], algorithm: str, jobs: int = 1
+    ) -> list:
+        """Get the checksum of many files (only the files not cached are hashed).
+
+        Args:
+            paths (Iterable[Union[str, Path]]): Files path.
+
+            algorithm (str): Hash algorithm.
+
+            jobs (int): Number of threads used to hash the files not cached.
+
+        Returns:
+            list: Checksum of the files (in the same order of the ``paths``).
+        """
+        paths = list(paths)
+        checksums = [self.get(path, algorithm) for path in paths]
+
+        missing = [idx for idx, checksum in enumerate(checksums) if checksum is None]
+        missing_identity = {idx: _file_identity(paths[idx]) for idx in missing}
+
+        # hashing the files not cached (the hash functions release the GIL).
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+            generated = executor.map(
+                lambda idx: hash_file(paths[idx], algorithm), missing
+            )
+
+            for idx, checksum in zip(missing, generated):
+                checksums[idx] = checksum
+
+        # files modified during the hashing are not cached.
+        cacheable = [
+            (paths[idx], algorithm, checksums[idx])
+            for idx in missing
+            if _file_identity(paths[idx]) == missing_identity[idx]
+        ]
+
+        if cacheable:
+            self.put_many(cacheable)
+
+        return checksums
@@ -24,20 +24,28 @@ def init_database(path: Path, **kwargs):
         For more details about the ``peewee.SqliteDatabase.init``, please check the
         official documentation: http://docs.peewee-orm.com/en/latest/peewee/database.html#run-time-database-configuration
     """
-    # checking if file exists before the init
-    is_to_create_tables = False
-
-    if not path.is_file():
-        is_to_create_tables = True
-
     # initializing the database
     db.init(Path("sqlite://") / path, **kwargs)
 
-    if is_to_create_tables:
-        # in a near future, if needed, we can use a object factory to
-        # avoid circular imports.
-        from storm_workbench.api.backstage.database.model import (
+    # in a near future, if needed, we can use a object factory to
+    # avoid circular imports.
+    from storm_workbench.api.backstage.database.model import (
+        ExecutionCompendiumModel,
+        ExecutionDurationModel,
+        ExecutionFingerprintModel,
+        FileChecksumModel,
+        WorkbenchStateModel,
+    )
+
+    # note: tables are created only if they don't exist. This allows
+    # databases created by previous versions to receive the new models.
+    db.create_tables(
+        [
             ExecutionCompendiumModel,
-        )
-
-        db.create_tables([ExecutionCompendiumModel])
+            ExecutionDurationModel,
+            ExecutionFingerprintModel,
+            FileChecksumModel,
+            WorkbenchStateModel,
+        ],
+        safe=True,
+    )
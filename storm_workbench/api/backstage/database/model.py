@@ -52,3 +52,85 @@ class ExecutionCompendiumModel(BaseModel):
 
     status = peewee.CharField(null=False)
     """Execution status."""
+
+
+class WorkbenchStateModel(BaseModel):
+    """Workbench state model class.
+
+    Key-value records used by the Workbench to store its internal
+    control information (e.g., the last index generation synchronized
+    with the database).
+    """
+
+    key = peewee.CharField(primary_key=True)
+    """State key."""
+
+    value = peewee.TextField(null=True)
+    """State value."""
+
+
+class FileChecksumModel(BaseModel):
+    """File checksum model class.
+
+    Checksums already generated by the Workbench. A checksum is valid
+    while the file identity and state (inode, size and modification time)
+    are the same used to generate it.
+    """
+
+    path = peewee.TextField()
+    """Absolute file path."""
+
+    algorithm = peewee.CharField()
+    """Hash algorithm."""
+
+    inode = peewee.IntegerField()
+    """File inode."""
+
+    size = peewee.IntegerField()
+    """File size (in bytes)."""
+
+    mtime_ns = peewee.IntegerField()
+    """File modification time (in nanoseconds)."""
+
+    checksum = peewee.CharField()
+    """File checksum."""
+
+    class Meta:
+        primary_key = peewee.CompositeKey("path", "algorithm")
+
+
+class ExecutionFingerprintModel(BaseModel):
+    """Execution fingerprint model class.
+
+    Fingerprint of the execution that produced an Execution Compendium (command,
+    inputs checksums, environment and executor options). When the same execution
+    is requested again with the same fingerprint, the compendium is reused.
+    """
+
+    uuid = peewee.UUIDField(primary_key=True)
+    """Execution compendium identifier."""
+
+    request = peewee.CharField(null=True, index=True)
+    """Digest of the execution request (command or Stormfile) that produced the compendium."""
+
+    fingerprint = peewee.CharField()
+    """Execution fingerprint."""
+
+
+class ExecutionDurationModel(BaseModel):
+    """Execution duration model class.
+
+    Duration of the executions of an Execution Compendium. The recorded durations
+    are used to estimate the cost of the next executions (e.g., in the update plan).
+    The executors don't report per-compendium timings, so each duration is a split of
+    the wall time of the run that executed the compendium.
+    """
+
+    uuid = peewee.UUIDField(primary_key=True)
+    """Execution compendium identifier."""
+
+    duration = peewee.FloatField()
+    """Mean duration (in seconds) of the executions (split of the run wall time)."""
+
+    executions = peewee.IntegerField(default=1)
+    """Number of recorded executions."""
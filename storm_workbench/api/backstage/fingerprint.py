@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Execution fingerprints (reuse of unchanged executions)."""
+
+import fnmatch
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from pydash import py_
+
+from storm_workbench.api.backstage.checksum import ChecksumCache
+
+FINGERPRINT_ALGORITHM = "sha256"
+"""Hash algorithm used to generate the fingerprints."""
+
+VOLATILE_ENVIRONMENT_VARIABLES = ["_", "OLDPWD", "SHLVL"]
+"""Environment variables changed by the shell between executions (not fingerprinted)."""
+
+
+def request_digest(
+    command: List[str] = None, stormfile: Union[str, Path] = None
+) -> str:
+    """Generate the digest of an execution request.
+
+    Args:
+        command (List[str]): Command to be executed.
+
+        stormfile (Union[str, Path]): Stormfile with the description of an execution workflow.
+
+    Returns:
+        str: Request digest (of the command or the Stormfile content).
+    """
+    request_hash = hashlib.new(FINGERPRINT_ALGORITHM)
+
+    if command:
+        request_hash.update(json.dumps(["command", list(command)]).encode("utf-8"))
+
+    else:
+        request_hash.update(b'["stormfile"]')
+        request_hash.update(Path(stormfile).read_bytes())
+
+    return request_hash.hexdigest()
+
+
+def execution_environment(
+    ignored_environment_variables: List[str] = None,
+    included_environment_variables: List[str] = None,
+) -> Dict:
+    """Environment variables of the current execution.
+
+    Args:
+        ignored_environment_variables (List[str]): Environment variables (or patterns) removed
+        from the reproducible bundle.
+
+        included_environment_variables (List[str]): Environment variables (or patterns) used. If
+        not defined, all variables are used.
+
+    Returns:
+        Dict: Environment variables (the ignored and volatile ones are removed).
+    """
+    ignored = VOLATILE_ENVIRONMENT_VARIABLES + list(ignored_environment_variables or [])
+
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if not any(fnmatch.fnmatchcase(name, pattern) for pattern in ignored)
+        and (
+            included_environment_variables is None
+            or any(
+                fnmatch.fnmatchcase(name, pattern)
+                for pattern in included_environment_variables
+            )
+        )
+    }
+
+
+def relative_key(key: str, working_directory: Union[str, Path]) -> str:
+    """Key of a file relative to the working directory.
+
+    Args:
+        key (str): File key (path).
+
+        working_directory (Union[str, Path]): Working directory.
+
+    Returns:
+        str: Relative key. Files outside the working directory keep their key.
+    """
+    try:
+        return Path(key).relative_to(working_directory).as_posix()
+    except ValueError:
+        return key
+
+
+def compendium_files(
+    compendium, key: str, working_directory: Union[str, Path]
+) -> List[Tuple[str, str, str]]:
+    """Files recorded in a compendium.
+
+    Args:
+        compendium (object): Indexed Execution Compendium (or its description).
+
+        key (str): Files attribute (``inputs`` or ``outputs``).
+
+        working_directory (Union[str, Path]): Working directory of the execution.
+
+    Returns:
+        List[Tuple[str, str, str]]: Files (key relative to the working directory, hash
+        algorithm and checksum).
+    """
+    return [
+        (
+            relative_key(file["key"], working_directory),
+            file["algorithm"],
+            file["checksum"],
+        )
+        for file in py_.get(compendium, key, None) or []
+    ]
+
+
+def execution_fingerprint(
+    command: str,
+    inputs: Iterable[Tuple[str, str, str]],
+    environment: Dict,
+    executor: Dict,
+) -> str:
+    """Generate the fingerprint of an execution.
+
+    Args:
+        command (str): Executed command.
+
+        inputs (Iterable[Tuple[str, str, str]]): Inputs (file key, hash algorithm and checksum).
+
+        environment (Dict): Environment variables.
+
+        executor (Dict): Executor definitions (type and options).
+
+    Returns:
+        str: Execution fingerprint.
+    """
+    fingerprint_content = json.dumps(
+        dict(
+            command=command,
+            inputs=sorted(inputs),
+            environment=sorted(environment.items()),
+            executor=executor,
+        ),
+        sort_keys=True,
+        default=str,
+    )
+
+    return hashlib.new(
+        FINGERPRINT_ALGORITHM, fingerprint_content.encode("utf-8")
+    ).hexdigest()
+
+
+class ExecutionMemo:
+    """Execution memoization.
+
+    An execution is identified by a fingerprint (command, inputs checksums, environment
+    and executor options). The fingerprint of an Execution Compendium is generated with
+    the inputs checksums recorded in the compendium. The current fingerprint is generated
+    with the checksums of the inputs in the working directory. When both are the same (and
+    the outputs were not modified), the execution can be reused.
+
+    The inputs are identified by their path relative to the working directory, so the
+    fingerprints of workbenches stored in different directories can be compared.
+    """
+
+    def __init__(
+        self,
+        checksums: ChecksumCache,
+        working_directory: Union[str, Path],
+        environment: Dict,
+        executor: Dict,
+        jobs: int = None,
+    ):
+        """Initializer.
+
+        Args:
+            checksums (ChecksumCache): Checksum cache used to hash the inputs/outputs.
+
+            working_directory (Union[str, Path]): Working directory of the executions.
+
+            environment (Dict): Environment variables (see ``execution_environment``).
+
+            executor (Dict): Executor definitions (type and options).
+
+            jobs (int): Number of threads used to hash the files (default: number of CPUs).
+        """
+        self._checksums = checksums
+        self._working_directory = Path(working_directory)
+
+        self._environment = environment
+        self._executor = executor
+
+        self._jobs = jobs or os.cpu_count()
+
+    def files(self, compendium, key: str) -> List[Tuple[str, str, str]]:
+        """Files recorded in a compendium (see ``compendium_files``)."""
+        return compendium_files(compendium, key, self._working_directory)
+
+    def fingerprint(self, compendium) -> str:
+        """Fingerprint of a compendium (with the recorded inputs checksums).
+
+        Args:
+            compendium (object): Indexed Execution Compendium (or its description).
+
+        Returns:
+            str: Execution fingerprint.
+        """
+        return execution_fingerprint(
+            str(py_.get(compendium, "command")),
+            self.files(compendium, "inputs"),
+            self._environment,
+            self._executor,
+        )
+
+    def current_fingerprint(
+        self, compendium, provided: Dict[str, str] = None, check_outputs: bool = True
+    ) -> Union[None, str]:
+        """Fingerprint of a compendium (with the current inputs checksums).
+
+        Args:
+            compendium (object): Indexed Execution Compendium (or its description).
+
+            provided (Dict[str, str]): Checksums (by relative key) of the files that will be
+            provided (e.g., by other compendia). These files are not read.
+
+            check_outputs (bool): Flag indicating if the outputs must be available in the
+            working directory (without modifications).
+
+        Returns:
+            Union[None, str]: Execution fingerprint. If an input/output is missing (or an
+            output was modified since the execution), None is returned.
+        """
+        provided = provided or {}
+
+        inputs = self.files(compendium, "inputs")
+        outputs = self.files(compendium, "outputs") if check_outputs else []
+
+        files = [file for file in inputs + outputs if file[0] not in provided]
+        files_path = [self._working_directory / key for key, _, _ in files]
+
+        if not all(path.is_file() for path in files_path):
+            return None
+
+        # hashing the files (grouped by algorithm).
+        checksums = [None] * len(files)
+
+        for algorithm, files_idx in py_.group_by(
+            range(len(files)), lambda idx: files[idx][1]
+        ).items():
+            algorithm_checksums = self._checksums.digest_many(
+                [files_path[idx] for idx in files_idx], algorithm, self._jobs
+            )
+
+            for idx, checksum in zip(files_idx, algorithm_checksums):
+                checksums[idx] = checksum
+
+        checksums = dict(zip((key for key, _, _ in files), checksums))
+        checksums.update(provided)
+
+        # the outputs must be the same generated by the execution.
+        if any(
+            checksums[key] != output_checksum for key, _, output_checksum in outputs
+        ):
+            return None
+
+        return execution_fingerprint(
+            str(py_.get(compendium, "command")),
+            [(key, algorithm, checksums[key]) for key, algorithm, _ in inputs],
+            self._environment,
+            self._executor,
+        )
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Ancestor subgraphs of the graph index (partial reproductions)."""
+
+from typing import Iterable, List
+
+from igraph import Graph
+
+from storm_workbench.exceptions import ExecutionCompendiumNotFound
+
+
+def find_vertex(graph: Graph, name: str) -> int:
+    """Find a vertex of the graph index by its name.
+
+    Args:
+        graph (Graph): Graph index.
+
+        name (str): Vertex name (Execution Compendium UUID). A unique
+        prefix of the name is also accepted.
+
+    Returns:
+        int: Vertex index.
+
+    Raises:
+        ExecutionCompendiumNotFound: When no vertex matches the name.
+
+        ValueError: When the name prefix matches many vertices.
+    """
+    names = [str(vertex) for vertex in graph.vs["name"]] if graph.vcount() else []
+
+    if name in names:
+        return names.index(name)
+
+    matches = [idx for idx, vertex in enumerate(names) if vertex.startswith(name)]
+
+    if not matches:
+        raise ExecutionCompendiumNotFound(f"Execution Compendium not found: {name}")
+
+    if len(matches) > 1:
+        raise ValueError(
+            f"Ambiguous Execution Compendium name: {name} (matches: "
+            f"{', '.join(names[idx] for idx in matches)})"
+        )
+
+    return matches[0]
+
+
+def ancestors(graph: Graph, names: Iterable[str]) -> List[int]:
+    """Find the vertices required to execute the named vertices (themselves and their ancestors).
+
+    Args:
+        graph (Graph): Graph index (the edges go from a vertex to its successors).
+
+        names (Iterable[str]): Vertices names (see ``find_vertex``).
+
+    Returns:
+        List[int]: Vertices indices (sorted).
+    """
+    vertices = set()
+
+    for name in names:
+        vertices.update(graph.subcomponent(find_vertex(graph, name), mode="in"))
+
+    return sorted(vertices)
+
+
+def ancestors_subgraph(graph: Graph, names: Iterable[str]) -> Graph:
+    """Create the minimal subgraph required to execute the named vertices.
+
+    Args:
+        graph (Graph): Graph index.
+
+        names (Iterable[str]): Vertices names (see ``find_vertex``).
+
+    Returns:
+        Graph: Subgraph induced by the named vertices and their ancestors (with
+        the vertices and edges attributes).
+    """
+    return graph.induced_subgraph(ancestors(graph, names))
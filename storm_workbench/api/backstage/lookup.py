@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Name-keyed lookup table of the graph index."""
+
+from typing import TYPE_CHECKING, Dict, Tuple, Union
+
+from storm_workbench.api.backstage.session import index_generation
+
+if TYPE_CHECKING:
+    from storm_core import ReproducibleSession
+
+
+class IndexLookupTable:
+    """Name-keyed lookup table for the graph index.
+
+    Searching a vertex by name in the graph index is a linear scan. This
+    table maps each vertex name to its position in the graph, its indexed
+    document and its status, so the services can find an indexed compendium
+    in constant time.
+
+    The table is built on the first access and it is rebuilt only when the
+    index generation changes (i.e., when the Workbench indexes or deindexes
+    compendia).
+    """
+
+    def __init__(self, session: "ReproducibleSession"):
+        """Initializer.
+
+        Args:
+            session (ReproducibleSession): Reproducible Session object.
+        """
+        self._session = session
+
+        self._entries = {}
+        self._generation = None
+
+    @property
+    def entries(self) -> Dict[str, Tuple[int, object, str]]:
+        """Table entries: ``name -> (vertex index, indexed compendium, status)``."""
+        generation = index_generation(self._session)
+
+        if generation != self._generation:
+            self._build()
+            self._generation = generation
+
+        return self._entries
+
+    def _build(self):
+        """Build the table reading the index in a single pass."""
+        graph = self._session.index.graph_manager.graph
+
+        vertices = {
+            name: vertex_index
+            for vertex_index, name in enumerate(
+                graph.vs["name"] if graph.vcount() else []
+            )
+        }
+
+        self._entries = {
+            str(compendium.name): (vertices.get(str(compendium.name)), compendium, status)
+            for compendium, status in self._session.index.search.query.query()
+        }
+
+    def get(self, name: str) -> Union[None, Tuple[int, object, str]]:
+        """Get a table entry.
+
+        Args:
+            name (str): Vertex name (Execution Compendium UUID).
+
+        Returns:
+            Union[None, Tuple[int, object, str]]: Vertex index, indexed compendium and
+            status. If the name is not indexed, None is returned.
+        """
+        return self.entries.get(str(name))
+
+    def vertex(self, name: str) -> Union[None, int]:
+        """Get the vertex index of an indexed compendium."""
+        entry = self.get(name)
+        return entry[0] if entry else None
+
+    def compendium(self, name: str) -> Union[None, object]:
+        """Get the indexed document of a compendium."""
+        entry = self.get(name)
+        return entry[1] if entry else None
+
+    def status(self, name: str) -> Union[None, str]:
+        """Get the status of an indexed compendium."""
+        entry = self.get(name)
+        return entry[2] if entry else None
+
+    def packages(self) -> Dict[str, Tuple[str, str, str]]:
+        """Get the compendia packages: ``name -> (path, hash algorithm, checksum)``."""
+        packages = {}
+
+        for name, (_, compendium, _) in self.entries.items():
+            package = compendium.compendium_package
+
+            if package:
+                packages[name] = (
+                    package["key"],
+                    package["algorithm"],
+                    package["checksum"],
+                )
+
+        return packages
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Execution schedule of the graph index (update plan)."""
+
+import heapq
+from typing import Dict, Iterable
+
+from igraph import Graph
+
+
+def execution_schedule(
+    graph: Graph,
+    vertices: Iterable[int],
+    durations: Dict[int, float],
+    parallelism: int = 1,
+) -> dict:
+    """Schedule the execution of vertices of a graph index.
+
+    The vertices are executed after their predecessors (the predecessors not scheduled
+    are considered up-to-date). With more than one worker, the ready vertices with the
+    longest remaining path are started first (critical path list scheduling), which
+    is an estimate of the schedule of the parallel executors.
+
+    Args:
+        graph (Graph): Graph index.
+
+        vertices (Iterable[int]): Vertices to be executed.
+
+        durations (Dict[int, float]): Estimated duration (in seconds) of each vertex.
+
+        parallelism (int): Number of vertices executed at the same time.
+
+    Returns:
+        dict: Schedule with the ``vertices`` (``vertex``, ``level``, ``duration``, ``start``,
+        ``finish`` and ``critical``) in execution order, the ``parallelism``, the
+        ``sequential_time`` (sum of the durations), the ``critical_path`` (vertices) with
+        its ``critical_path_time`` (lower bound of the wall time) and the ``estimated_time``
+        (wall time of the schedule).
+    """
+    vertices = set(vertices)
+    parallelism = max(parallelism or 1, 1)
+
+    order = [vertex for vertex in graph.topological_sorting() if vertex in vertices]
+    position = {vertex: idx for idx, vertex in enumerate(order)}
+
+    predecessors = {
+        vertex: [p for p in graph.predecessors(vertex) if p in vertices]
+        for vertex in order
+    }
+    successors = {
+        vertex: [s for s in graph.successors(vertex) if s in vertices]
+        for vertex in order
+    }
+
+    # levels (vertices in the same level are independent).
+    levels = {}
+
+    for vertex in order:
+        levels[vertex] = max((levels[p] + 1 for p in predecessors[vertex]), default=0)
+
+    # critical path (longest path weighted by the durations).
+    path_time, path_parent = {}, {}
+
+    for vertex in order:
+        parent = max(predecessors[vertex], key=lambda p: path_time[p], default=None)
+
+        path_parent[vertex] = parent
+        path_time[vertex] = durations[vertex] + (
+            path_time[parent] if parent is not None else 0.0
+        )
+
+    critical_path = []
+    vertex = max(order, key=lambda v: path_time[v], default=None)
+
+    while vertex is not None:
+        critical_path.insert(0, vertex)
+        vertex = path_parent[vertex]
+
+    # remaining path of each vertex (priority of the list scheduling).
+    remaining_time = {}
+
+    for vertex in reversed(order):
+        remaining_time[vertex] = durations[vertex] + max(
+            (remaining_time[s] for s in successors[vertex]), default=0.0
+        )
+
+    # list scheduling.
+    pending = {vertex: len(predecessors[vertex]) for vertex in order}
+    ready = [vertex for vertex in order if not pending[vertex]]
+    running, schedule = [], {}
+
+    clock = 0.0
+
+    while ready or running:
+        ready.sort(key=lambda v: (-remaining_time[v], position[v]))
+
+        while ready and len(running) < parallelism:
+            vertex = ready.pop(0)
+
+            schedule[vertex] = (clock, clock + durations[vertex])
+            heapq.heappush(running, (clock + durations[vertex], position[vertex]))
+
+        clock, finished = heapq.heappop(running)
+        finished = order[finished]
+
+        for successor in successors[finished]:
+            pending[successor] -= 1
+
+            if not pending[successor]:
+                ready.append(successor)
+
+    critical_vertices = set(critical_path)
+
+    return {
+        "vertices": [
+            dict(
+                vertex=vertex,
+                level=levels[vertex],
+                duration=durations[vertex],
+                start=schedule[vertex][0],
+                finish=schedule[vertex][1],
+                critical=vertex in critical_vertices,
+            )
+            for vertex in sorted(order, key=lambda v: (schedule[v][0], position[v]))
+        ],
+        "parallelism": parallelism,
+        "sequential_time": sum((durations[vertex] for vertex in order), 0.0),
+        "critical_path": critical_path,
+        "critical_path_time": path_time[critical_path[-1]] if critical_path else 0.0,
+        "estimated_time": max((finish for _, finish in schedule.values()), default=0.0),
+    }
@@ -6,9 +6,31 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
 
-from storm_core import ReproducibleSession
-from storm_core.helper.persistence import PicklePersistenceContainer
+from storm_workbench import constants
+
+if TYPE_CHECKING:
+    from storm_core import ReproducibleSession
+
+    from storm_workbench.persistence import GraphStorage
+
+
+def index_generation(session: "ReproducibleSession") -> int:
+    """Get the generation of a session graph index.
+
+    Args:
+        session (ReproducibleSession): Reproducible Session object.
+
+    Returns:
+        int: Number of modifications applied by the Workbench in the index.
+    """
+    graph = session.index.graph_manager.graph
+
+    if constants.INDEX_GENERATION_ATTRIBUTE not in graph.attributes():
+        return 0
+
+    return graph[constants.INDEX_GENERATION_ATTRIBUTE]
 
 
 class SessionService:
@@ -19,7 +41,12 @@ class SessionService:
     current Workbench.
     """
 
-    def __init__(self, reproducible_storage: Path, session: ReproducibleSession):
+    def __init__(
+        self,
+        reproducible_storage: Path,
+        session: "ReproducibleSession",
+        graph_storage: "GraphStorage" = None,
+    ):
         """Initializer.
 
         Args:
@@ -27,14 +54,61 @@ class SessionService:
             file, database file and so on) are stored.
 
             session (ReproducibleSession): Reproducible Session Object.
+
+            graph_storage (GraphStorage): Storage used to load the session graph index. If not
+            defined, the session is saved as a new snapshot.
         """
         self._session = session
         self._reproducible_storage = reproducible_storage
 
+        if graph_storage is None:
+            from storm_workbench.persistence import GraphStorage
+
+            graph_storage = GraphStorage(reproducible_storage / "workflow/meta")
+
+        self._graph_storage = graph_storage
+
+    @property
+    def generation(self) -> int:
+        """Index generation.
+
+        The generation is a counter incremented every time the Workbench
+        modifies the graph index. It is stored as a graph attribute, so it
+        is persisted together with the index.
+        """
+        return index_generation(self._session)
+
+    def bump_generation(self) -> int:
+        """Mark the graph index as modified.
+
+        Returns:
+            int: The new index generation.
+        """
+        generation = self.generation + 1
+
+        self._session.index.graph_manager.graph[
+            constants.INDEX_GENERATION_ATTRIBUTE
+        ] = generation
+
+        return generation
+
+    def mark_modified(self, names: Iterable[str]):
+        """Mark the vertices whose attributes were modified (e.g., re-executed compendia).
+
+        The modifications applied with a new index generation (``bump_generation``)
+        are found by the graph storage when the session is saved, so only the vertices
+        modified without a new generation need to be marked.
+
+        Args:
+            names (Iterable[str]): Names of the modified vertices.
+        """
+        self._graph_storage.mark_modified(names)
+
     def save(self):
-        """Save the current session."""
+        """Save the current session.
+
+        Only the modifications applied in the graph index since the last
+        save are written (in the index journal).
+        """
         # ToDo: Maybe the "session" can be transformed in a class like the "configuration file".
-        PicklePersistenceContainer.save(
-            self._session.index.graph_manager.graph,
-            self._reproducible_storage / "workflow/meta",
-        )
+        self._graph_storage.save(self._session.index.graph_manager.graph)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Staging of files with a thread pool (hashed while copied)."""
+
+import hashlib
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+from storm_workbench.api.backstage.store import HASH_BLOCK_SIZE
+
+KERNEL_COPY_CHUNK_SIZE = 64 * 1024 * 1024
+"""Maximum number of bytes copied by a single ``copy_file_range``/``sendfile`` call."""
+
+
+def _kernel_copy(source_fd: int, target_fd: int, size: int) -> bool:
+    """Copy a file inside the kernel (``copy_file_range`` or ``sendfile``).
+
+    Args:
+        source_fd (int): Source file descriptor (at the begin of the file).
+
+        target_fd (int): Target file descriptor (empty file).
+
+        size (int): Number of bytes to be copied.
+
+    Returns:
+        bool: ``True`` if the file was copied. ``False`` if the kernel copy is
+        not supported (nothing was copied).
+
+    Raises:
+        OSError: When the copy stops before ``size`` bytes (e.g., the file was truncated).
+    """
+    copy_functions = []
+
+    # copy_file_range: allows copy offload (e.g., reflinks and NFS server-side copies).
+    if hasattr(os, "copy_file_range"):
+        copy_functions.append(
+            lambda offset, count: os.copy_file_range(source_fd, target_fd, count)
+        )
+
+    if hasattr(os, "sendfile"):
+        copy_functions.append(
+            lambda offset, count: os.sendfile(target_fd, source_fd, offset, count)
+        )
+
+    for copy_function in copy_functions:
+        copied = 0
+
+        try:
+            while copied < size:
+                block_size = copy_function(
+                    copied, min(size - copied, KERNEL_COPY_CHUNK_SIZE)
+                )
+
+                if not block_size:
+                    break
+                copied += block_size
+
+        except OSError:
+            if copied:
+                raise
+            continue
+
+        if copied == size:
+            return True
+
+        # nothing copied: the kernel copy is not supported (e.g., by the file system).
+        if copied:
+            raise OSError(f"Incomplete kernel copy: {copied} of {size} bytes copied.")
+
+    return False
+
+
+def copy_file(
+    source: Union[str, Path], target: Union[str, Path], algorithm: str = None
+) -> Union[None, str]:
+    """Copy a file (content and permission bits).
+
+    Args:
+        source (Union[str, Path]): File to be copied.
+
+        target (Union[str, Path]): Path of the copy. If it exists, it is replaced.
+
+        algorithm (str): Hash algorithm. If defined, the checksum is generated from the
+        copied buffers (the file is read once). Otherwise, the file is copied inside the
+        kernel (``copy_file_range`` or ``sendfile``), when supported.
+
+    Returns:
+        Union[None, str]: Checksum of the copied content (if ``algorithm`` is defined).
+    """
+    checksum = None
+
+    with open(source, "rb") as ifile, open(target, "wb") as ofile:
+        if algorithm:
+            file_hash = hashlib.new(algorithm)
+
+            buffer = bytearray(HASH_BLOCK_SIZE)
+            buffer_view = memoryview(buffer)
+
+            for block_size in iter(lambda: ifile.readinto(buffer), 0):
+                file_hash.update(buffer_view[:block_size])
+                ofile.write(buffer_view[:block_size])
+
+            checksum = file_hash.hexdigest()
+
+        elif not _kernel_copy(
+            ifile.fileno(), ofile.fileno(), os.fstat(ifile.fileno()).st_size
+        ):
+            shutil.copyfileobj(ifile, ofile, HASH_BLOCK_SIZE)
+
+    shutil.copymode(source, target)
+
+    return checksum
+
+
+def stage_files(
+    files: Iterable[Tuple[Union[str, Path], Union[str, Path], Union[None, str]]],
+    jobs: int = 1,
+    callback: Callable[[int, Dict], None] = None,
+) -> List[Dict]:
+    """Copy files to a staging area with a thread pool.
+
+    The copies are I/O bound (the hash functions and the kernel copies release
+    the GIL), so threads are used instead of processes.
+
+    Args:
+        files (Iterable[Tuple[Union[str, Path], Union[str, Path], Union[None, str]]]): Tuples
+        with the source file, the target path and the hash algorithm (if ``None``, the file
+        is not hashed; see ``copy_file``).
+
+        jobs (int): Number of threads.
+
+        callback (Callable[[int, Dict], None]): Function called (by the threads) with the index
+        and the result of each file, when its copy is finished (e.g., to checkpoint the staging).
+
+    Returns:
+        List[Dict]: Staging results (in the same order of ``files``), with the ``source``,
+        ``target``, ``algorithm``, ``checksum``, ``size`` (bytes), ``elapsed`` (seconds) and
+        ``throughput`` (bytes per second) of each file.
+    """
+
+    def _stage(indexed_file):
+        idx, (source, target, algorithm) = indexed_file
+
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+
+        start_time = time.perf_counter()
+        checksum = copy_file(source, target, algorithm)
+        elapsed = time.perf_counter() - start_time
+
+        size = os.path.getsize(target)
+
+        result = {
+            "source": str(source),
+            "target": str(target),
+            "algorithm": algorithm,
+            "checksum": checksum,
+            "size": size,
+            "elapsed": elapsed,
+            "throughput": size / elapsed if elapsed else 0.0,
+        }
+
+        if callback:
+            callback(idx, result)
+
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(jobs or 1, 1)) as executor:
+        return list(executor.map(_stage, enumerate(files)))
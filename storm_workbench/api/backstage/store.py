@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Content-addressed store of the compendia packages."""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Union
+
+FICLONE = 0x40049409
+"""Linux ``ioctl`` request to clone (reflink) a file."""
+
+HASH_BLOCK_SIZE = 1024 * 1024
+"""Size of the blocks read to hash a file."""
+
+LINK_MODES = ("auto", "hardlink", "reflink", "copy")
+"""Available modes to link a file."""
+
+
+def _reflink(source: Path, target: Path):
+    """Clone a file using a copy-on-write reference (Linux, e.g., Btrfs and XFS).
+
+    Raises:
+        OSError: When the file system (or the operating system) doesn't support reflinks.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflink is not supported in this operating system.")
+
+    try:
+        with open(source, "rb") as source_file, open(target, "wb") as target_file:
+            fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+    except OSError:
+        Path(target).unlink(missing_ok=True)
+        raise
+
+
+def link_file(
+    source: Union[str, Path], target: Union[str, Path], mode: str = "auto"
+) -> str:
+    """Make a file available in other path without copying its content (when possible).
+
+    Args:
+        source (Union[str, Path]): File to be linked.
+
+        target (Union[str, Path]): Path where the file will be available. If it exists, it is replaced.
+
+        mode (str): Link mode. The ``hardlink`` and ``reflink`` modes fall back to
+        copy when the link can't be created (e.g., between devices). The ``auto``
+        mode tries a hardlink, then a reflink and, finally, copies the file.
+
+    Returns:
+        str: Mode used to link the file (``hardlink``, ``reflink`` or ``copy``).
+
+    Note:
+        A hardlink shares the file content. So, the linked files must not be modified
+        in place. Use the ``reflink`` (copy-on-write) or ``copy`` modes to create
+        files that will be modified.
+    """
+    if mode not in LINK_MODES:
+        raise ValueError(f"Invalid link mode: {mode} (available: {LINK_MODES})")
+
+    target = Path(target)
+    target.unlink(missing_ok=True)
+
+    if mode in ("auto", "hardlink"):
+        try:
+            os.link(source, target)
+            return "hardlink"
+        except OSError:
+            pass
+
+    if mode in ("auto", "reflink"):
+        try:
+            _reflink(source, target)
+            return "reflink"
+        except OSError:
+            pass
+
+    shutil.copyfile(source, target)
+    return "copy"
+
+
+def hash_file(path: Union[str, Path], algorithm: str) -> str:
+    """Generate the checksum of a file.
+
+    Args:
+        path (Union[str, Path]): File to be hashed.
+
+        algorithm (str): Hash algorithm (available in the ``hashlib``).
+
+    Returns:
+        str: Hexadecimal checksum.
+    """
+    file_hash = hashlib.new(algorithm)
+
+    with open(path, "rb") as ifile:
+        for block in iter(lambda: ifile.read(HASH_BLOCK_SIZE), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+class ContentStore:
+    """Content-addressed store.
+
+    The store keeps a single copy of each file content, addressed by
+    its checksum (``<store>/<algorithm>/<checksum[:2]>/<checksum>``). Files
+    added to the store are replaced by hardlinks to the stored object, so
+    files with the same content (e.g., compendium packages with the same
+    software environment) use the disk space only once. The objects can be
+    linked (hardlink or reflink) to assemble export packages without copies.
+
+    Note:
+        The stored objects are shared by all files linked to them. So, files
+        added to the store must be treated as immutable. Files that will be
+        rewritten must be unshared (``unshare``) before the modification.
+    """
+
+    def __init__(self, path: Union[str, Path], checksums=None):
+        """Initializer.
+
+        Args:
+            path (Union[str, Path]): Directory where the objects are stored.
+
+            checksums (ChecksumCache): Checksum cache used to validate the added files. If
+            not defined, the files are always hashed.
+        """
+        self._path = Path(path)
+        self._checksums = checksums
+
+    @property
+    def path(self) -> Path:
+        """Directory where the objects are stored."""
+        return self._path
+
+    def object_path(self, algorithm: str, checksum: str) -> Path:
+        """Path of an object in the store."""
+        return self._path / algorithm / checksum[:2] / checksum
+
+    def contains(self, algorithm: str, checksum: str) -> bool:
+        """Check if an object is available in the store."""
+        return self.object_path(algorithm, checksum).is_file()
+
+    def _digest(self, file: Path, algorithm: str) -> str:
+        """Checksum of a file (from the checksum cache, when available)."""
+        if self._checksums is not None:
+            return self._checksums.digest(file, algorithm)
+
+        return hash_file(file, algorithm)
+
+    def add(
+        self, file: Union[str, Path], algorithm: str, checksum: str = None
+    ) -> Path:
+        """Add a file to the store.
+
+        If the content is already stored, the file is replaced by a hardlink
+        to the stored object (deduplication). Otherwise, the file becomes the
+        stored object.
+
+        Args:
+            file (Union[str, Path]): File to be added.
+
+            algorithm (str): Hash algorithm used to address the file.
+
+            checksum (str): Expected file checksum. If defined, it is validated
+            against the file content.
+
+        Returns:
+            Path: Path to the stored object.
+
+        Raises:
+            ValueError: When the file content doesn't match the expected checksum.
+        """
+        file = Path(file)
+
+        if checksum:
+            object_path = self.object_path(algorithm, checksum)
+
+            # the file is already the stored object.
+            if object_path.is_file() and os.path.samefile(file, object_path):
+                return object_path
+
+        file_checksum = self._digest(file, algorithm)
+
+        if checksum and file_checksum != checksum:
+            raise ValueError(
+                f"Invalid checksum for {file} ({algorithm}:{file_checksum}, "
+                f"expected {algorithm}:{checksum})"
+            )
+
+        checksum = file_checksum
+        object_path = self.object_path(algorithm, checksum)
+
+        if object_path.is_file():
+            if os.path.samefile(file, object_path):
+                return object_path
+
+            # deduplicating: the file is replaced by the stored object.
+            file_tmp = file.with_name(
+                f".{file.name}.{os.getpid()}.{threading.get_ident()}.link"
+            )
+
+            if link_file(object_path, file_tmp, mode="hardlink") == "hardlink":
+                os.replace(file_tmp, file)
+            else:
+                file_tmp.unlink(missing_ok=True)
+
+            return object_path
+
+        # storing: the object is created atomically (as a link of the file, when possible).
+        # the temporary name is unique by process and thread (concurrent adds are safe).
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        object_tmp = object_path.with_name(
+            f".{checksum}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+
+        link_file(file, object_tmp)
+        os.replace(object_tmp, object_path)
+
+        return object_path
+
+    def link(
+        self,
+        algorithm: str,
+        checksum: str,
+        target: Union[str, Path],
+        mode: str = "auto",
+    ) -> str:
+        """Make a stored object available in a path.
+
+        Args:
+            algorithm (str): Hash algorithm used to address the object.
+
+            checksum (str): Object checksum.
+
+            target (Union[str, Path]): Path where the object will be available.
+
+            mode (str): Link mode (see ``link_file``).
+
+        Returns:
+            str: Mode used to link the object (``hardlink``, ``reflink`` or ``copy``).
+
+        Raises:
+            FileNotFoundError: When the object is not stored.
+        """
+        object_path = self.object_path(algorithm, checksum)
+
+        if not object_path.is_file():
+            raise FileNotFoundError(
+                f"Object not found in the store: {algorithm}:{checksum}"
+            )
+
+        return link_file(object_path, target, mode=mode)
+
+    def unshare(self, files: Iterable[Union[str, Path]]):
+        """Unshare files from the stored objects (copy-on-write).
+
+        The files linked to stored objects are replaced by reflinks (or copies) of
+        their content. So, a program can rewrite these files without modifying the
+        stored objects. The rewritten files can be stored again with ``attach``.
+
+        Args:
+            files (Iterable[Union[str, Path]]): Files to be unshared.
+        """
+        for file in map(Path, files):
+            if file.is_file() and file.stat().st_nlink > 1:
+                file_tmp = file.with_name(
+                    f".{file.name}.{os.getpid()}.{threading.get_ident()}.unshare"
+                )
+
+                link_file(file, file_tmp, mode="reflink")
+                os.replace(file_tmp, file)
+
+    def stat_objects(
+        self, objects: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], os.stat_result]:
+        """State of stored objects (used to detect objects modified in place).
+
+        Args:
+            objects (Iterable[Tuple[str, str]]): Tuples with the hash algorithm and
+            the object checksum.
+
+        Returns:
+            Dict[Tuple[str, str], os.stat_result]: State of the stored objects.
+        """
+        objects_state = {}
+
+        for algorithm, checksum in objects:
+            object_path = self.object_path(algorithm, checksum)
+
+            if object_path.is_file():
+                objects_state[(algorithm, checksum)] = object_path.stat()
+
+        return objects_state
+
+    def discard_modified(self, objects_state: Dict[Tuple[str, str], os.stat_result]):
+        """Remove the stored objects modified in place (through a linked file).
+
+        A modified object doesn't match its checksum anymore. So, it is removed from
+        the store (its content remains available in the linked files).
+
+        Args:
+            objects_state (Dict[Tuple[str, str], os.stat_result]): State of the stored
+            objects before the modification (see ``stat_objects``).
+        """
+        for (algorithm, checksum), object_stat in objects_state.items():
+            object_path = self.object_path(algorithm, checksum)
+
+            try:
+                current_stat = object_path.stat()
+            except FileNotFoundError:
+                continue
+
+            if current_stat.st_ino == object_stat.st_ino and (
+                current_stat.st_mtime_ns != object_stat.st_mtime_ns
+                or current_stat.st_size != object_stat.st_size
+            ):
+                object_path.unlink()
+
+    def attach(self, files: Iterable[Tuple[Union[str, Path], str, str]]):
+        """Attach files to the store.
+
+        Missing files are restored from the stored objects and the existing ones
+        are added to the store (new or rewritten files are deduplicated). Files
+        that don't match their checksum are not stored.
+
+        Args:
+            files (Iterable[Tuple[Union[str, Path], str, str]]): Tuples with the file path,
+            the hash algorithm and the file checksum.
+        """
+        for file, algorithm, checksum in files:
+            file = Path(file)
+
+            if file.is_file():
+                try:
+                    self.add(file, algorithm, checksum)
+                except ValueError:
+                    pass
+
+            elif self.contains(algorithm, checksum):
+                file.parent.mkdir(parents=True, exist_ok=True)
+                self.link(algorithm, checksum, file, mode="hardlink")
+
+    def prune(self, referenced: Iterable[Tuple[str, str]]) -> int:
+        """Remove the objects that are not referenced.
+
+        The objects are removed regardless of the files linked to them (e.g., packages
+        of deindexed compendia). Temporary files (created by concurrent operations)
+        are never removed.
+
+        Args:
+            referenced (Iterable[Tuple[str, str]]): Tuples with the hash algorithm and
+            the checksum of the objects in use (e.g., the packages of the indexed compendia).
+
+        Returns:
+            int: Number of bytes released.
+        """
+        released = 0
+
+        if not self._path.is_dir():
+            return released
+
+        referenced = {
+            self.object_path(algorithm, checksum) for algorithm, checksum in referenced
+        }
+
+        for object_path in self._path.glob("*/*/*"):
+            if object_path.name.startswith(".") or object_path in referenced:
+                continue
+
+            if object_path.is_file():
+                released += object_path.stat().st_size
+                object_path.unlink()
+
+        return released
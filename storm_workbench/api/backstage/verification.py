@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Verification of the reproduced outputs."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Union
+
+from igraph import Graph
+from pydash import py_
+
+from storm_workbench.api.backstage.store import hash_file
+
+VERIFICATION_REPORT_FILE = "verification.json"
+"""Name of the verification report file (saved in the reproduction results directory)."""
+
+
+def _output_key(key: str) -> str:
+    """Key of an output relative to the results directory of its compendium."""
+    key = PurePosixPath(key)
+
+    return PurePosixPath(*key.parts[1:] if key.is_absolute() else key.parts).as_posix()
+
+
+def _output_path(compendium_dirs: List[Path], key: str) -> Union[None, Path]:
+    """Reproduced file of an output.
+
+    The output is searched by its key relative to the results directories of its
+    compendium (the first directory with the file is used).
+    """
+    for compendium_dir in compendium_dirs:
+        path = compendium_dir / key
+
+        if path.is_file():
+            return path
+
+    return None
+
+
+def verify_outputs(
+    graph: Graph,
+    results_dir: Union[str, Path],
+    vertices: Iterable[int] = None,
+    jobs: int = 1,
+) -> List[dict]:
+    """Verify the reproduced outputs against the checksums recorded in the graph index.
+
+    Args:
+        graph (Graph): Graph index with the compendia (and their ``outputs``).
+
+        results_dir (Union[str, Path]): Directory with the reproduction results.
+
+        vertices (Iterable[int]): Vertices to be verified. If not defined, all vertices are verified.
+
+        jobs (int): Number of threads used to hash the reproduced files.
+
+    Returns:
+        List[dict]: Verification of each compendium (``name``, ``status`` and ``outputs``). The
+        compendium status is ``match`` when all its outputs were reproduced with the recorded
+        checksum. Otherwise, it is ``mismatch``. Each output is ``match``, ``mismatch`` or
+        ``missing`` (when no reproduced file was found).
+
+    Note:
+        Each output is searched by its key (relative path) in the results directory of its
+        compendium (the directories named as the compendium inside the ``results_dir``). If
+        the compendium has no results directory, the key is searched in the ``results_dir``.
+    """
+    results_dir = Path(results_dir)
+    vertices = range(graph.vcount()) if vertices is None else vertices
+
+    # indexing the results directories by name.
+    directories = {}
+
+    for path in sorted(results_dir.rglob("*")):
+        if path.is_dir():
+            directories.setdefault(path.name, []).append(path)
+
+    # expected outputs.
+    compendia = []
+
+    for vertex in vertices:
+        vertex = graph.vs[vertex]
+        compendium_dirs = directories.get(vertex["name"]) or [results_dir]
+
+        outputs = []
+
+        for output in py_.get(vertex, "outputs", None) or []:
+            output_key = _output_key(output["key"])
+
+            outputs.append(
+                dict(
+                    file=output_key,
+                    algorithm=output["algorithm"],
+                    expected=output["checksum"],
+                    path=_output_path(compendium_dirs, output_key),
+                )
+            )
+
+        compendia.append(dict(name=vertex["name"], outputs=outputs))
+
+    # hashing the reproduced files (the hash functions release the GIL).
+    to_hash = sorted(
+        {
+            (str(output["path"]), output["algorithm"])
+            for compendium in compendia
+            for output in compendium["outputs"]
+            if output["path"] is not None
+        }
+    )
+
+    with ThreadPoolExecutor(max_workers=max(jobs or 1, 1)) as executor:
+        checksums = dict(
+            zip(to_hash, executor.map(lambda args: hash_file(*args), to_hash))
+        )
+
+    # matching the checksums.
+    for compendium in compendia:
+        for output in compendium["outputs"]:
+            if output["path"] is None:
+                output.update(status="missing", obtained=None)
+                continue
+
+            output["path"] = str(output["path"])
+            output["obtained"] = checksums[(output["path"], output["algorithm"])]
+            output["status"] = (
+                "match" if output["obtained"] == output["expected"] else "mismatch"
+            )
+
+        compendium["status"] = (
+            "match"
+            if all(output["status"] == "match" for output in compendium["outputs"])
+            else "mismatch"
+        )
+
+    return compendia
+
+
+def verification_report(compendia: List[dict]) -> dict:
+    """Create a verification report.
+
+    Args:
+        compendia (List[dict]): Verification of the compendia (see ``verify_outputs``).
+
+    Returns:
+        dict: Report with the ``summary`` (number of compendia by status) and the ``compendia``.
+    """
+    summary = {"compendia": len(compendia), "match": 0, "mismatch": 0, "skipped": 0}
+
+    for compendium in compendia:
+        summary[compendium["status"]] += 1
+
+    return {"summary": summary, "compendia": compendia}
+
+
+def save_verification_report(report: dict, file: Union[str, Path]) -> Path:
+    """Save a verification report as JSON.
+
+    Args:
+        report (dict): Verification report (see ``verification_report``).
+
+        file (Union[str, Path]): Output file.
+
+    Returns:
+        Path: Path to the saved report.
+    """
+    file = Path(file)
+    file.write_text(json.dumps(report, indent=2))
+
+    return file
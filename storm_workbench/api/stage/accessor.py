@@ -7,12 +7,6 @@
 
 from storm_workbench.api.backstage.accessor import BackstageAccessor
 from storm_workbench.api.stage.base import BaseStageAccessor
-from storm_workbench.api.stage.database.service import DatabaseService
-from storm_workbench.api.stage.environment.service import EnvironmentService
-from storm_workbench.api.stage.exporter.accessor import ExporterServiceAccessor
-from storm_workbench.api.stage.operation.accessor import OperationAccessor
-from storm_workbench.api.stage.ws.accessor import ResourceServicesAccessor
-
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 from storm_workbench.workbench.store import pass_config
 
@@ -24,6 +18,10 @@ class StageAccessor(BaseStageAccessor):
     API to produce and use Reproducible Research. This Accessor make all services
     provided by the Stage API available using a centralization and API unification
     approach.
+
+    Note:
+        The services are imported on the first access. So, the libraries required
+        by a service (e.g., Storm WS client, BagIt) are loaded only when used.
     """
 
     @pass_config
@@ -33,24 +31,34 @@ class StageAccessor(BaseStageAccessor):
     @property
     def index(self):
         """Stage API Dataset service."""
+        from storm_workbench.api.stage.database.service import DatabaseService
+
         return DatabaseService(self._config, self._backstage)
 
     @property
     def operation(self):
         """Stage API Operations (Execution and ReExecution) Accessor."""
+        from storm_workbench.api.stage.operation.accessor import OperationAccessor
+
         return OperationAccessor(self._config, self._backstage)
 
     @property
     def environment(self):
         """Stage API Environment service."""
+        from storm_workbench.api.stage.environment.service import EnvironmentService
+
         return EnvironmentService(self._config, self._backstage)
 
     @property
     def exporter(self):
         """Stage API Exporter accessor."""
+        from storm_workbench.api.stage.exporter.accessor import ExporterServiceAccessor
+
         return ExporterServiceAccessor(self._config, self._backstage)
 
     @property
     def ws(self):
         """Stage API Storm WS accessor."""
+        from storm_workbench.api.stage.ws.accessor import ResourceServicesAccessor
+
         return ResourceServicesAccessor(self._config, self._backstage)
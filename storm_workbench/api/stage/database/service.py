@@ -5,13 +5,25 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
+from collections import defaultdict
 from datetime import datetime
+from typing import List, Union
 
+import peewee
+
+from storm_workbench import constants
 from storm_workbench.api.backstage.argparser import parse_arguments_as_dict
-from storm_workbench.api.backstage.database.model import ExecutionCompendiumModel
+from storm_workbench.api.backstage.database import db
+from storm_workbench.api.backstage.database.model import (
+    ExecutionCompendiumModel,
+    WorkbenchStateModel,
+)
 from storm_workbench.api.stage.base import BaseStageService
 from storm_workbench.exceptions import ExecutionCompendiumNotFound
 
+DATABASE_BATCH_SIZE = 500
+"""Maximum number of records changed by a single database statement."""
+
 
 class DatabaseService(BaseStageService):
     """Database service.
@@ -20,6 +32,23 @@ class DatabaseService(BaseStageService):
     database models.
     """
 
+    def __init__(self, config=None, backstage=None):
+        """Initializer.
+
+        Args:
+            config (WorkbenchDefinitionFile): Workbench configuration.
+
+            backstage (BackstageAccessor): Accessor object to manipulate the Backstage API (Workbench low-level API).
+
+        Note:
+            The Workbench database is initialized only when a database service is
+            created for the first time.
+        """
+        super(DatabaseService, self).__init__(config, backstage)
+
+        if self._backstage is not None:
+            self._backstage.database  # initializing the database (if required)
+
     @parse_arguments_as_dict()
     def query(self, **kwargs):
         """Query the database.
@@ -77,46 +106,75 @@ class DatabaseService(BaseStageService):
         if not execution_compendia:
             raise ExecutionCompendiumNotFound("Execution Compendium not found!")
 
-        return [
-            (
-                ec,
-                next(
-                    self._backstage.execution.index.search.query.query(
-                        name=str(ec.uuid)
-                    )
-                )[0],
-            )
-            for ec in execution_compendia
-        ]
-
-    def _synchronize_records(self):
-        """Synchronize the index and the database records."""
-        # checking the compatibility between the database and the index.
-        # rationale: in general cases, this operation
-        # will be cheap, because users don't have many indexed records.
-        database_compendia = ExecutionCompendiumModel.select()
-        for compendium in database_compendia:
-            indexed_compendium = list(
-                self._backstage.execution.index.search.query.query(
-                    name=str(compendium.uuid)
-                )
-            )
+        index_lookup = self._backstage.execution.lookup
 
-            # if the database compendium is not in the index
-            # so we will remove it from the database.
-            if not indexed_compendium:
-                compendium.delete_instance()
-                continue
+        return [(ec, index_lookup.compendium(ec.uuid)) for ec in execution_compendia]
 
-            # now, we will check if the status is compatible.
-            _, status = indexed_compendium[0]
+    def synchronize(self, full: bool = False):
+        """Synchronize the index and the database records.
 
-            ExecutionCompendiumModel.update(
-                updated=datetime.now(), status=status
-            ).where(ExecutionCompendiumModel.uuid == compendium.uuid).execute()
+        The synchronization is incremental: when the index was not modified since
+        the last synchronization (same index generation), nothing is done. Otherwise,
+        the status of each record is checked in the index lookup table and only the
+        records whose status changed (or that were removed from the index) are written,
+        in one transaction.
 
-        # saving the session modifications.
-        self._backstage.session.save()
+        Args:
+            full (bool): Flag indicating if all records must be rewritten, even
+            if the index was not modified. Useful to recover an inconsistent database.
+
+        Returns:
+            None: The database records will be synchronized with the index.
+        """
+        index_generation = self._backstage.session.generation
+
+        if not full and self._synchronized_generation() == index_generation:
+            return
+
+        index_lookup = self._backstage.execution.lookup
+
+        with db.atomic():
+            removed_records = []
+            changed_records = defaultdict(list)
+
+            database_compendia = ExecutionCompendiumModel.select(
+                ExecutionCompendiumModel.uuid, ExecutionCompendiumModel.status
+            ).tuples()
+
+            for compendium_uuid, compendium_status in database_compendia:
+                indexed_status = index_lookup.status(compendium_uuid)
+
+                # if the database compendium is not in the index
+                # so we will remove it from the database.
+                if indexed_status is None:
+                    removed_records.append(compendium_uuid)
+
+                # now, we will check if the status is compatible.
+                elif full or indexed_status != compendium_status:
+                    changed_records[indexed_status].append(compendium_uuid)
+
+            for records in peewee.chunked(removed_records, DATABASE_BATCH_SIZE):
+                ExecutionCompendiumModel.delete().where(
+                    ExecutionCompendiumModel.uuid.in_(records)
+                ).execute()
+
+            for status, status_records in changed_records.items():
+                for records in peewee.chunked(status_records, DATABASE_BATCH_SIZE):
+                    ExecutionCompendiumModel.update(
+                        updated=datetime.now(), status=status
+                    ).where(ExecutionCompendiumModel.uuid.in_(records)).execute()
+
+            WorkbenchStateModel.replace(
+                key=constants.INDEX_GENERATION_STATE_KEY, value=str(index_generation)
+            ).execute()
+
+    def _synchronized_generation(self) -> Union[None, int]:
+        """Index generation of the last synchronization with the database."""
+        state = WorkbenchStateModel.get_or_none(
+            WorkbenchStateModel.key == constants.INDEX_GENERATION_STATE_KEY
+        )
+
+        return int(state.value) if state else None
 
     def remove_record(self, name: str, remove_related_compendia: bool = True):
         """Remove record from the database.
@@ -146,7 +204,20 @@ class DatabaseService(BaseStageService):
         # 2. removing from the database.
         record.delete_instance()
 
-        self._synchronize_records()
+        self._backstage.session.bump_generation()
+
+        # releasing the packages not used by the remaining compendia.
+        indexed_packages = self._backstage.execution.lookup.packages()
+
+        self._backstage.store.prune(
+            (algorithm, checksum)
+            for _, algorithm, checksum in indexed_packages.values()
+        )
+
+        self.synchronize()
+
+        # saving the session modifications.
+        self._backstage.session.save()
 
     def upsert_record(self, execution_compendium: ExecutionCompendiumModel):
         """Add (or update) a new execution compendium record.
@@ -161,44 +232,91 @@ class DatabaseService(BaseStageService):
             This function will try to create the record. If already exists, the
             record will be updated.
         """
-        # getting the execution compendium status from the graph index.
-        # note: the query ``must`` return a valid object! otherwise,
+        return self.upsert_records([execution_compendium])[0]
+
+    def upsert_records(
+        self, execution_compendia: List[ExecutionCompendiumModel]
+    ) -> List[ExecutionCompendiumModel]:
+        """Add (or update) execution compendia records in bulk.
+
+        The status of all compendia is resolved with the index lookup table
+        and the records are written with ``INSERT ... ON CONFLICT`` statements
+        inside one transaction.
+
+        Args:
+            execution_compendia (List[ExecutionCompendiumModel]): Execution compendium objects.
+
+        Returns:
+            List[ExecutionCompendiumModel]: Records created/updated in the database (in the
+            same order of ``execution_compendia``).
+
+        Note:
+            Only the non-null attributes of each object are written in the already
+            existing records.
+        """
+        if not execution_compendia:
+            return []
+
+        # getting the execution compendia status from the graph index.
+        # note: the index ``must`` have all the compendia! otherwise,
         # the execution had a problem.
-        ec_index = list(
-            self._backstage.execution.index.search.query.query(
-                name=str(execution_compendium.uuid)
+        index_lookup = self._backstage.execution.lookup
+
+        # grouping the records by the defined attributes, since each
+        # group requires a different ``ON CONFLICT`` clause.
+        records_by_fields = defaultdict(list)
+
+        for execution_compendium in execution_compendia:
+            if index_lookup.get(execution_compendium.uuid) is None:
+                raise ExecutionCompendiumNotFound(
+                    f"Execution Compendium {execution_compendium.uuid} is not indexed!"
+                )
+
+            # removing the None values.
+            execution_compendium_data = dict(
+                name=execution_compendium.name,
+                description=execution_compendium.description,
+                uuid=execution_compendium.uuid,
+                status=index_lookup.status(execution_compendium.uuid),
+                command=str(execution_compendium.command),
+                pid=execution_compendium.pid,
             )
-        )
-        ec_index = ec_index[0]
-
-        # removing the None values.
-        execution_compendium_data = dict(
-            name=execution_compendium.name,
-            description=execution_compendium.description,
-            uuid=execution_compendium.uuid,
-            status=ec_index[-1],
-            command=str(execution_compendium.command),
-            pid=execution_compendium.pid,
-        )
-        execution_compendium_data = {
-            k: v for k, v in execution_compendium_data.items() if v is not None
-        }
-
-        # trying to update an already exists compendium
-        update_status = (
-            ExecutionCompendiumModel.update(
-                updated=datetime.now(), **execution_compendium_data
+            execution_compendium_data = {
+                k: v for k, v in execution_compendium_data.items() if v is not None
+            }
+
+            records_by_fields[tuple(sorted(execution_compendium_data))].append(
+                execution_compendium_data
             )
-            .where(ExecutionCompendiumModel.uuid == execution_compendium.uuid)
-            .execute()
-        )
 
-        if not update_status:  # create a new record
-            record = ExecutionCompendiumModel.create(**execution_compendium_data)
-        else:
-            record = ExecutionCompendiumModel.get(
-                ExecutionCompendiumModel.uuid == execution_compendium.uuid
+        with db.atomic():
+            for fields, records in records_by_fields.items():
+                preserved_fields = [
+                    getattr(ExecutionCompendiumModel, field)
+                    for field in fields
+                    if field != "uuid"
+                ]
+
+                for records_batch in peewee.chunked(records, DATABASE_BATCH_SIZE):
+                    ExecutionCompendiumModel.insert_many(records_batch).on_conflict(
+                        conflict_target=[ExecutionCompendiumModel.uuid],
+                        preserve=preserved_fields,
+                        update={ExecutionCompendiumModel.updated: datetime.now()},
+                    ).execute()
+
+        # loading the written records.
+        compendia_uuids = [str(ec.uuid) for ec in execution_compendia]
+        records = {}
+
+        for uuids_batch in peewee.chunked(compendia_uuids, DATABASE_BATCH_SIZE):
+            records.update(
+                {
+                    str(record.uuid): record
+                    for record in ExecutionCompendiumModel.select().where(
+                        ExecutionCompendiumModel.uuid.in_(uuids_batch)
+                    )
+                }
             )
 
-        self._synchronize_records()
-        return record
+        self.synchronize()
+        return [records[compendium_uuid] for compendium_uuid in compendia_uuids]
@@ -0,0 +1,1025 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Archive backends (zip and tar.zst) of the exporters."""
+
+import io
+import os
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import (Any, BinaryIO, Callable, Iterable, Iterator, List, Tuple,
+                    Union)
+
+from storm_workbench.api.backstage.store import HASH_BLOCK_SIZE
+
+ARCHIVE_FORMATS = ("zip", "tar.zst")
+"""Available archive formats."""
+
+ARCHIVE_DEFAULT_FORMAT = "zip"
+"""Archive format used when no format is defined."""
+
+ARCHIVE_CHECKPOINT_SIZE = 64 * 1024 * 1024
+"""Size of the files added to an archive between two resume points (see ``ArchiveWriter.state``)."""
+
+DEFLATE_BLOCK_SIZE = 1024 * 1024
+"""Size of the blocks compressed independently by the parallel deflate."""
+
+DEFLATE_WINDOW_SIZE = 32 * 1024
+"""Deflate window size (the tail of a block is used as dictionary of the next one)."""
+
+ZIP_MAGIC = b"PK\x03\x04"
+"""Magic number of the zip files."""
+
+ZIP_EMPTY_MAGIC = b"PK\x05\x06"
+"""Magic number of the empty zip files."""
+
+ZIP_HEADER_SIZE = 30
+"""Size of the fixed part of the zip local file headers."""
+
+ZIP_DATA_DESCRIPTOR_MAGIC = b"PK\x07\x08"
+"""Magic number of the zip data descriptors (sizes and CRC written after the entry data)."""
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+"""Magic number of the zstandard frames."""
+
+ZSTD_STORE_LEVEL = -(1 << 17)
+"""Zstandard level used to store entries (the fastest level, which emits raw blocks)."""
+
+STORED_EXTENSIONS = (
+    ".rpz",
+    ".zip",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".zst",
+    ".7z",
+    ".rar",
+    ".tif",
+    ".tiff",
+    ".jp2",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".webp",
+    ".mp3",
+    ".mp4",
+    ".mkv",
+    ".parquet",
+)
+"""Extensions of the (usually) already-compressed files, which are stored without compression."""
+
+ZIP_STATE_FIELDS = (
+    "compress_type",
+    "external_attr",
+    "header_offset",
+    "CRC",
+    "compress_size",
+    "file_size",
+    "flag_bits",
+    "create_version",
+    "extract_version",
+)
+"""Fields of the zip entries saved in the archive states (used to resume a zip archive)."""
+
+PROBE_SAMPLE_SIZE = 64 * 1024
+"""Size of each sample read by the compressibility probe."""
+
+PROBE_SAMPLES = 3
+"""Number of samples (from the begin, middle and end of the file) read by the compressibility probe."""
+
+PROBE_RATIO_THRESHOLD = 0.95
+"""Compression ratio (compressed/original) above which a file is considered incompressible."""
+
+
+def _import_zstandard():
+    """Import the (optional) zstandard library."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ModuleNotFoundError(
+            "To use the ``tar.zst`` archive format, please, install the zstandard library: "
+            "`pip install zstandard` or `poetry add zstandard`"
+        )
+
+    return zstandard
+
+
+def _deflate_block(block: bytes, level: int, zdict: bytes, last: bool) -> bytes:
+    """Compress a block as a raw deflate stream that can be concatenated with the other blocks.
+
+    Args:
+        block (bytes): Block content.
+
+        level (int): Compression level.
+
+        zdict (bytes): Tail of the previous block (used as dictionary).
+
+        last (bool): Flag indicating if the block is the last of the stream.
+
+    Returns:
+        bytes: Compressed block. The non-last blocks are byte-aligned (sync flush)
+        and are not marked as final, so the concatenation is a valid deflate stream.
+    """
+    compressor_options = {"zdict": zdict} if zdict else {}
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, **compressor_options)
+
+    return compressor.compress(block) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class ParallelDeflateCompressor:
+    """Block-parallel deflate compressor (as the ``pigz`` tool).
+
+    The input is split in blocks compressed in a thread pool (``zlib`` releases
+    the GIL). Each block uses the tail of the previous one as dictionary, so the
+    compression ratio is close to the one of the serial compression. This class
+    has the interface of the ``zlib`` compressors (``compress`` and ``flush``)
+    and generates a raw deflate stream.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, level: int, threads: int):
+        """Initializer.
+
+        Args:
+            executor (ThreadPoolExecutor): Executor used to compress the blocks.
+
+            level (int): Compression level.
+
+            threads (int): Number of threads of the executor (used to limit the pending blocks).
+        """
+        self._executor = executor
+        self._level = level
+        self._max_pending = max(threads, 1) * 2
+
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._window = b""
+
+    def _submit(self, last: bool = False):
+        """Submit the buffered blocks to be compressed."""
+        while len(self._buffer) >= DEFLATE_BLOCK_SIZE or (last and self._buffer):
+            block = bytes(self._buffer[:DEFLATE_BLOCK_SIZE])
+            del self._buffer[:DEFLATE_BLOCK_SIZE]
+
+            self._pending.append(
+                self._executor.submit(
+                    _deflate_block,
+                    block,
+                    self._level,
+                    self._window,
+                    last and not self._buffer,
+                )
+            )
+            self._window = block[-DEFLATE_WINDOW_SIZE:]
+
+    def _collect(self, wait: bool) -> bytes:
+        """Collect the compressed blocks (in order)."""
+        compressed = []
+
+        while self._pending and (
+            wait or self._pending[0].done() or len(self._pending) > self._max_pending
+        ):
+            compressed.append(self._pending.popleft().result())
+
+        return b"".join(compressed)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress the data, returning the compressed blocks already finished."""
+        self._buffer += data
+        self._submit()
+
+        return self._collect(wait=False)
+
+    def flush(self) -> bytes:
+        """Finish the deflate stream, returning the remaining compressed blocks."""
+        if self._buffer:
+            self._submit(last=True)
+            compressed = self._collect(wait=True)
+        else:
+            # the stream is closed by an empty final block.
+            compressed = self._collect(wait=True) + _deflate_block(
+                b"", self._level, b"", True
+            )
+
+        self._window = b""
+        return compressed
+
+
+def _is_compressible(path: Path) -> bool:
+    """Probe if a file is compressible (by compressing a few samples with the fastest level)."""
+    file_size = path.stat().st_size
+
+    if file_size <= PROBE_SAMPLE_SIZE * PROBE_SAMPLES:
+        offsets = [0]
+    else:
+        offsets = [
+            (file_size - PROBE_SAMPLE_SIZE) * idx // (PROBE_SAMPLES - 1)
+            for idx in range(PROBE_SAMPLES)
+        ]
+
+    sample_size = 0
+    compressed_size = 0
+
+    with path.open("rb") as ifile:
+        for offset in offsets:
+            ifile.seek(offset)
+            sample = ifile.read(PROBE_SAMPLE_SIZE)
+
+            sample_size += len(sample)
+            compressed_size += len(zlib.compress(sample, 1))
+
+    return not sample_size or compressed_size < sample_size * PROBE_RATIO_THRESHOLD
+
+
+class CompressionPolicy:
+    """Compression policy of the archive entries.
+
+    The policy defines if a file is compressed or stored (without compression)
+    in the archive. The rules are checked in the following order: (1) the
+    ``compress`` patterns; (2) the ``store`` patterns; (3) the extensions of
+    already-compressed files (e.g., ``.rpz`` and ``.tif``); (4) a compressibility
+    probe, which compresses a few samples of the file.
+
+    Note:
+        The patterns are matched from the right with the file path in the
+        archive (e.g., ``*.tif`` matches the ``tif`` files of any directory).
+    """
+
+    def __init__(
+        self,
+        store: Iterable[str] = None,
+        compress: Iterable[str] = None,
+        probe: bool = True,
+        stored_extensions: Iterable[str] = STORED_EXTENSIONS,
+    ):
+        """Initializer.
+
+        Args:
+            store (Iterable[str]): Patterns of the files always stored.
+
+            compress (Iterable[str]): Patterns of the files always compressed.
+
+            probe (bool): Flag indicating if the files not matched by the other rules are
+            probed. If ``False``, these files are compressed.
+
+            stored_extensions (Iterable[str]): Extensions of the files stored.
+        """
+        self._store = list(store or [])
+        self._compress = list(compress or [])
+        self._probe = probe
+        self._stored_extensions = {extension.lower() for extension in stored_extensions}
+
+    def compress(self, path: Path, arcname: str) -> bool:
+        """Check if a file must be compressed.
+
+        Args:
+            path (Path): File path.
+
+            arcname (str): File name in the archive.
+
+        Returns:
+            bool: ``True`` if the file must be compressed and ``False`` if it must be stored.
+        """
+        arcpath = PurePosixPath(arcname)
+
+        if any(arcpath.match(pattern) for pattern in self._compress):
+            return True
+
+        if any(arcpath.match(pattern) for pattern in self._store):
+            return False
+
+        if arcpath.suffix.lower() in self._stored_extensions:
+            return False
+
+        return _is_compressible(path) if self._probe else True
+
+
+class _CallbackReader(io.RawIOBase):
+    """File reader that sends each read block to a callback (e.g., to hash the file while it is archived)."""
+
+    def __init__(self, file, callback: Callable[[bytes], None] = None):
+        self._file = file
+        self._callback = callback
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        block = self._file.read(size)
+
+        if block and self._callback:
+            self._callback(block)
+
+        return block
+
+
+class ArchiveWriter:
+    """Base archive writer.
+
+    An archive writer streams files (and in-memory contents) to
+    an archive file. Each file is read only once.
+
+    An interrupted archive can be resumed (appended) from the states returned by
+    ``state`` (the resume points, taken every ``ARCHIVE_CHECKPOINT_SIZE`` bytes of added
+    files, see ``checkpoint_due``). The archive is truncated to the end of the last
+    state and the next files are appended.
+    """
+
+    extension = ""
+    """Archive file extension."""
+
+    def __init__(
+        self,
+        file: Union[str, Path],
+        compression_level: int = None,
+        threads: int = 1,
+        resume: List[dict] = None,
+    ):
+        """Initializer.
+
+        Args:
+            file (Union[str, Path]): Archive file.
+
+            compression_level (int): Compression level (if not defined, the format default is used).
+
+            threads (int): Number of threads used to compress the archive.
+
+            resume (List[dict]): States (see ``state``) of the archive file (in the order they
+            were taken). If defined, the archive is resumed from the last state.
+        """
+        self._file = Path(file)
+        self._compression_level = compression_level
+        self._threads = max(threads or 1, 1)
+        self._resume = resume or []
+
+        self._added_size = 0
+        self._state_size = 0
+
+    @classmethod
+    def resumable_states(cls, file: Union[str, Path], states: List[dict]) -> int:
+        """Count the states from which an interrupted archive can be resumed.
+
+        A state recorded just before an interruption (e.g., a hard kill) may point past
+        the end of the archive file (or to content that was not written). So, only the
+        states that fit in the archive file and whose entries are valid are resumable.
+
+        Args:
+            file (Union[str, Path]): Archive file.
+
+            states (List[dict]): States of the archive file (in the order they were taken).
+
+        Returns:
+            int: Length of the longest prefix of the ``states`` that can be resumed.
+        """
+        try:
+            size = os.stat(file).st_size
+        except OSError:
+            return 0
+
+        with open(file, "rb") as ifile:
+            for idx, state in enumerate(states):
+                if state["end"] > size or not cls._verify_state(ifile, state):
+                    return idx
+
+        return len(states)
+
+    @classmethod
+    def _verify_state(cls, ifile: BinaryIO, state: dict) -> bool:
+        """Verify the content of the archive file described by a state."""
+        raise NotImplementedError()
+
+    def _open_resumed(self) -> BinaryIO:
+        """Open the archive file truncated to the end of the last resumed file."""
+        end = self._resume[-1]["end"]
+
+        ofile = self._file.open("r+b")
+
+        if os.fstat(ofile.fileno()).st_size < end:
+            ofile.close()
+            raise ValueError(
+                f"Archive file is smaller than its resume state: {self._file}"
+            )
+
+        ofile.truncate(end)
+        ofile.seek(end)
+
+        return ofile
+
+    def checkpoint_due(self) -> bool:
+        """Check if a resume point is due (``ARCHIVE_CHECKPOINT_SIZE`` bytes added since the last one)."""
+        return self._added_size - self._state_size >= ARCHIVE_CHECKPOINT_SIZE
+
+    def state(self) -> dict:
+        """State of the archive after the last added file (a resume point).
+
+        The archive content is flushed to the archive file, so the state remains valid
+        if the process is killed. Taking a state may reduce the compression (e.g., the
+        ``tar.zst`` frame is closed), so it should be taken when ``checkpoint_due``.
+        """
+        self._state_size = self._added_size
+        return self._state()
+
+    def _state(self) -> dict:
+        """State of the archive after the last added file (see ``state``)."""
+        raise NotImplementedError()
+
+    def add_file(
+        self,
+        path: Path,
+        arcname: str,
+        callback: Callable[[bytes], None] = None,
+        compress: bool = True,
+    ) -> int:
+        """Add a file to the archive.
+
+        Args:
+            path (Path): File to be added.
+
+            arcname (str): File name in the archive.
+
+            callback (Callable[[bytes], None]): Function called with each block read from the file.
+
+            compress (bool): Flag indicating if the file is compressed (otherwise, it is stored).
+
+        Returns:
+            int: File size (in bytes).
+        """
+        raise NotImplementedError()
+
+    def add_bytes(self, arcname: str, content: bytes):
+        """Add an in-memory content to the archive."""
+        raise NotImplementedError()
+
+    def close(self):
+        """Finish the archive."""
+        raise NotImplementedError()
+
+    def __enter__(self):
+        """Use the archive writer in a ``with`` statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Finish the archive at the end of the ``with`` statement."""
+        self.close()
+
+
+class ZipArchiveWriter(ArchiveWriter):
+    """Zip archive writer (deflate).
+
+    With more than one thread, the files are compressed with the
+    block-parallel deflate (``ParallelDeflateCompressor``). These
+    entries are written with a data descriptor (their CRC and sizes
+    are written after the compressed data), as defined in the zip
+    specification. The generated zip file is a regular zip file.
+    """
+
+    extension = ".zip"
+
+    def __init__(
+        self,
+        file: Union[str, Path],
+        compression_level: int = None,
+        threads: int = 1,
+        resume: List[dict] = None,
+    ):
+        """Initializer.
+
+        Args:
+            file (Union[str, Path]): Archive file.
+
+            compression_level (int): Compression level (if not defined, the format default is used).
+
+            threads (int): Number of threads used to compress the archive.
+
+            resume (List[dict]): States (see ``state``) of the archive file. If defined, the
+            archive is resumed from the last state.
+        """
+        super(ZipArchiveWriter, self).__init__(
+            file, compression_level, threads, resume
+        )
+
+        self._ofile = self._open_resumed() if self._resume else None
+        self._zip_file = zipfile.ZipFile(
+            self._ofile or self._file,
+            "w",
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=compression_level,
+        )
+
+        # the entries already written are restored in the zip
+        # writer (they are listed in the zip central directory).
+        for file_state in self._resume:
+            for entry in file_state["entries"]:
+                file_info = zipfile.ZipInfo(
+                    entry["filename"], tuple(entry["date_time"])
+                )
+
+                for field in ZIP_STATE_FIELDS:
+                    setattr(file_info, field, entry[field])
+
+                self._zip_file.filelist.append(file_info)
+                self._zip_file.NameToInfo[file_info.filename] = file_info
+
+        self._state_entries = len(self._zip_file.filelist)
+
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self._threads)
+            if self._threads > 1
+            else None
+        )
+
+    def add_file(
+        self,
+        path: Path,
+        arcname: str,
+        callback: Callable[[bytes], None] = None,
+        compress: bool = True,
+    ) -> int:
+        """Add a file to the archive (see ``ArchiveWriter.add_file``)."""
+        file_info = zipfile.ZipInfo.from_file(path, arcname)
+        file_info.compress_type = (
+            zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        )
+
+        with open(path, "rb") as ifile:
+            if self._executor and compress:
+                self._write_parallel_deflated(ifile, file_info, callback)
+
+            else:
+                with self._zip_file.open(file_info, "w") as ofile:
+                    for block in iter(lambda: ifile.read(HASH_BLOCK_SIZE), b""):
+                        if callback:
+                            callback(block)
+
+                        ofile.write(block)
+
+        self._added_size += file_info.file_size
+        return file_info.file_size
+
+    def _write_parallel_deflated(
+        self,
+        ifile: BinaryIO,
+        file_info: zipfile.ZipInfo,
+        callback: Callable[[bytes], None] = None,
+    ):
+        """Write a zip entry compressed with the block-parallel deflate.
+
+        The local header is written without the CRC and sizes, which are written
+        in the data descriptor after the compressed data. Then, the entry is added
+        in the central directory of the zip writer.
+        """
+        zip64 = file_info.file_size * 1.05 > zipfile.ZIP64_LIMIT
+
+        try:
+            filename = file_info.filename.encode("ascii")
+            file_info.flag_bits = 0x08
+        except UnicodeEncodeError:
+            filename = file_info.filename.encode("utf-8")
+            file_info.flag_bits = 0x08 | 0x800
+
+        file_info.extract_version = max(
+            file_info.extract_version,
+            zipfile.ZIP64_VERSION if zip64 else zipfile.DEFAULT_VERSION,
+        )
+
+        # zip64 entries have the (zero) sizes in the local header extra field.
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if zip64 else b""
+
+        date_time = file_info.date_time
+        dos_date = (date_time[0] - 1980) << 9 | date_time[1] << 5 | date_time[2]
+        dos_time = date_time[3] << 11 | date_time[4] << 5 | (date_time[5] // 2)
+
+        ofile = self._zip_file.fp
+        ofile.seek(self._zip_file.start_dir)
+
+        file_info.header_offset = ofile.tell()
+
+        ofile.write(
+            struct.pack(
+                "<4sHHHHHLLLHH",
+                ZIP_MAGIC,
+                file_info.extract_version,
+                file_info.flag_bits,
+                zipfile.ZIP_DEFLATED,
+                dos_time,
+                dos_date,
+                0,
+                0,
+                0,
+                len(filename),
+                len(extra),
+            )
+        )
+        ofile.write(filename)
+        ofile.write(extra)
+
+        compressor = ParallelDeflateCompressor(
+            self._executor,
+            (
+                self._compression_level
+                if self._compression_level is not None
+                else zlib.Z_DEFAULT_COMPRESSION
+            ),
+            self._threads,
+        )
+
+        crc, file_size, compress_size = 0, 0, 0
+
+        for block in iter(lambda: ifile.read(HASH_BLOCK_SIZE), b""):
+            if callback:
+                callback(block)
+
+            crc = zlib.crc32(block, crc)
+            file_size += len(block)
+
+            compressed = compressor.compress(block)
+            compress_size += len(compressed)
+
+            ofile.write(compressed)
+
+        compressed = compressor.flush()
+        compress_size += len(compressed)
+
+        ofile.write(compressed)
+        ofile.write(
+            struct.pack(
+                "<4sLQQ" if zip64 else "<4sLLL",
+                ZIP_DATA_DESCRIPTOR_MAGIC,
+                crc,
+                compress_size,
+                file_size,
+            )
+        )
+
+        if not zip64 and max(file_size, compress_size) > zipfile.ZIP64_LIMIT:
+            raise RuntimeError(
+                f"File size increased while it was archived: {file_info.filename}"
+            )
+
+        file_info.CRC = crc
+        file_info.file_size = file_size
+        file_info.compress_size = compress_size
+
+        self._zip_file.filelist.append(file_info)
+        self._zip_file.NameToInfo[file_info.filename] = file_info
+        self._zip_file.start_dir = ofile.tell()
+
+    def add_bytes(self, arcname: str, content: bytes):
+        """Add an in-memory content to the archive."""
+        self._zip_file.writestr(arcname, content)
+
+    def _state(self) -> dict:
+        # the state has the entries added after the previous state.
+        file_infos = self._zip_file.filelist[self._state_entries :]
+        self._state_entries = len(self._zip_file.filelist)
+
+        self._zip_file.fp.flush()
+
+        return {
+            "end": self._zip_file.start_dir,
+            "entries": [
+                {
+                    "filename": file_info.filename,
+                    "date_time": list(file_info.date_time),
+                    **{field: getattr(file_info, field) for field in ZIP_STATE_FIELDS},
+                }
+                for file_info in file_infos
+            ],
+        }
+
+    @classmethod
+    def _verify_state(cls, ifile: BinaryIO, state: dict) -> bool:
+        # the local header of each entry must be in place (and the entry data
+        # must end before the end of the state).
+        for entry in state["entries"]:
+            try:
+                filename = entry["filename"].encode("ascii")
+            except UnicodeEncodeError:
+                filename = entry["filename"].encode("utf-8")
+
+            ifile.seek(entry["header_offset"])
+            header = ifile.read(ZIP_HEADER_SIZE + len(filename))
+
+            if (
+                len(header) != ZIP_HEADER_SIZE + len(filename)
+                or header[:4] != ZIP_MAGIC
+                or header[ZIP_HEADER_SIZE:] != filename
+            ):
+                return False
+
+            name_size, extra_size = struct.unpack("<HH", header[26:ZIP_HEADER_SIZE])
+            data_end = (
+                entry["header_offset"]
+                + ZIP_HEADER_SIZE
+                + name_size
+                + extra_size
+                + entry["compress_size"]
+            )
+
+            if data_end > state["end"]:
+                return False
+
+        return True
+
+    def close(self):
+        """Finish the archive (writing the zip central directory)."""
+        self._zip_file.close()
+
+        if self._ofile:
+            self._ofile.close()
+
+        if self._executor:
+            self._executor.shutdown()
+
+
+class _ZstdFramesWriter(io.RawIOBase):
+    """Zstandard writer that switches between a compressed and a stored stream.
+
+    Each switch closes the current zstandard frame. As the concatenation of
+    frames is a valid zstandard stream, the result can be read as a single stream.
+    """
+
+    def __init__(self, ofile, compressor, store_compressor, position: int = 0):
+        self._writers = {
+            True: compressor.stream_writer(ofile, closefd=False),
+            False: store_compressor.stream_writer(ofile, closefd=False),
+        }
+
+        self._compress = True
+        self._position = position
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def select(self, compress: bool):
+        """Select the stream (compressed or stored) used by the next writes."""
+        if compress != self._compress:
+            self.flush_frame()
+            self._compress = compress
+
+    def flush_frame(self):
+        """Close the current zstandard frame (the next writes start a new frame)."""
+        self._writers[self._compress].flush(_import_zstandard().FLUSH_FRAME)
+
+    def write(self, data):
+        self._position += len(data)
+        return self._writers[self._compress].write(data)
+
+    def close(self):
+        if not self.closed:
+            for writer in self._writers.values():
+                writer.close()
+
+        super(_ZstdFramesWriter, self).close()
+
+
+class TarZstArchiveWriter(ArchiveWriter):
+    """Tar archive writer compressed with the multi-threaded zstandard.
+
+    The stored entries are written in separated zstandard frames, with
+    the fastest level (raw blocks for incompressible content). Each
+    ``state`` call also closes the current frame, so the archive can be
+    resumed at the frame boundary (the states should be taken only when
+    ``checkpoint_due``, as each frame restarts the compression context).
+
+    Note:
+        This writer requires the ``zstandard`` library.
+    """
+
+    extension = ".tar.zst"
+
+    def __init__(
+        self,
+        file: Union[str, Path],
+        compression_level: int = None,
+        threads: int = 1,
+        resume: List[dict] = None,
+    ):
+        """Initializer.
+
+        Args:
+            file (Union[str, Path]): Archive file.
+
+            compression_level (int): Compression level (if not defined, the format default is used).
+
+            threads (int): Number of threads used to compress the archive.
+
+            resume (List[dict]): States (see ``state``) of the archive file. If defined, the
+            archive is resumed from the last state.
+        """
+        super(TarZstArchiveWriter, self).__init__(
+            file, compression_level, threads, resume
+        )
+
+        zstandard = _import_zstandard()
+
+        compressor = zstandard.ZstdCompressor(
+            level=compression_level if compression_level is not None else 3,
+            threads=self._threads if self._threads > 1 else 0,
+        )
+
+        self._ofile = self._open_resumed() if self._resume else self._file.open("wb")
+        self._zst_file = _ZstdFramesWriter(
+            self._ofile,
+            compressor,
+            zstandard.ZstdCompressor(level=ZSTD_STORE_LEVEL),
+            self._resume[-1]["offset"] if self._resume else 0,
+        )
+        self._tar_file = tarfile.open(
+            fileobj=self._zst_file, mode="w", format=tarfile.PAX_FORMAT
+        )
+
+        self._state_end = self._resume[-1]["end"] if self._resume else 0
+
+    def add_file(
+        self,
+        path: Path,
+        arcname: str,
+        callback: Callable[[bytes], None] = None,
+        compress: bool = True,
+    ) -> int:
+        """Add a file to the archive (see ``ArchiveWriter.add_file``)."""
+        file_info = self._tar_file.gettarinfo(path, arcname)
+
+        self._zst_file.select(compress)
+
+        with open(path, "rb") as ifile:
+            self._tar_file.addfile(file_info, _CallbackReader(ifile, callback))
+
+        self._added_size += file_info.size
+        return file_info.size
+
+    def add_bytes(self, arcname: str, content: bytes):
+        """Add an in-memory content to the archive."""
+        self._zst_file.select(True)
+
+        file_info = tarfile.TarInfo(arcname)
+        file_info.size = len(content)
+        file_info.mtime = int(time.time())
+
+        self._tar_file.addfile(file_info, io.BytesIO(content))
+
+    def _state(self) -> dict:
+        self._zst_file.flush_frame()
+        self._ofile.flush()
+
+        # the state content starts with a new frame (at the end of the previous state).
+        state = {
+            "start": self._state_end,
+            "end": self._ofile.tell(),
+            "offset": self._tar_file.offset,
+        }
+        self._state_end = state["end"]
+
+        return state
+
+    @classmethod
+    def _verify_state(cls, ifile: BinaryIO, state: dict) -> bool:
+        if state["end"] == state["start"]:
+            return True
+
+        ifile.seek(state["start"])
+        return ifile.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+
+    def close(self):
+        """Finish the archive (closing the last zstandard frame)."""
+        self._tar_file.close()
+        self._zst_file.close()
+        self._ofile.close()
+
+
+ARCHIVE_WRITERS = {"zip": ZipArchiveWriter, "tar.zst": TarZstArchiveWriter}
+"""Archive writers by format."""
+
+
+def archive_writer(
+    archive_format: str,
+    file: Union[str, Path],
+    compression_level: int = None,
+    threads: int = 1,
+    resume: List[dict] = None,
+) -> ArchiveWriter:
+    """Create an archive writer.
+
+    Args:
+        archive_format (str): Archive format (see ``ARCHIVE_FORMATS``).
+
+        file (Union[str, Path]): Archive file.
+
+        compression_level (int): Compression level.
+
+        threads (int): Number of threads used to compress the archive.
+
+        resume (List[dict]): States of the files already added to the archive (see ``ArchiveWriter``).
+
+    Returns:
+        ArchiveWriter: Archive writer.
+    """
+    if archive_format not in ARCHIVE_WRITERS:
+        raise ValueError(
+            f"Invalid archive format: {archive_format} (available: {ARCHIVE_FORMATS})"
+        )
+
+    return ARCHIVE_WRITERS[archive_format](file, compression_level, threads, resume)
+
+
+def archive_format_of(file: Union[str, Path]) -> str:
+    """Detect the format of an archive file (by its content).
+
+    Args:
+        file (Union[str, Path]): Archive file.
+
+    Returns:
+        str: Archive format (``zip``, ``tar.zst`` or ``tar``, for the
+        tar files supported by the ``tarfile`` module, e.g., ``tar.gz``).
+
+    Raises:
+        ValueError: When the format is not supported.
+    """
+    with open(file, "rb") as ifile:
+        magic = ifile.read(4)
+
+    if magic in (ZIP_MAGIC, ZIP_EMPTY_MAGIC):
+        return "zip"
+
+    if magic == ZSTD_MAGIC:
+        return "tar.zst"
+
+    if tarfile.is_tarfile(file):
+        return "tar"
+
+    raise ValueError(f"Unsupported archive format: {file}")
+
+
+def _iter_tar_members(tar_file: tarfile.TarFile) -> Iterator[Tuple[str, BinaryIO]]:
+    """Iterate over the regular files of a tar file (links and devices are rejected)."""
+    for member in tar_file:
+        if member.isdir():
+            continue
+
+        if not member.isfile():
+            raise ValueError(f"Unsupported archive member: {member.name}")
+
+        yield member.name, tar_file.extractfile(member)
+
+
+def iter_archive(
+    file: Union[str, Path], key: Callable[[str], Any] = None
+) -> Iterator[Tuple[str, BinaryIO]]:
+    """Iterate over the files of an archive (the format is detected by the file content).
+
+    The files are read in a single pass, as streams. So, each file must be read
+    before the next one is requested.
+
+    Args:
+        file (Union[str, Path]): Archive file.
+
+        key (Callable[[str], Any]): Function (of the file name) used to sort the
+        files. Only used by the formats with random access (``zip``). The other
+        formats are read in the archive order.
+
+    Returns:
+        Iterator[Tuple[str, BinaryIO]]: File names and (readable) contents.
+    """
+    archive_format = archive_format_of(file)
+
+    if archive_format == "zip":
+        with zipfile.ZipFile(file) as zip_file:
+            members = [member for member in zip_file.infolist() if not member.is_dir()]
+
+            if key:
+                members.sort(key=lambda member: key(member.filename))
+
+            for member in members:
+                with zip_file.open(member) as member_file:
+                    yield member.filename, member_file
+
+    elif archive_format == "tar.zst":
+        zstandard = _import_zstandard()
+
+        with open(file, "rb") as ifile:
+            with zstandard.ZstdDecompressor().stream_reader(
+                ifile, read_across_frames=True
+            ) as zst_file:
+                with tarfile.open(fileobj=zst_file, mode="r|") as tar_file:
+                    yield from _iter_tar_members(tar_file)
+
+    else:
+        with tarfile.open(file) as tar_file:
+            yield from _iter_tar_members(tar_file)
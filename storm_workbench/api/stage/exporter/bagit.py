@@ -5,13 +5,306 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
+import hashlib
+import http.client
+import os
 import shutil
-from distutils.dir_util import copy_tree
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Dict, List, Tuple, Union
+from urllib.parse import urlparse
+from urllib.request import url2pathname, urlopen
 
 import bagit
 
+from storm_workbench.api.backstage.store import HASH_BLOCK_SIZE, hash_file
+from storm_workbench.api.stage.exporter.archive import (ARCHIVE_DEFAULT_FORMAT,
+                                                        ARCHIVE_WRITERS,
+                                                        ArchiveWriter,
+                                                        CompressionPolicy,
+                                                        archive_writer,
+                                                        iter_archive)
 from storm_workbench.api.stage.exporter.base import BaseExporter
+from storm_workbench.api.stage.exporter.checkpoint import Checkpoint
+from storm_workbench.version import __version__
+
+BAGIT_VERSION = "1.0"
+"""BagIt specification version (RFC 8493)."""
+
+BAGIT_DEFAULT_ALGORITHMS = ["sha256", "sha512"]
+"""Manifest algorithms used when no checksum is provided."""
+
+BAGIT_REQUIRED_ALGORITHM = "sha256"
+"""Manifest algorithm always used (the algorithms of the known checksums are extra manifests)."""
+
+FETCH_MODES = ("link", "copy")
+"""Modes to resolve the local (``file://``) entries of the ``fetch.txt``."""
+
+FETCH_DEFAULT_TIMEOUT = 60
+"""Timeout (in seconds) of the network operations to download a ``fetch.txt`` entry."""
+
+
+def _encode_bag_path(path: str) -> str:
+    """Encode a file path to be used in a manifest (RFC 8493, Section 2.1.3)."""
+    return path.replace("%", "%25").replace("\n", "%0A").replace("\r", "%0D")
+
+
+def _decode_bag_path(path: str) -> str:
+    """Decode a file path of a manifest (RFC 8493, Section 2.1.3)."""
+    return path.replace("%0A", "\n").replace("%0D", "\r").replace("%25", "%")
+
+
+def _format_manifest(entries: Dict[str, str]) -> bytes:
+    """Create the content of a (tag) manifest with the ``file path -> checksum`` entries."""
+    return "".join(
+        f"{checksum}  {_encode_bag_path(file_path)}\n"
+        for file_path, checksum in sorted(entries.items())
+    ).encode("utf-8")
+
+
+def _format_fetch(entries: Dict[str, Tuple[str, int]]) -> bytes:
+    """Create the content of a ``fetch.txt`` with the ``file path -> (url, size)`` entries."""
+    return "".join(
+        f"{url} {size}  {_encode_bag_path(file_path)}\n"
+        for file_path, (url, size) in sorted(entries.items())
+    ).encode("utf-8")
+
+
+def _parse_fetch(content: bytes) -> Dict[str, Tuple[str, Union[None, int]]]:
+    """Read the ``file path -> (url, size)`` entries of a ``fetch.txt`` (unknown sizes are ``None``)."""
+    entries = {}
+
+    for line in content.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+
+        url, size, file_path = line.strip("\r").split(None, 2)
+        entries[_decode_bag_path(file_path.strip())] = (
+            url,
+            None if size == "-" else int(size),
+        )
+
+    return entries
+
+
+def _copy_stream(
+    ifile: BinaryIO, algorithms: List[str], ofile: BinaryIO = None
+) -> Tuple[int, Dict[str, str]]:
+    """Hash a stream (with many algorithms in a single read) and, optionally, copy it.
+
+    Returns:
+        Tuple[int, Dict[str, str]]: Stream size and checksums by algorithm.
+    """
+    size = 0
+    file_hashes = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+
+    for block in iter(lambda: ifile.read(HASH_BLOCK_SIZE), b""):
+        for file_hash in file_hashes.values():
+            file_hash.update(block)
+
+        if ofile:
+            ofile.write(block)
+        size += len(block)
+
+    return size, {
+        algorithm: file_hash.hexdigest() for algorithm, file_hash in file_hashes.items()
+    }
+
+
+def _import_path(payload_file: Path, resumable: bool = False) -> Path:
+    """Temporary path where a payload file is imported (the resumable imports use stable names)."""
+    suffix = "import" if resumable else f"{os.getpid()}.import"
+
+    return payload_file.with_name(f".{payload_file.name}.{suffix}")
+
+
+def _resolve_fetch_entry(
+    url: str,
+    payload_file: Path,
+    payload_file_tmp: Path,
+    algorithms: List[str],
+    mode: str,
+    timeout: float = FETCH_DEFAULT_TIMEOUT,
+) -> dict:
+    """Resolve an entry of the ``fetch.txt`` in the temporary file ``payload_file_tmp``.
+
+    The local files (``file://``) are linked (symbolic link to the verified file) or
+    copied, as defined by the ``mode``. The remote files (``http://`` and ``https://``)
+    are downloaded (the ``timeout`` is applied to each network operation). In all
+    cases, the file is hashed while it is read.
+
+    Returns:
+        dict: Payload file description (final and temporary path, size and checksums).
+
+    Raises:
+        bagit.BagValidationError: When the entry can't be resolved (the URL is reported).
+    """
+    try:
+        url_parsed = urlparse(url)
+        payload_file_tmp.unlink(missing_ok=True)
+
+        if url_parsed.scheme == "file":
+            source_file = Path(url2pathname(url_parsed.path))
+
+            with source_file.open("rb") as ifile:
+                if mode == "link":
+                    size, checksums = _copy_stream(ifile, algorithms)
+                    os.symlink(source_file, payload_file_tmp)
+                else:
+                    with payload_file_tmp.open("wb") as ofile:
+                        size, checksums = _copy_stream(ifile, algorithms, ofile)
+
+            if mode != "link":
+                shutil.copymode(source_file, payload_file_tmp)
+
+        elif url_parsed.scheme in ("http", "https"):
+            with urlopen(url, timeout=timeout) as ifile:
+                with payload_file_tmp.open("wb") as ofile:
+                    size, checksums = _copy_stream(ifile, algorithms, ofile)
+
+        else:
+            raise bagit.BagValidationError(f"Unsupported fetch URL: {url}")
+
+    except (OSError, ValueError, http.client.HTTPException) as error:
+        payload_file_tmp.unlink(missing_ok=True)
+        raise bagit.BagValidationError(f"Unable to fetch {url}: {error}")
+
+    return {
+        "path": payload_file,
+        "tmp": payload_file_tmp,
+        "size": size,
+        "checksums": checksums,
+    }
+
+
+def _parse_manifest(content: bytes) -> Dict[str, str]:
+    """Read the ``file path -> checksum`` entries of a (tag) manifest."""
+    entries = {}
+
+    for line in content.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+
+        checksum, file_path = line.strip("\r").split(None, 1)
+        entries[_decode_bag_path(file_path.strip())] = checksum.lower()
+
+    return entries
+
+
+def _parse_bag_info(content: bytes) -> Dict[str, str]:
+    """Read the metadata of a ``bag-info.txt`` file (continuation lines are joined)."""
+    bag_info = {}
+    last_key = None
+
+    for line in content.decode("utf-8").splitlines():
+        if line[:1] in (" ", "\t") and last_key:
+            bag_info[last_key] += " " + line.strip()
+
+        elif ":" in line:
+            last_key, value = line.split(":", 1)
+            last_key = last_key.strip()
+            bag_info[last_key] = value.strip()
+
+    return bag_info
+
+
+def _payload_path(output_dir: Path, name: str) -> Path:
+    """Path where a payload file (``data/...``) of the BagIt is imported.
+
+    Raises:
+        bagit.BagValidationError: When the file path is outside the payload directory.
+    """
+    relative_path = PurePosixPath(name).relative_to("data")
+
+    if relative_path.is_absolute() or ".." in relative_path.parts:
+        raise bagit.BagValidationError(f"Invalid payload file path: {name}")
+
+    return output_dir.joinpath(*relative_path.parts)
+
+
+def _manifest_algorithms(checksums: Dict[str, Dict[str, str]]) -> List[str]:
+    """Define the manifest algorithms (the ones of the known checksums are extra manifests)."""
+    algorithms = {
+        algorithm
+        for file_checksums in checksums.values()
+        for algorithm in file_checksums
+        if algorithm in hashlib.algorithms_available
+    }
+
+    if not algorithms:
+        return BAGIT_DEFAULT_ALGORITHMS
+
+    return sorted(algorithms | {BAGIT_REQUIRED_ALGORITHM})
+
+
+def _bag_tag_files(
+    manifests: Dict[str, Dict[str, str]],
+    payload_size: int,
+    payload_count: int,
+    bag_info: Dict[str, str] = None,
+    fetch: Dict[str, Tuple[str, int]] = None,
+) -> Dict[str, bytes]:
+    """Create the BagIt tag files (RFC 8493).
+
+    Args:
+        manifests (Dict[str, Dict[str, str]]): Payload checksums (``file path -> checksum``) by algorithm.
+
+        payload_size (int): Size of the payload (in bytes).
+
+        payload_count (int): Number of files in the payload.
+
+        bag_info (Dict[str, str]): Extra ``bag-info.txt`` metadata.
+
+        fetch (Dict[str, Tuple[str, int]]): Payload files to be fetched (``file path -> (url, size)``).
+
+    Returns:
+        Dict[str, bytes]: Tag files (name and content). The tag manifests are the last files.
+    """
+    tag_files = {
+        "bagit.txt": (
+            f"BagIt-Version: {BAGIT_VERSION}\nTag-File-Character-Encoding: UTF-8\n"
+        ).encode("utf-8")
+    }
+
+    bag_info = {
+        "Bag-Software-Agent": f"storm-workbench v{__version__}",
+        "Bagging-Date": date.today().isoformat(),
+        "Payload-Oxum": f"{payload_size}.{payload_count}",
+        **(bag_info or {}),
+    }
+    tag_files["bag-info.txt"] = "".join(
+        f"{key}: {value}\n" for key, value in bag_info.items()
+    ).encode("utf-8")
+
+    if fetch:
+        tag_files["fetch.txt"] = _format_fetch(fetch)
+
+    for algorithm, entries in manifests.items():
+        tag_files[f"manifest-{algorithm}.txt"] = _format_manifest(entries)
+
+    # tag manifests (with all tag files).
+    tag_manifests = {
+        f"tagmanifest-{algorithm}.txt": _format_manifest(
+            {
+                name: hashlib.new(algorithm, content).hexdigest()
+                for name, content in tag_files.items()
+            }
+        )
+        for algorithm in manifests
+    }
+
+    return {**tag_files, **tag_manifests}
+
+
+def _tag_manifest_algorithms(tag_files: Dict[str, bytes], prefix: str) -> List[str]:
+    """Algorithms of the (tag) manifests available in the tag files."""
+    return sorted(
+        name[len(prefix) : -len(".txt")]
+        for name in tag_files
+        if name.startswith(prefix) and name.endswith(".txt")
+    )
 
 
 class BagItExporter(BaseExporter):
@@ -23,36 +316,740 @@ class BagItExporter(BaseExporter):
     <https://datatracker.ietf.org/doc/html/rfc8493>.
     """
 
-    def save(self, input_dir: Path, output_file: Path, jobs=2, **kwargs) -> Path:
+    def __init__(self):
+        """Initializer."""
+        self._summary = None
+
+    @property
+    def summary(self) -> Union[None, Dict[str, Union[int, float]]]:
+        """Summary of the last exported BagIt (sizes in bytes and times in seconds).
+
+        The summary has the number of payload files (``files``) and stored files
+        (``stored_files``), the size of the payload (``input_size``), of the
+        stored files (``stored_size``) and of the archive (``output_size``), the
+        bytes saved by the compression (``saved_size``) and the CPU time (of all
+        threads) and wall time spent to create the archive (``cpu_time``, ``wall_time``).
+        """
+        return self._summary
+
+    def save(
+        self,
+        input_dir: Path,
+        output_file: Path,
+        jobs=2,
+        checksums: Dict[str, Dict[str, str]] = None,
+        archive_format: str = ARCHIVE_DEFAULT_FORMAT,
+        compression_level: int = None,
+        compression_policy: CompressionPolicy = None,
+        fetch: Dict[str, Tuple[str, int]] = None,
+        checkpoint: Checkpoint = None,
+        **kwargs,
+    ) -> Path:
+        """Export a directory as a BagIt (archive file).
+
+        The BagIt is streamed to the archive file: each payload file is read once,
+        being hashed while it is compressed. The manifests and the tag files
+        are written at the end. The ``input_dir`` is not modified. Already-compressed
+        files are stored without compression (see ``CompressionPolicy``).
+
+        With a ``checkpoint``, the archived files are recorded at each archive resume
+        point (every ``ARCHIVE_CHECKPOINT_SIZE`` bytes) and an interrupted export keeps its
+        (partial) archive file. So, when the export is resumed, the archive is appended
+        from the last valid resume point (whose files were not modified).
+
+        Args:
+            input_dir (Path): Directory that will be saved in the sharable package.
+
+            output_file (Path): File where the content will be saved (the extension is defined by the ``archive_format``).
+
+            jobs (int): Number of threads used to compress the archive.
+
+            checksums (Dict[str, Dict[str, str]]): Known checksums of the files (relative to the ``input_dir``)
+            by algorithm. These checksums are used in the BagIt manifests (the files are not hashed with
+            these algorithms). The ``sha256`` manifest is always written (computed while the files are
+            archived); the other algorithms are extra manifests.
+
+            archive_format (str): Archive format (``zip`` or ``tar.zst``).
+
+            compression_level (int): Compression level (if not defined, the format default is used).
+
+            compression_policy (CompressionPolicy): Policy defining the files stored without compression.
+            If not defined, the default policy is used.
+
+            fetch (Dict[str, Tuple[str, int]]): Payload files (relative to the ``input_dir``) that are
+            referenced instead of packed (``file path -> (url, size)``). These files are listed in the
+            ``fetch.txt`` (holey bag) and their checksums (including ``sha256``) must be defined in
+            the ``checksums``.
+
+            checkpoint (Checkpoint): Checkpoint of the export (the archived files are recorded in
+            the ``archive`` steps). If the checkpoint file is in the ``input_dir``, it is not exported.
+
+            kwargs: Extra parameters to the BagIt creation (e.g., ``bag_info``).
+
+        Returns:
+            Path: Path to the generated file.
+        """
+        input_dir = Path(input_dir)
+        output_file = Path(output_file)
+        checksums = checksums or {}
+
         # preparing the filename
-        output_file = output_file.parent / output_file.name.replace(".zip", "")
+        extension = ARCHIVE_WRITERS[archive_format].extension
+        output_file_name = output_file.name
+
+        for archive_extension in (".tar.zst", ".zip"):
+            output_file_name = output_file_name.replace(archive_extension, "")
+
+        output_file = output_file.parent / (output_file_name + extension)
+        output_file_tmp = output_file.with_name(f".{output_file.name}.tmp")
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        cpu_time = time.process_time()
+        wall_time = time.perf_counter()
+
+        payload_files = sorted(
+            path.relative_to(input_dir).as_posix()
+            for path in input_dir.rglob("*")
+            if path.is_file() and not (checkpoint and path == checkpoint.file)
+        )
+        algorithms = self._bag_algorithms(checksums, fetch)
+
+        archived_files = {}
+
+        if checkpoint:
+            archived_files = self._archived_files(
+                checkpoint,
+                input_dir,
+                payload_files,
+                algorithms,
+                output_file_tmp,
+                archive_format=archive_format,
+                compression_level=compression_level,
+            )
+
+        try:
+            with archive_writer(
+                archive_format,
+                output_file_tmp,
+                compression_level,
+                jobs,
+                [
+                    file["state"]
+                    for file in archived_files.values()
+                    if "state" in file
+                ],
+            ) as writer:
+                summary = self._write_bag(
+                    writer,
+                    input_dir,
+                    payload_files,
+                    algorithms,
+                    checksums,
+                    compression_policy or CompressionPolicy(),
+                    kwargs.get("bag_info"),
+                    fetch,
+                    archived_files,
+                    checkpoint,
+                )
+        except BaseException:
+            # the partial archive is kept to resume the export.
+            if not checkpoint:
+                output_file_tmp.unlink(missing_ok=True)
+            raise
+
+        os.replace(output_file_tmp, output_file)
+
+        summary["output_size"] = output_file.stat().st_size
+        summary["saved_size"] = summary["input_size"] - summary["output_size"]
+        summary["cpu_time"] = time.process_time() - cpu_time
+        summary["wall_time"] = time.perf_counter() - wall_time
+
+        self._summary = summary
+
+        if checkpoint:
+            checkpoint.discard("archive")
+
+        return output_file
+
+    def _bag_algorithms(
+        self,
+        checksums: Dict[str, Dict[str, str]],
+        fetch: Dict[str, Tuple[str, int]] = None,
+    ) -> List[str]:
+        """Define the manifest algorithms of a BagIt (see ``save``)."""
+        algorithms = _manifest_algorithms(checksums)
+
+        # the referenced files can't be hashed: their checksums must be known.
+        if fetch:
+            algorithms = [
+                algorithm
+                for algorithm in algorithms
+                if all(algorithm in checksums.get(file, {}) for file in fetch)
+            ]
 
-        # bagit!
-        bagit.make_bag(input_dir, processes=jobs, **kwargs)
+            if BAGIT_REQUIRED_ALGORITHM not in algorithms:
+                raise ValueError(
+                    f"The fetched files must have {BAGIT_REQUIRED_ALGORITHM} checksums."
+                )
 
-        # moving the generated bagit
-        # special case: for now, we are creating a zip file with
-        # the bagit. In the future, the Workbench will be extended
-        # to manage the Bagit itself.
-        filename = shutil.make_archive(str(output_file), "zip", input_dir)
+        return algorithms
 
-        return output_file.parent / filename
+    def _archived_files(
+        self,
+        checkpoint: Checkpoint,
+        input_dir: Path,
+        payload_files: List[str],
+        algorithms: List[str],
+        output_file_tmp: Path,
+        **archive_options,
+    ) -> Dict[str, dict]:
+        """Payload files already archived by an interrupted export.
 
-    def load(self, file: Path, output_dir: Path, jobs=2, **kwargs) -> Path:
-        tmp_dir = output_dir / "tmp"
-        tmp_dir.mkdir(exist_ok=True, parents=True)
+        The archived files are the longest prefix of the ``payload_files`` recorded in
+        the checkpoint (with all the manifest algorithms) whose files were not modified,
+        up to the last archive state (resume point) that is valid in the archive file
+        (see ``ArchiveWriter.resumable_states``). If the archive options changed, the
+        archive steps are discarded.
 
-        # extract and validating the BagIt.
-        shutil.unpack_archive(file, tmp_dir)
+        Returns:
+            Dict[str, dict]: Archive steps of the archived files (in the archive order).
+            The last one has the archive state used to resume the archive.
+        """
+        archive_options = {**archive_options, "file": str(output_file_tmp)}
 
-        # validating
-        bag = bagit.Bag(str(tmp_dir))  # nqa
-        bag.validate(processes=jobs, **kwargs)
+        if (
+            checkpoint.get("archive-options", "archive") != archive_options
+            or not output_file_tmp.exists()
+        ):
+            checkpoint.discard("archive")
+            checkpoint.record("archive-options", "archive", **archive_options)
 
-        # moving the validated files
-        exported_data = tmp_dir / "data"
-        copy_tree(str(exported_data), str(output_dir))
+            return {}
 
-        shutil.rmtree(tmp_dir)
+        archived_files = []
+        archive_steps = checkpoint.steps("archive")
+
+        for file in payload_files:
+            archive_step = archive_steps.get(file)
+
+            if (
+                archive_step is None
+                or not all(
+                    algorithm in archive_step["checksums"] for algorithm in algorithms
+                )
+                or not checkpoint.verify_file("archive", file, input_dir / file)
+            ):
+                break
+
+            archived_files.append((file, archive_step))
+
+        # the archive is resumed from the last valid state (the
+        # files archived after this state are archived again).
+        states_idx = [
+            idx
+            for idx, (_, archive_step) in enumerate(archived_files)
+            if "state" in archive_step
+        ]
+        resumable_states = ARCHIVE_WRITERS[
+            archive_options["archive_format"]
+        ].resumable_states(
+            output_file_tmp,
+            [archived_files[idx][1]["state"] for idx in states_idx],
+        )
+
+        archived_files = (
+            dict(archived_files[: states_idx[resumable_states - 1] + 1])
+            if resumable_states
+            else {}
+        )
+
+        # the steps after the resume point describe content that is rewritten.
+        checkpoint.discard("archive")
+        checkpoint.record_files(
+            "archive",
+            [(file, input_dir / file, step) for file, step in archived_files.items()],
+        )
+
+        return archived_files
+
+    def _write_bag(
+        self,
+        writer: ArchiveWriter,
+        input_dir: Path,
+        payload_files: List[str],
+        algorithms: List[str],
+        checksums: Dict[str, Dict[str, str]],
+        compression_policy: CompressionPolicy,
+        bag_info: Dict[str, str] = None,
+        fetch: Dict[str, Tuple[str, int]] = None,
+        archived_files: Dict[str, dict] = None,
+        checkpoint: Checkpoint = None,
+    ) -> Dict[str, int]:
+        """Write a directory as a BagIt in an archive (in a single read pass).
+
+        Args:
+            writer (ArchiveWriter): Archive writer.
+
+            input_dir (Path): Directory with the BagIt payload.
+
+            payload_files (List[str]): Payload files (relative to the ``input_dir``), in the archive order.
+
+            algorithms (List[str]): Manifest algorithms.
+
+            checksums (Dict[str, Dict[str, str]]): Known checksums of the payload files by algorithm.
+
+            compression_policy (CompressionPolicy): Policy defining the files stored without compression.
+
+            bag_info (Dict[str, str]): Extra ``bag-info.txt`` metadata.
+
+            fetch (Dict[str, Tuple[str, int]]): Payload files referenced in the ``fetch.txt``.
+
+            archived_files (Dict[str, dict]): Archive steps of the files already in the archive (resumed export).
+
+            checkpoint (Checkpoint): Checkpoint where the archived files are recorded.
+
+        Returns:
+            Dict[str, int]: Number of files and size (in bytes) of the payload and of the stored files.
+        """
+        fetch = fetch or {}
+        archived_files = archived_files or {}
+
+        manifests = {algorithm: {} for algorithm in algorithms}
+
+        payload_size = 0
+
+        stored_files = 0
+        stored_size = 0
+
+        # archived files recorded at the next resume point.
+        archive_steps = []
+
+        # payload: hashing (only the unknown checksums) while compressing.
+        for file in payload_files:
+            if file in archived_files:
+                archive_step = archived_files[file]
+
+                payload_size += archive_step["size"]
+
+                if not archive_step["compress"]:
+                    stored_files += 1
+                    stored_size += archive_step["size"]
+
+                for algorithm in algorithms:
+                    manifests[algorithm][f"data/{file}"] = archive_step["checksums"][
+                        algorithm
+                    ]
+                continue
+
+            file_checksums = checksums.get(file, {})
+            file_hashes = {
+                algorithm: hashlib.new(algorithm)
+                for algorithm in algorithms
+                if algorithm not in file_checksums
+            }
+
+            def _update_hashes(block, file_hashes=file_hashes):
+                for file_hash in file_hashes.values():
+                    file_hash.update(block)
+
+            file_path = input_dir / file
+            file_compress = compression_policy.compress(file_path, f"data/{file}")
+
+            file_size = writer.add_file(
+                file_path, f"data/{file}", _update_hashes, compress=file_compress
+            )
+            payload_size += file_size
+
+            if not file_compress:
+                stored_files += 1
+                stored_size += file_size
+
+            for algorithm in algorithms:
+                manifests[algorithm][f"data/{file}"] = (
+                    file_hashes[algorithm].hexdigest()
+                    if algorithm in file_hashes
+                    else file_checksums[algorithm]
+                )
+
+            if checkpoint:
+                archive_steps.append(
+                    (
+                        file,
+                        file_path,
+                        dict(
+                            size=file_size,
+                            compress=file_compress,
+                            checksums={
+                                algorithm: manifests[algorithm][f"data/{file}"]
+                                for algorithm in algorithms
+                            },
+                        ),
+                    )
+                )
+
+                # resume point: the state is recorded with the last archived file.
+                if writer.checkpoint_due() or file == payload_files[-1]:
+                    archive_steps[-1][2]["state"] = writer.state()
+
+                    checkpoint.record_files("archive", archive_steps)
+                    archive_steps = []
+
+        # fetched files (they are part of the payload, but they are not packed).
+        for file, (_, file_size) in fetch.items():
+            for algorithm in algorithms:
+                manifests[algorithm][f"data/{file}"] = checksums[file][algorithm]
+
+        fetch_size = sum(file_size for _, file_size in fetch.values())
+
+        # tag files (manifests and tag manifests are the last ones).
+        tag_files = _bag_tag_files(
+            manifests,
+            payload_size + fetch_size,
+            len(payload_files) + len(fetch),
+            bag_info,
+            {f"data/{file}": entry for file, entry in fetch.items()},
+        )
+
+        for name, content in tag_files.items():
+            writer.add_bytes(name, content)
+
+        return {
+            "files": len(payload_files),
+            "resumed_files": len(archived_files),
+            "stored_files": stored_files,
+            "input_size": payload_size,
+            "stored_size": stored_size,
+        }
+
+    def load(
+        self,
+        file: Path,
+        output_dir: Path,
+        jobs=2,
+        fetch_mode: str = "link",
+        fetch_timeout: float = FETCH_DEFAULT_TIMEOUT,
+        checkpoint: Checkpoint = None,
+        **kwargs,
+    ) -> Path:
+        """Import the payload of a BagIt (archive file).
+
+        The payload files are streamed out of the archive straight to the
+        ``output_dir`` (as temporary files in the final directories), being hashed
+        while they are written. After the BagIt validation (with the digests computed
+        during the extraction), the files are renamed to their final names. So,
+        each byte is written only once and no intermediary directory is used.
+
+        The files listed in the ``fetch.txt`` (holey bags) are resolved in parallel
+        and validated as the other payload files.
+
+        With a ``checkpoint``, each extracted (or fetched) file is recorded and an
+        interrupted import keeps its temporary files. So, when the import is resumed,
+        the files not modified since their record are not written (or fetched) again.
+
+        Args:
+            file (Path): BagIt file (the archive format is detected).
+
+            output_dir (Path): Directory where the payload will be saved.
+
+            jobs (int): Number of threads used to resolve the ``fetch.txt`` entries.
+
+            fetch_mode (str): Mode to resolve the local (``file://``) entries of the ``fetch.txt``:
+            ``link`` (the files are verified in place and linked with symbolic links) or ``copy``.
+            The remote entries (``http://`` and ``https://``) are always downloaded.
+
+            fetch_timeout (float): Timeout (in seconds) of the network operations to download
+            the remote entries of the ``fetch.txt``.
+
+            checkpoint (Checkpoint): Checkpoint of the import (the files are recorded in the
+            ``extract`` and ``fetch`` steps).
+
+            kwargs: Validation options: ``fast`` (only the ``Payload-Oxum`` is checked)
+            and ``completeness_only`` (the checksums are not checked).
+
+        Returns:
+            Path: Directory where the payload was saved.
+
+        Raises:
+            bagit.BagValidationError: When the BagIt is invalid. No files are imported.
+        """
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(
+                f"Invalid fetch mode: {fetch_mode} (available: {FETCH_MODES})"
+            )
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(exist_ok=True, parents=True)
+
+        tag_files = {}
+        payload_files = {}
+
+        # the steps of another archive file can't be resumed.
+        if checkpoint and not checkpoint.verify_file("import", "archive", file):
+            checkpoint.discard("extract")
+            checkpoint.discard("fetch")
+            checkpoint.record_file("import", "archive", file)
+
+        # the tag files are read first, when the archive format allows it (the
+        # manifests define the algorithms used to hash the payload).
+        algorithms = list(BAGIT_DEFAULT_ALGORITHMS)
+
+        try:
+            archive_entries = iter_archive(
+                file, key=lambda name: name.startswith("data/")
+            )
+
+            for name, ifile in archive_entries:
+                if not name.startswith("data/"):
+                    tag_files[name] = ifile.read()
+
+                    if name.startswith("manifest-") and not payload_files:
+                        algorithms = [
+                            algorithm
+                            for algorithm in _tag_manifest_algorithms(
+                                tag_files, "manifest-"
+                            )
+                            if algorithm in hashlib.algorithms_available
+                        ]
+                    continue
+
+                payload_file = _payload_path(output_dir, name)
+                payload_file.parent.mkdir(exist_ok=True, parents=True)
+
+                payload_file_tmp = _import_path(payload_file, bool(checkpoint))
+                payload_files[name] = {"path": payload_file, "tmp": payload_file_tmp}
+
+                # resumed import: the file was already extracted.
+                if checkpoint and self._imported_file(
+                    checkpoint, "extract", name, payload_file_tmp, algorithms
+                ):
+                    extract_step = checkpoint.get("extract", name)
+
+                    payload_files[name].update(
+                        size=extract_step["size"], checksums=extract_step["checksums"]
+                    )
+                    continue
+
+                with payload_file_tmp.open("wb") as ofile:
+                    size, checksums = _copy_stream(ifile, algorithms, ofile)
+
+                payload_files[name].update(size=size, checksums=checksums)
+
+                if checkpoint:
+                    checkpoint.record_file(
+                        "extract",
+                        name,
+                        payload_file_tmp,
+                        size=size,
+                        checksums=checksums,
+                    )
+
+            # holey bag: resolving the fetched files.
+            fetch = _parse_fetch(tag_files.get("fetch.txt", b""))
+
+            if fetch:
+                algorithms = [
+                    algorithm
+                    for algorithm in _tag_manifest_algorithms(tag_files, "manifest-")
+                    if algorithm in hashlib.algorithms_available
+                ]
+
+                fetch_files = {
+                    name: _payload_path(output_dir, name)
+                    for name in fetch
+                    if name not in payload_files
+                }
+
+                for name, payload_file in list(fetch_files.items()):
+                    payload_file.parent.mkdir(exist_ok=True, parents=True)
+                    payload_file_tmp = _import_path(payload_file, bool(checkpoint))
+
+                    # resumed import: the file was already fetched.
+                    if checkpoint and self._imported_file(
+                        checkpoint, "fetch", name, payload_file_tmp, algorithms
+                    ):
+                        fetch_step = checkpoint.get("fetch", name)
+
+                        payload_files[name] = {
+                            "path": payload_file,
+                            "tmp": payload_file_tmp,
+                            "size": fetch_step["size"],
+                            "checksums": fetch_step["checksums"],
+                        }
+                        del fetch_files[name]
+
+                def _fetch(name):
+                    payload_file = fetch_files[name]
+                    fetched_file = _resolve_fetch_entry(
+                        fetch[name][0],
+                        payload_file,
+                        _import_path(payload_file, bool(checkpoint)),
+                        algorithms,
+                        fetch_mode,
+                        fetch_timeout,
+                    )
+
+                    if checkpoint:
+                        checkpoint.record_file(
+                            "fetch",
+                            name,
+                            fetched_file["tmp"],
+                            size=fetched_file["size"],
+                            checksums=fetched_file["checksums"],
+                        )
+
+                    return fetched_file
+
+                with ThreadPoolExecutor(max_workers=max(jobs or 1, 1)) as executor:
+                    fetch_futures = {
+                        name: executor.submit(_fetch, name) for name in fetch_files
+                    }
+
+                # all resolved files are registered (to be removed in case of errors).
+                fetch_errors = []
+
+                for name, fetch_future in fetch_futures.items():
+                    if fetch_future.exception() is None:
+                        payload_files[name] = fetch_future.result()
+                    else:
+                        fetch_errors.append((name, fetch_future.exception()))
+
+                for name, fetch_error in fetch_errors:
+                    if not isinstance(fetch_error, bagit.BagValidationError):
+                        raise RuntimeError(
+                            f"Unable to fetch {fetch[name][0]}: {fetch_error}"
+                        ) from fetch_error
+
+                if fetch_errors:
+                    raise bagit.BagValidationError(
+                        "; ".join(str(fetch_error) for _, fetch_error in fetch_errors)
+                    )
+
+                for name, (url, size) in fetch.items():
+                    if size is not None and payload_files[name]["size"] != size:
+                        raise bagit.BagValidationError(
+                            f"Invalid size for {name} (fetched from {url})"
+                        )
+
+            self._validate(tag_files, payload_files, **kwargs)
+
+        except BaseException as error:
+            # the temporary files (if valid) are kept to resume the import.
+            if not checkpoint or isinstance(error, bagit.BagValidationError):
+                for payload_file in payload_files.values():
+                    payload_file["tmp"].unlink(missing_ok=True)
+
+                if checkpoint:
+                    checkpoint.clear()
+            raise
+
+        # moving the validated files (renames in the same directory).
+        for payload_file in payload_files.values():
+            os.replace(payload_file["tmp"], payload_file["path"])
 
         return output_dir
+
+    def _imported_file(
+        self,
+        checkpoint: Checkpoint,
+        kind: str,
+        name: str,
+        payload_file_tmp: Path,
+        algorithms: List[str],
+    ) -> bool:
+        """Check if a payload file was imported (with all the ``algorithms``) by an interrupted import."""
+        import_step = checkpoint.get(kind, name)
+
+        return (
+            import_step is not None
+            and all(algorithm in import_step["checksums"] for algorithm in algorithms)
+            and checkpoint.verify_file(kind, name, payload_file_tmp)
+        )
+
+    def _validate(
+        self,
+        tag_files: Dict[str, bytes],
+        payload_files: Dict[str, dict],
+        fast: bool = False,
+        completeness_only: bool = False,
+        **kwargs,
+    ):
+        """Validate a BagIt with the digests computed during the extraction.
+
+        Args:
+            tag_files (Dict[str, bytes]): Tag files (name and content).
+
+            payload_files (Dict[str, dict]): Extracted payload files (name, temporary path,
+            size and checksums by algorithm).
+
+            fast (bool): Flag indicating if only the ``Payload-Oxum`` is checked.
+
+            completeness_only (bool): Flag indicating if the checksums are not checked.
+
+            kwargs: Not used.
+
+        Raises:
+            bagit.BagValidationError: When the BagIt is invalid.
+        """
+        if "bagit.txt" not in tag_files:
+            raise bagit.BagValidationError("Invalid BagIt: bagit.txt not found.")
+
+        # payload oxum (size and number of files).
+        bag_info = _parse_bag_info(tag_files.get("bag-info.txt", b""))
+        payload_oxum = bag_info.get("Payload-Oxum")
+
+        if payload_oxum:
+            payload_size = sum(file["size"] for file in payload_files.values())
+
+            if payload_oxum != f"{payload_size}.{len(payload_files)}":
+                raise bagit.BagValidationError(
+                    f"Payload-Oxum validation failed. Expected {payload_oxum}, "
+                    f"found {payload_size}.{len(payload_files)}"
+                )
+
+        if fast:
+            return
+
+        # completeness: the manifests must list all the payload files.
+        manifests = {
+            algorithm: _parse_manifest(tag_files[f"manifest-{algorithm}.txt"])
+            for algorithm in _tag_manifest_algorithms(tag_files, "manifest-")
+        }
+
+        if not manifests:
+            raise bagit.BagValidationError("Invalid BagIt: no manifest found.")
+
+        for algorithm, entries in manifests.items():
+            if set(entries) != set(payload_files):
+                raise bagit.BagValidationError(
+                    f"Payload files don't match the manifest-{algorithm}.txt entries: "
+                    f"{sorted(set(entries) ^ set(payload_files))}"
+                )
+
+        if completeness_only:
+            return
+
+        # payload checksums (the algorithms not computed in the extraction are
+        # generated from the extracted files).
+        for algorithm, entries in manifests.items():
+            for name, checksum in entries.items():
+                payload_file = payload_files[name]
+                file_checksum = payload_file["checksums"].get(algorithm) or hash_file(
+                    payload_file["tmp"], algorithm
+                )
+
+                if file_checksum != checksum:
+                    raise bagit.BagValidationError(
+                        f"Invalid {algorithm} checksum for {name}"
+                    )
+
+        # tag files checksums.
+        for algorithm in _tag_manifest_algorithms(tag_files, "tagmanifest-"):
+            entries = _parse_manifest(tag_files[f"tagmanifest-{algorithm}.txt"])
+
+            for name, checksum in entries.items():
+                if name not in tag_files or (
+                    hashlib.new(algorithm, tag_files[name]).hexdigest() != checksum
+                ):
+                    raise bagit.BagValidationError(
+                        f"Invalid {algorithm} checksum for the tag file {name}"
+                    )
@@ -5,6 +5,7 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
+import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Union, List, Tuple
@@ -12,6 +13,10 @@ from typing import Union, List, Tuple
 from storm_workbench.api.backstage.accessor import BackstageAccessor
 from storm_workbench.api.backstage.database.model import ExecutionCompendiumModel
 from storm_workbench.api.stage.base import BaseStageService
+from storm_workbench.api.stage.exporter.archive import (
+    ARCHIVE_DEFAULT_FORMAT,
+    CompressionPolicy,
+)
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 
 
@@ -92,6 +97,68 @@ class BaseExporterService(BaseStageService):
 
         self._exporter = exporter
 
+    def _archive_options(self) -> dict:
+        """Archive options defined in the ``[tool.storm.exporter]`` section.
+
+        Returns:
+            dict: Archive format, compression level, compression policy (the
+            ``[tool.storm.exporter.compression]`` section) and number of threads
+            (``jobs``) used by the exporter to create the archive.
+        """
+        exporter_definitions = self._config.definitions.tool.storm.exporter
+        compression_definitions = exporter_definitions.get("compression") or {}
+
+        return dict(
+            archive_format=exporter_definitions.get("format", ARCHIVE_DEFAULT_FORMAT),
+            compression_level=exporter_definitions.get("level"),
+            compression_policy=CompressionPolicy(
+                store=compression_definitions.get("store"),
+                compress=compression_definitions.get("compress"),
+                probe=compression_definitions.get("probe", True),
+            ),
+            jobs=exporter_definitions.get("threads", exporter_definitions.jobs),
+        )
+
+    def _default_temp_dir(self, kind: str) -> Path:
+        """Get the default exchange directory of an export (in the reproducible storage)."""
+        return self._backstage.storage / "exports" / kind
+
+    def _temp_dir(
+        self, temp_dir: Union[None, str, Path], kind: str, resume: bool = False
+    ) -> Path:
+        """Define the exchange directory of an export.
+
+        Args:
+            temp_dir (Union[None, str, Path]): Exchange directory defined by the user.
+
+            kind (str): Export kind (e.g., ``compendia`` or ``dataset``).
+
+            resume (bool): Flag indicating if the export is resumed.
+
+        Returns:
+            Path: Exchange directory. If not defined by the user, a directory (named by
+            the export ``kind``) in the Workbench reproducible storage is used. This directory
+            is private to the user (``0700``) and unique by Workbench. So, an interrupted export
+            can be resumed. Without ``resume``, this directory is recreated.
+        """
+        if temp_dir:
+            return Path(temp_dir)
+
+        temp_dir = self._default_temp_dir(kind)
+
+        if temp_dir.exists() and not resume:
+            shutil.rmtree(temp_dir)
+
+        temp_dir.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        temp_dir.mkdir(mode=0o700, exist_ok=True)
+
+        return temp_dir
+
+    @property
+    def summary(self) -> Union[None, dict]:
+        """Summary of the last export (if provided by the exporter)."""
+        return getattr(self._exporter, "summary", None)
+
     def save(
         self,
         compendia: List[Tuple[ExecutionCompendiumModel, str]],
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Checkpoints of the resumable exports and imports."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from storm_workbench.api.backstage.store import hash_file
+
+CHECKPOINT_FILE = ".checkpoint.jsonl"
+"""File where the checkpoint of an export (or import) is saved."""
+
+
+def _file_state(path: Union[str, Path]) -> Dict[str, int]:
+    """File state (size, inode and modification time) used to verify a checkpoint step."""
+    file_stat = os.stat(path)
+
+    return {
+        "size": file_stat.st_size,
+        "inode": file_stat.st_ino,
+        "mtime_ns": file_stat.st_mtime_ns,
+    }
+
+
+class Checkpoint:
+    """Checkpoint of an export (or import).
+
+    The checkpoint is an append-only log (JSON Lines) with the completed steps
+    of the process (e.g., staged files and archived entries). Each step is
+    identified by a ``kind`` and a ``key``. As each step is appended (and synced)
+    when completed, an interrupted process can be resumed from its last step.
+    """
+
+    def __init__(self, file: Union[str, Path], resume: bool = False):
+        """Initializer.
+
+        Args:
+            file (Union[str, Path]): Checkpoint file.
+
+            resume (bool): Flag indicating if the steps of the checkpoint file are loaded.
+            If ``False``, the checkpoint file is reset.
+        """
+        self._file = Path(file)
+        self._lock = threading.Lock()
+
+        if resume:
+            self._steps = self._read()
+        else:
+            self._steps = {}
+            self._file.unlink(missing_ok=True)
+
+    @property
+    def file(self) -> Path:
+        """Checkpoint file."""
+        return self._file
+
+    def _read(self) -> Dict[str, Dict[str, dict]]:
+        """Read the steps of the checkpoint file."""
+        steps = {}
+
+        try:
+            lines = self._file.read_text().splitlines()
+        except OSError:
+            return steps
+
+        for line in lines:
+            try:
+                step = json.loads(line)
+            except ValueError:
+                break  # incomplete step (interrupted write).
+
+            if step.get("discard"):
+                steps.pop(step["kind"], None)
+            else:
+                steps.setdefault(step["kind"], {})[step["key"]] = step["data"]
+
+        return steps
+
+    def _append(self, *steps: dict):
+        """Append steps to the checkpoint file."""
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._file.open("a") as ofile:
+            ofile.write("".join(json.dumps(step) + "\n" for step in steps))
+            ofile.flush()
+            os.fsync(ofile.fileno())
+
+    def steps(self, kind: str) -> Dict[str, dict]:
+        """Completed steps of a kind (in the completion order)."""
+        with self._lock:
+            return dict(self._steps.get(kind, {}))
+
+    def get(self, kind: str, key: str) -> Union[None, dict]:
+        """Get a completed step."""
+        with self._lock:
+            return self._steps.get(kind, {}).get(key)
+
+    def record(self, kind: str, key: str, **data):
+        """Record a completed step.
+
+        Args:
+            kind (str): Step kind.
+
+            key (str): Step key.
+
+            data: Step data (JSON serializable).
+        """
+        with self._lock:
+            self._steps.setdefault(kind, {})[key] = data
+            self._append({"kind": kind, "key": key, "data": data})
+
+    def record_file(self, kind: str, key: str, path: Union[str, Path], **data):
+        """Record a completed step that produced (or used) a file.
+
+        The file state (size, inode and modification time) is recorded with the step
+        data to verify the file when the process is resumed (see ``verify_file``).
+        """
+        self.record(kind, key, **data, file=_file_state(path))
+
+    def record_files(self, kind: str, files: List[Tuple[str, Union[str, Path], dict]]):
+        """Record many completed steps that produced (or used) a file (in one write).
+
+        Args:
+            kind (str): Steps kind.
+
+            files (List[Tuple[str, Union[str, Path], dict]]): Tuples with the step key, the
+            file path and the step data (see ``record_file``).
+        """
+        steps = [
+            {"kind": kind, "key": key, "data": {**data, "file": _file_state(path)}}
+            for key, path, data in files
+        ]
+
+        with self._lock:
+            for step in steps:
+                self._steps.setdefault(kind, {})[step["key"]] = step["data"]
+
+            if steps:
+                self._append(*steps)
+
+    def verify_file(
+        self,
+        kind: str,
+        key: str,
+        path: Union[str, Path],
+        algorithm: str = None,
+        checksum: str = None,
+    ) -> bool:
+        """Verify if a file recorded in a step was not modified.
+
+        The file size is always compared. If the file was replaced (other inode or
+        modification time) and the ``algorithm`` and ``checksum`` are defined, the file
+        is hashed. Otherwise, the checksum recorded with the step (if any) is compared.
+
+        Returns:
+            bool: ``True`` if the step is completed and its file is valid.
+        """
+        step = self.get(kind, key)
+
+        if not step or "file" not in step:
+            return False
+
+        try:
+            file_state = _file_state(path)
+        except OSError:
+            return False
+
+        if file_state["size"] != step["file"]["size"]:
+            return False
+
+        if file_state == step["file"]:
+            return checksum is None or step.get("checksum", checksum) == checksum
+
+        if algorithm and checksum:
+            return hash_file(path, algorithm) == checksum
+
+        return False
+
+    def discard(self, kind: str):
+        """Discard the steps of a kind (e.g., to restart a process stage)."""
+        with self._lock:
+            if self._steps.pop(kind, None) is not None:
+                self._append({"kind": kind, "discard": True})
+
+    def clear(self):
+        """Remove the checkpoint (all steps are discarded)."""
+        with self._lock:
+            self._steps = {}
+            self._file.unlink(missing_ok=True)
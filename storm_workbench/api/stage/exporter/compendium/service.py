@@ -5,24 +5,70 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
+import hashlib
+import json
 import os
 import shutil
-import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Union, List, Tuple
 
 from pydash import py_
-from storm_core.helper.persistence import PicklePersistenceContainer
-from storm_hasher import StormHasher
 
 from storm_workbench.api.backstage.accessor import BackstageAccessor
 from storm_workbench.api.backstage.database.model import ExecutionCompendiumModel
+from storm_workbench.api.stage.exporter.archive import iter_archive
 from storm_workbench.api.stage.exporter.bagit import BagItExporter
 from storm_workbench.api.stage.exporter.base import BaseExporter, BaseExporterService
+from storm_workbench.api.stage.exporter.checkpoint import CHECKPOINT_FILE, Checkpoint
+from storm_workbench.persistence import save_graph
 from storm_workbench.template import write_template, markdown_to_html
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 
 
+EXPORT_MANIFEST_FILE = "export.json"
+"""File (in the package) with the description of the exported compendia (export manifest)."""
+
+
+def _vertex_fingerprint(compendium_vtx) -> str:
+    """Generate a fingerprint of a graph vertex (the exported package path is ignored)."""
+    vertex_attributes = {
+        k: v
+        for k, v in compendium_vtx.attributes().items()
+        if k != "environment_package"
+    }
+
+    return hashlib.sha256(
+        json.dumps(vertex_attributes, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def read_export_manifest(file: Union[str, Path]) -> dict:
+    """Read the manifest of a compendia export.
+
+    Args:
+        file (Union[str, Path]): Export manifest file (``export.json``) or exported package.
+
+    Returns:
+        dict: Export manifest.
+
+    Raises:
+        ValueError: When the package doesn't have an export manifest.
+    """
+    file = Path(file)
+
+    if file.suffix == ".json":
+        return json.loads(file.read_text())
+
+    for name, ifile in iter_archive(file):
+        if name == f"data/{EXPORT_MANIFEST_FILE}":
+            return json.load(ifile)
+
+    raise ValueError(f"Export manifest not found in {file}")
+
+
 class CompendiumExporterService(BaseExporterService):
     """Compendium Exporter Service class.
 
@@ -52,14 +98,46 @@ class CompendiumExporterService(BaseExporterService):
         output_dir: Union[str, Path],
         temp_dir: Union[str, Path] = None,
         filename: str = None,
+        since: Union[str, Path] = None,
+        resume: bool = False,
         **kwargs,
     ) -> Path:
+        """Export the Workbench Execution Compendia.
+
+        The export is checkpointed in the ``temp_dir``: the staged packages and the
+        archived files are recorded when they are completed. So, an interrupted
+        export can be resumed (``resume``), skipping the packages already staged and
+        appending the archive, after verifying the sizes and checksums of the files.
+
+        Args:
+            compendia (List[Tuple[ExecutionCompendiumModel, str]]): List of tuple with the Compendium Model
+            object and its status.
+
+            output_dir (Union[str, Path]): Directory where the content will be exported.
+
+            temp_dir (Union[str, Path]): Exchange directory to read/write files during the exportation process.
+
+            filename (str): Output filename.
+
+            since (Union[str, Path]): Export manifest (or package) of a previous export. If defined, a delta
+            export is created: only the compendia whose package or graph vertex changed since the previous
+            export are packaged (the workflow and the export manifest are always updated).
+
+            resume (bool): Flag indicating if an interrupted export (with the same ``temp_dir``) is resumed.
+
+            kwargs: Extra parameters to the Exporter class.
+
+        Returns:
+            Path: Path where the output file was saved.
+        """
+        previous_manifest = read_export_manifest(since) if since else None
+
         # defining the base information
         package_name = f"{self._config.definitions.tool.storm.name}.zip"
 
         # defining the directories and validate them.
         output_dir = Path(output_dir)
-        temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.mkdtemp())
+        temp_dir = self._temp_dir(temp_dir, "compendia", resume)
 
         for _dir, _name in [(temp_dir, "temp_dir"), (output_dir, "output_dir")]:
             if _dir.exists() and not _dir.is_dir():
@@ -67,6 +145,8 @@ class CompendiumExporterService(BaseExporterService):
 
             _dir.mkdir(exist_ok=True, parents=True)
 
+        checkpoint = Checkpoint(temp_dir / CHECKPOINT_FILE, resume=resume)
+
         # checking if the index has outdated/empty execution compendia.
         if self._backstage.execution.index.graph_manager.is_empty:
             raise RuntimeError(
@@ -86,33 +166,153 @@ class CompendiumExporterService(BaseExporterService):
         #   - meta
         #  - package.(md, html)
         #  - workbench.toml
+        #  - export.json
         output_path_compendium = temp_dir / "compendia"
         output_path_compendium.mkdir(exist_ok=True, parents=True)
 
+        pipeline_graph = self._backstage.execution.index.graph_manager.graph
+
+        vertices_fingerprint = {
+            compendium_vtx["name"]: _vertex_fingerprint(compendium_vtx)
+            for compendium_vtx in pipeline_graph.vs
+        }
+
+        # export manifest: description of all compendia (including the
+        # ones not packaged in a delta export).
+        export_manifest = {
+            "id": str(uuid.uuid4()),
+            "created": datetime.now().isoformat(),
+            "base": previous_manifest["id"] if previous_manifest else None,
+            "compendia": {},
+            "removed": {},
+        }
+
         # organizing the compendium bundles.
+        content_store = self._backstage.store
+        checksum_cache = self._backstage.checksums
+
         compendium_exported_bundles = {}
+        compendium_exported_checksums = {}
+
+        exporter_jobs = max(self._config.definitions.tool.storm.exporter.jobs or 1, 1)
+
+        # validating the checksums (only the packages modified after the
+        # last validation are hashed, with a thread pool).
+        compendia_packages = [
+            compendium.compendium_package for compendium, _ in compendia
+        ]
+        compendia_packages_hash = [None] * len(compendia_packages)
+
+        for package_algorithm, packages_idx in py_.group_by(
+            range(len(compendia_packages)),
+            lambda idx: compendia_packages[idx]["algorithm"],
+        ).items():
+            packages_hash = checksum_cache.digest_many(
+                [compendia_packages[idx]["key"] for idx in packages_idx],
+                package_algorithm,
+                jobs=exporter_jobs,
+            )
+
+            for idx, package_hash in zip(packages_idx, packages_hash):
+                compendia_packages_hash[idx] = package_hash
+
+        # the invalid packages are reported in the compendia order.
+        for compendium_package, package_hash in zip(
+            compendia_packages, compendia_packages_hash
+        ):
+            if package_hash != compendium_package["checksum"]:
+                raise RuntimeError(f"Invalid checksum for {compendium_package['key']}")
+
+        packages_to_stage = []
 
         for compendium, _ in compendia:
             compendium_package = compendium.compendium_package
             compendium_output_file = output_path_compendium / f"{compendium.name}.rpz"
 
-            # validating the checksum
-            file_hash = StormHasher(compendium_package["algorithm"]).hash_file(
-                compendium_package["key"]
+            compendium_exported_bundles[compendium.name] = compendium_output_file
+
+            export_manifest["compendia"][compendium.name] = {
+                "package": compendium_output_file.relative_to(temp_dir).as_posix(),
+                "algorithm": compendium_package["algorithm"],
+                "checksum": compendium_package["checksum"],
+                "vertex": vertices_fingerprint.get(compendium.name),
+            }
+
+            # delta export: the compendia not modified are not packaged.
+            if previous_manifest and (
+                previous_manifest["compendia"].get(compendium.name)
+                == export_manifest["compendia"][compendium.name]
+            ):
+                compendium_output_file.unlink(missing_ok=True)
+                continue
+
+            packages_to_stage.append((compendium_package, compendium_output_file))
+
+        def _stage_package(package_to_stage):
+            compendium_package, compendium_output_file = package_to_stage
+
+            package_file = compendium_package["key"]
+            package_algorithm = compendium_package["algorithm"]
+            package_checksum = compendium_package["checksum"]
+
+            compendium_output_file_rel = compendium_output_file.relative_to(
+                temp_dir
+            ).as_posix()
+
+            # resumed export: the package was already staged.
+            if checkpoint.verify_file(
+                "stage",
+                compendium_output_file_rel,
+                compendium_output_file,
+                package_algorithm,
+                package_checksum,
+            ):
+                return compendium_output_file_rel
+
+            # linking the package from the content store (no copies).
+            content_store.add(package_file, package_algorithm, package_checksum)
+            content_store.link(
+                package_algorithm, package_checksum, compendium_output_file
             )
-            if file_hash != compendium_package["checksum"]:
-                raise RuntimeError(f"Invalid checksum for {compendium_package['key']}")
 
-            shutil.copy(compendium_package["key"], compendium_output_file)
-            compendium_exported_bundles[compendium.name] = compendium_output_file
+            checkpoint.record_file(
+                "stage",
+                compendium_output_file_rel,
+                compendium_output_file,
+                checksum=package_checksum,
+            )
+
+            return compendium_output_file_rel
+
+        # staging the packages with a thread pool (the results, and the
+        # errors, are collected in the compendia order).
+        with ThreadPoolExecutor(max_workers=exporter_jobs) as executor:
+            packages_staged = list(executor.map(_stage_package, packages_to_stage))
+
+        for (compendium_package, _), compendium_output_file_rel in zip(
+            packages_to_stage, packages_staged
+        ):
+            compendium_exported_checksums[compendium_output_file_rel] = {
+                compendium_package["algorithm"]: compendium_package["checksum"]
+            }
+
+        # the packages may be replaced by the stored objects (same content).
+        checksum_cache.put_many(
+            [
+                (
+                    compendium_package["key"],
+                    compendium_package["algorithm"],
+                    compendium_package["checksum"],
+                )
+                for compendium_package, _ in packages_to_stage
+            ]
+        )
 
         # workflow directory
         output_path_pipeline = temp_dir / "workflow"
         output_path_pipeline.mkdir(exist_ok=True, parents=True)
 
         # organizing the workflow object
-        pipeline_graph = self._backstage.execution.index.graph_manager.graph
-
         for compendium_vtx in pipeline_graph.vs:
             # the environment package will be relative to the package.
             compendium_vtx["environment_package"] = os.path.join(
@@ -121,7 +321,7 @@ class CompendiumExporterService(BaseExporterService):
 
         # exporting the workflow graph metafile
         pipeline_meta_file = output_path_pipeline / "meta"
-        PicklePersistenceContainer.save(pipeline_graph, pipeline_meta_file)
+        save_graph(pipeline_graph, pipeline_meta_file)
 
         # workbench.toml definition file.
         # we will use the default ``workbench.toml`` to allow the
@@ -143,10 +343,18 @@ class CompendiumExporterService(BaseExporterService):
         required_files = []
         required_environment_variables = []
 
-        for compendium_vtx in pipeline_graph.vs:
-            command = ExecutionCompendiumModel.get(
-                ExecutionCompendiumModel.uuid == compendium_vtx["name"]
+        # loading the registered commands with a single query.
+        self._backstage.database  # initializing the database (if required)
+
+        registered_commands = {
+            str(command.uuid): command
+            for command in ExecutionCompendiumModel.select().where(
+                ExecutionCompendiumModel.uuid.in_(pipeline_graph.vs["name"])
             )
+        }
+
+        for compendium_vtx in pipeline_graph.vs:
+            command = registered_commands[compendium_vtx["name"]]
 
             commands.append(
                 {
@@ -183,6 +391,17 @@ class CompendiumExporterService(BaseExporterService):
 
         markdown_to_html(markdown_template)
 
+        # export manifest (the removed compendia are listed to be removed by the delta import).
+        if previous_manifest:
+            export_manifest["removed"] = {
+                name: compendium["package"]
+                for name, compendium in previous_manifest["compendia"].items()
+                if name not in export_manifest["compendia"]
+            }
+
+        with (temp_dir / EXPORT_MANIFEST_FILE).open("w") as ofile:
+            json.dump(export_manifest, ofile, indent=2)
+
         # defining the output file
         output_file = filename or package_name
         output_file = output_dir / output_file
@@ -191,16 +410,54 @@ class CompendiumExporterService(BaseExporterService):
             output_file.unlink()
 
         # exporting!
-        output_file = self._exporter.save(temp_dir, output_file)
+        output_file = self._exporter.save(
+            temp_dir,
+            output_file,
+            checksums=compendium_exported_checksums,
+            checkpoint=checkpoint,
+            **self._archive_options(),
+        )
+
+        checkpoint.clear()
 
-        if Path(tempfile.gettempdir()) in temp_dir.parents:
+        if temp_dir == self._default_temp_dir("compendia"):
             shutil.rmtree(temp_dir)
 
         return output_file
 
     def load(
-        self, file: Union[str, Path], output_dir: Union[str, Path], **kwargs
+        self,
+        file: Union[str, Path],
+        output_dir: Union[str, Path],
+        resume: bool = False,
+        **kwargs,
     ) -> Path:
+        """Load exported Execution Compendia.
+
+        The package is loaded in a directory inside the ``output_dir`` and, then,
+        its files are moved (renamed) to the ``output_dir``. Delta packages are
+        applied only on the import of their base export: the packaged compendia
+        replace the previous ones and the removed compendia are deleted.
+
+        The import is checkpointed in the ``output_dir`` and an interrupted import
+        keeps its loading directory. So, it can be resumed (``resume``), skipping
+        the files already extracted.
+
+        Args:
+            file (Union[str, Path]): File to be imported
+
+            output_dir (Union[str, Path]): Directory where the content will extracted.
+
+            resume (bool): Flag indicating if an interrupted import is resumed.
+
+            kwargs: Extra parameters to the Exporter class.
+
+        Returns:
+            Path: Path where the output file was saved.
+
+        Raises:
+            RuntimeError: When a delta package is loaded in a directory without its base export.
+        """
         # defining the directories and validate them.
         file = Path(file)
         output_dir = Path(output_dir)
@@ -211,13 +468,64 @@ class CompendiumExporterService(BaseExporterService):
         if output_dir.exists() and not output_dir.is_dir():
             raise ValueError(f"`{file}` must be a valid directory!")
 
-        # importing
-        imported_file = self._exporter.load(
+        # importing (in the same file system of the output directory).
+        import_dir = output_dir / ".import"
+
+        if not resume:
+            shutil.rmtree(import_dir, ignore_errors=True)
+
+        checkpoint = Checkpoint(output_dir / CHECKPOINT_FILE, resume=resume)
+
+        self._exporter.load(
             file,
-            output_dir,
+            import_dir,
             jobs=self._config.definitions.tool.storm.exporter.jobs
             if self._config
             else 2,  # nqa
+            checkpoint=checkpoint,
         )
 
-        return imported_file
+        # checking the delta packages.
+        imported_manifest_file = import_dir / EXPORT_MANIFEST_FILE
+        current_manifest_file = output_dir / EXPORT_MANIFEST_FILE
+
+        imported_manifest = (
+            read_export_manifest(imported_manifest_file)
+            if imported_manifest_file.exists()
+            else {}
+        )
+
+        if imported_manifest.get("base"):
+            current_manifest = (
+                read_export_manifest(current_manifest_file)
+                if current_manifest_file.exists()
+                else {}
+            )
+
+            if current_manifest.get("id") != imported_manifest["base"]:
+                shutil.rmtree(import_dir, ignore_errors=True)
+                checkpoint.clear()
+
+                raise RuntimeError(
+                    "Import error! The delta package must be imported on its base "
+                    f"export ({imported_manifest['base']})."
+                )
+
+            for removed_package in imported_manifest["removed"].values():
+                (output_dir / removed_package).unlink(missing_ok=True)
+
+        # moving the imported files.
+        for imported_file in sorted(import_dir.rglob("*")):
+            if imported_file.is_dir():
+                continue
+
+            output_file = output_dir / imported_file.relative_to(import_dir)
+            output_file.parent.mkdir(exist_ok=True, parents=True)
+
+            os.replace(imported_file, output_file)
+
+        # the loading directory is kept (to resume the import) only on errors.
+        shutil.rmtree(import_dir, ignore_errors=True)
+        checkpoint.clear()
+
+        return output_dir
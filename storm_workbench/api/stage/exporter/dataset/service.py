@@ -7,21 +7,26 @@
 
 import json
 import shutil
-import tempfile
-import uuid
 from pathlib import Path
-from typing import Union, List, Tuple
+from typing import Dict, List, Tuple, Union
+from urllib.parse import quote
 
-from joblib import Parallel, delayed
 from pydash import py_
-from storm_hasher import StormHasher
 
 from storm_workbench.api.backstage.accessor import BackstageAccessor
 from storm_workbench.api.backstage.database.model import ExecutionCompendiumModel
-from storm_workbench.api.stage.exporter.bagit import BagItExporter
+from storm_workbench.api.backstage.staging import stage_files
+from storm_workbench.api.stage.exporter.bagit import (
+    BAGIT_REQUIRED_ALGORITHM,
+    BagItExporter,
+)
 from storm_workbench.api.stage.exporter.base import BaseExporterService, BaseExporter
+from storm_workbench.api.stage.exporter.checkpoint import CHECKPOINT_FILE, Checkpoint
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 
+DATASET_EXPORT_MODES = ("copy", "fetch")
+"""Dataset export modes (``fetch``: holey bag, with the files referenced in the ``fetch.txt``)."""
+
 
 def _make_path(base_uri, path, filename, path_dimensions, split_length) -> Path:
     """Generate a path as base location for a file.
@@ -55,6 +60,32 @@ def _make_path(base_uri, path, filename, path_dimensions, split_length) -> Path:
     return Path(os.path.join(base_uri, *uri_parts))
 
 
+def _file_url(file_path: Path, base_path: str = None, base_url: str = None) -> str:
+    """Generate the URL used to fetch a file.
+
+    Args:
+        file_path (Path): File path.
+
+        base_path (str): Base directory of the files available in the ``base_url``.
+
+        base_url (str): URL where the ``base_path`` files are available.
+
+    Returns:
+        str: File URL. Files outside the ``base_path`` are referenced with ``file://`` URLs.
+    """
+    file_path = file_path.absolute()
+
+    if base_path and base_url:
+        try:
+            file_path_rel = file_path.relative_to(Path(base_path).absolute())
+        except ValueError:
+            pass
+        else:
+            return f"{base_url.rstrip('/')}/{quote(file_path_rel.as_posix())}"
+
+    return file_path.as_uri()
+
+
 class DatasetExporterService(BaseExporterService):
 
     exporter_cls = BagItExporter
@@ -69,6 +100,21 @@ class DatasetExporterService(BaseExporterService):
         super(DatasetExporterService, self).__init__(config, backstage)
 
         self._exporter = exporter or self.exporter_cls()
+        self._staging = None
+
+    @property
+    def summary(self) -> Union[None, dict]:
+        """Summary of the last export.
+
+        In addition to the exporter summary, the ``staging`` key has the copy
+        results (``size``, ``elapsed`` time and ``throughput``) of each file.
+        """
+        exporter_summary = super(DatasetExporterService, self).summary
+
+        if exporter_summary is None:
+            return None
+
+        return {**exporter_summary, "staging": self._staging or []}
 
     def save(
         self,
@@ -76,14 +122,54 @@ class DatasetExporterService(BaseExporterService):
         output_dir: Union[str, Path],
         temp_dir: Union[str, Path] = None,
         filename: str = None,
+        mode: str = None,
+        resume: bool = False,
         **kwargs,
     ):
+        """Export the input data of the Workbench Compendia.
+
+        The export is checkpointed in the ``temp_dir``: the staged files and the
+        archived files are recorded when they are completed. So, an interrupted
+        export can be resumed (``resume``), skipping the files already staged and
+        appending the archive, after verifying the sizes and checksums of the files.
+
+        Args:
+            compendia (List[Tuple[ExecutionCompendiumModel, str]]): List of tuple with the Compendium Model
+            object and its status.
+
+            output_dir (Union[str, Path]): Directory where the content will be exported.
+
+            temp_dir (Union[str, Path]): Exchange directory to read/write files during the exportation process.
+
+            filename (str): Output filename.
+
+            mode (str): Export mode: ``copy`` (the files are packed) or ``fetch`` (the files are
+            referenced in the ``fetch.txt`` of a holey bag). If not defined, the mode of the
+            ``[tool.storm.exporter.dataset]`` section is used.
+
+            resume (bool): Flag indicating if an interrupted export (with the same ``temp_dir``) is resumed.
+
+            kwargs: Extra parameters to the Exporter class.
+
+        Returns:
+            Path: Path where the output file was saved.
+        """
+        dataset_definitions = (
+            self._config.definitions.tool.storm.exporter.get("dataset") or {}
+        )
+        mode = mode or dataset_definitions.get("mode", "copy")
+
+        if mode not in DATASET_EXPORT_MODES:
+            raise ValueError(
+                f"Invalid export mode: {mode} (available: {DATASET_EXPORT_MODES})"
+            )
+
         # defining the base information
         package_name = f"{self._config.definitions.tool.storm.name}.zip"
 
         # defining the directories and validate them.
         output_dir = Path(output_dir)
-        temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.mkdtemp())
+        temp_dir = self._temp_dir(temp_dir, "dataset", resume)
 
         for _dir, _name in [(temp_dir, "temp_dir"), (output_dir, "output_dir")]:
             if _dir.exists() and not _dir.is_dir():
@@ -91,6 +177,8 @@ class DatasetExporterService(BaseExporterService):
 
             _dir.mkdir(exist_ok=True, parents=True)
 
+        checkpoint = Checkpoint(temp_dir / CHECKPOINT_FILE, resume=resume)
+
         # organizing the compendia files.
         # at the end of script, a directory with the following structure will
         # be created:
@@ -124,49 +212,52 @@ class DatasetExporterService(BaseExporterService):
         # to reproduce experiments with external data.
         files_description = {"checksum": {}, "files": []}
 
-        def _validate_and_copy_callback(file):
-            """callback function to validate and copy the files."""
-            file_id = str(uuid.uuid4())
-            file_path = Path(file["key"])
-            file_hash = StormHasher(file["algorithm"]).hash_file(file_path)
+        # deduplicating the files by content: files with the same checksum (e.g., an
+        # input used by many compendia) are packed once, in a content-addressed path.
+        unique_files = {}
 
-            # creating a path into the package
-            # rationale: we don't use the filenames to avoid
-            # encoding problems.
-            file_path_package_rel = _make_path(base_output_dir, file_id, "data", 2, 2)
-            file_path_package_fs = temp_dir / file_path_package_rel
+        for file in files_to_pack:
+            unique_files.setdefault((file["algorithm"], file["checksum"]), file)
 
-            if file_hash != file["checksum"]:
-                raise RuntimeError(f"Invalid checksum for {file_path.name}")
+        unique_files = list(unique_files.values())
 
-            # copying the file to the temporary directory.
-            file_path_package_fs.parent.mkdir(exist_ok=True, parents=True)
+        exporter_jobs = self._config.definitions.tool.storm.exporter.jobs
 
-            shutil.copy(file_path, file_path_package_fs)
+        if mode == "fetch":
+            files_target, files_fetch, files_checksums = self._reference_files(
+                unique_files, base_output_dir, dataset_definitions, exporter_jobs
+            )
+        else:
+            files_target = self._stage_files(
+                unique_files, temp_dir, base_output_dir, exporter_jobs, checkpoint
+            )
+            files_fetch, files_checksums = None, {}
+
+        # organizing the files description: all the sources are
+        # described (the duplicated ones share the same target).
+        files_source = {}
 
-            # returning the file description.
-            return {
-                "checksum": (file_path.name, file_hash),
-                "files": (file_path.name, str(file_path_package_rel)),
-            }
+        for file in files_to_pack:
+            file_name = Path(file["key"]).name
 
-        # setup a joblib worker process.
-        files_description_res = Parallel(
-            n_jobs=self._config.definitions.tool.storm.exporter.jobs
-        )(delayed(_validate_and_copy_callback)(file) for file in files_to_pack)
+            files_description["checksum"][file_name] = file["checksum"]
+            files_source[file_name] = str(
+                files_target[(file["algorithm"], file["checksum"])]
+            )
 
-        # organizing the files description
-        files_description["checksum"] = {
-            k: v for k, v in [p["checksum"] for p in files_description_res]
-        }
         files_description["files"] = [
-            {"source": k, "target": v}
-            for k, v in [p["files"] for p in files_description_res]
+            {"source": k, "target": v} for k, v in files_source.items()
         ]
 
-        # saving the files description.
-        with output_file_meta.open("w") as ofile:
-            json.dump(files_description, ofile)
+        # saving the files description (the file is rewritten only if
+        # modified, so it is not archived again in a resumed export).
+        files_description = json.dumps(files_description)
+
+        if (
+            not output_file_meta.exists()
+            or output_file_meta.read_text() != files_description
+        ):
+            output_file_meta.write_text(files_description)
 
         # defining the output file
         output_file = filename or f"{package_name}-dataset"
@@ -179,17 +270,225 @@ class DatasetExporterService(BaseExporterService):
         output_file = self._exporter.save(
             input_dir=temp_dir,
             output_file=output_file,
-            jobs=self._config.definitions.tool.storm.exporter.jobs,
+            checksums={
+                target.as_posix(): {
+                    algorithm: checksum,
+                    **files_checksums.get(target.as_posix(), {}),
+                }
+                for (algorithm, checksum), target in files_target.items()
+            },
+            fetch=files_fetch,
+            checkpoint=checkpoint,
+            **self._archive_options(),
         )
 
-        if Path(tempfile.gettempdir()) in temp_dir.parents:
+        checkpoint.clear()
+
+        if temp_dir == self._default_temp_dir("dataset"):
             shutil.rmtree(temp_dir)
 
         return output_file
 
+    def _stage_files(
+        self,
+        files: List[dict],
+        temp_dir: Path,
+        base_output_dir: str,
+        jobs: int,
+        checkpoint: Checkpoint = None,
+    ) -> Dict[Tuple[str, str], Path]:
+        """Copy the files to the package directory (validating their checksums).
+
+        Each validated copy is recorded in the ``checkpoint`` (``stage`` steps). The
+        files already staged (verified by size and checksum) are not copied again.
+
+        Args:
+            files (List[dict]): Files (``key``, ``algorithm`` and ``checksum``) to be copied.
+
+            temp_dir (Path): Package directory.
+
+            base_output_dir (str): Directory (relative to the package) where the files are copied.
+
+            jobs (int): Number of threads used to copy the files.
+
+            checkpoint (Checkpoint): Checkpoint of the export.
+
+        Returns:
+            Dict[Tuple[str, str], Path]: Path of the files in the package (relative to the
+            ``temp_dir``) by algorithm and checksum.
+        """
+        # checking the cached checksums: the files not modified since the last
+        # validation are copied inside the kernel. The remaining files are
+        # hashed while they are copied.
+        checksum_cache = self._backstage.checksums
+
+        files_target = {}
+        files_to_stage = []
+
+        for file in files:
+            # creating a path into the package (addressed by the file checksum)
+            # rationale: we don't use the filenames to avoid
+            # encoding problems.
+            file_path_package_rel = _make_path(
+                f"{base_output_dir}/{file['algorithm']}", file["checksum"], "data", 2, 2
+            )
+            files_target[(file["algorithm"], file["checksum"])] = file_path_package_rel
+
+            # resumed export: the file was already staged.
+            if checkpoint and checkpoint.verify_file(
+                "stage",
+                file_path_package_rel.as_posix(),
+                temp_dir / file_path_package_rel,
+                file["algorithm"],
+                file["checksum"],
+            ):
+                continue
+
+            files_to_stage.append((file, file_path_package_rel))
+
+        files_cached_hash = [
+            checksum_cache.get(file["key"], file["algorithm"])
+            for file, _ in files_to_stage
+        ]
+
+        for (file, _), file_cached_hash in zip(files_to_stage, files_cached_hash):
+            if file_cached_hash is not None and file_cached_hash != file["checksum"]:
+                raise RuntimeError(f"Invalid checksum for {Path(file['key']).name}")
+
+        def _staged(idx, file_staging):
+            file, file_path_package_rel = files_to_stage[idx]
+            file_hash = files_cached_hash[idx] or file_staging["checksum"]
+
+            # only the valid copies are recorded.
+            if checkpoint and file_hash == file["checksum"]:
+                checkpoint.record_file(
+                    "stage",
+                    file_path_package_rel.as_posix(),
+                    file_staging["target"],
+                    checksum=file_hash,
+                )
+
+        # copying the files with a thread pool (the results keep the files order).
+        self._staging = stage_files(
+            [
+                (
+                    Path(file["key"]),
+                    temp_dir / file_path_package_rel,
+                    None if file_cached_hash else file["algorithm"],
+                )
+                for (file, file_path_package_rel), file_cached_hash in zip(
+                    files_to_stage, files_cached_hash
+                )
+            ],
+            jobs=jobs,
+            callback=_staged,
+        )
+
+        files_generated_hash = []
+
+        for (file, _), file_cached_hash, file_staging in zip(
+            files_to_stage, files_cached_hash, self._staging
+        ):
+            file_path = Path(file["key"])
+            file_hash = file_cached_hash or file_staging["checksum"]
+
+            if file_hash != file["checksum"]:
+                raise RuntimeError(f"Invalid checksum for {file_path.name}")
+
+            if file_cached_hash is None:
+                files_generated_hash.append((file_path, file["algorithm"], file_hash))
+
+        checksum_cache.put_many(files_generated_hash)
+
+        return files_target
+
+    def _reference_files(
+        self,
+        files: List[dict],
+        base_output_dir: str,
+        dataset_definitions: dict,
+        jobs: int,
+    ) -> Tuple[
+        Dict[Tuple[str, str], Path],
+        Dict[str, Tuple[str, int]],
+        Dict[str, Dict[str, str]],
+    ]:
+        """Reference the files in the package (holey bag), validating their checksums.
+
+        Args:
+            files (List[dict]): Files (``key``, ``algorithm`` and ``checksum``) to be referenced.
+
+            base_output_dir (str): Directory (relative to the package) where the files will be fetched.
+
+            dataset_definitions (dict): Dataset exporter definitions (``base_path`` and ``base_url``).
+
+            jobs (int): Number of threads used to hash the files (only the files not cached are hashed).
+
+        Returns:
+            Tuple[Dict[Tuple[str, str], Path], Dict[str, Tuple[str, int]], Dict[str, Dict[str, str]]]: Path
+            of the files in the package by algorithm and checksum, the ``fetch.txt`` entries (``path -> (url, size)``)
+            and the ``sha256`` checksums of the referenced files (required by the bag manifests).
+        """
+        checksum_cache = self._backstage.checksums
+
+        files_target = {}
+        files_fetch = {}
+        files_checksums = {}
+
+        for algorithm, algorithm_files in py_.group_by(files, "algorithm").items():
+            algorithm_files_key = [file["key"] for file in algorithm_files]
+            algorithm_files_hash = checksum_cache.digest_many(
+                algorithm_files_key, algorithm, jobs=jobs
+            )
+
+            # the referenced files are not read by the exporter: the checksums
+            # of the required manifest are generated here (and cached).
+            required_files_hash = algorithm_files_hash
+
+            if algorithm != BAGIT_REQUIRED_ALGORITHM:
+                required_files_hash = checksum_cache.digest_many(
+                    algorithm_files_key, BAGIT_REQUIRED_ALGORITHM, jobs=jobs
+                )
+
+            for file, file_hash, required_file_hash in zip(
+                algorithm_files, algorithm_files_hash, required_files_hash
+            ):
+                file_path = Path(file["key"])
+
+                if file_hash != file["checksum"]:
+                    raise RuntimeError(f"Invalid checksum for {file_path.name}")
+
+                file_path_package_rel = _make_path(
+                    f"{base_output_dir}/{algorithm}", file["checksum"], "data", 2, 2
+                )
+
+                files_target[(algorithm, file["checksum"])] = file_path_package_rel
+                files_fetch[file_path_package_rel.as_posix()] = (
+                    _file_url(
+                        file_path,
+                        dataset_definitions.get("base_path"),
+                        dataset_definitions.get("base_url"),
+                    ),
+                    file_path.stat().st_size,
+                )
+                files_checksums[file_path_package_rel.as_posix()] = {
+                    BAGIT_REQUIRED_ALGORITHM: required_file_hash
+                }
+
+        return files_target, files_fetch, files_checksums
+
     def load(
-        self, file: Union[str, Path], output_dir: Union[str, Path], **kwargs
+        self,
+        file: Union[str, Path],
+        output_dir: Union[str, Path],
+        resume: bool = False,
+        **kwargs,
     ) -> Path:
+        """Load an exported dataset.
+
+        The import is checkpointed in the ``output_dir``. So, an interrupted
+        import can be resumed (``resume``), skipping the files already extracted.
+        """
         # defining the directories and validate them.
         file = Path(file)
         output_dir = Path(output_dir)
@@ -201,15 +500,20 @@ class DatasetExporterService(BaseExporterService):
             raise ValueError(f"`{file}` must be a valid directory!")
 
         # importing
+        checkpoint = Checkpoint(output_dir / CHECKPOINT_FILE, resume=resume)
+
         output_dir = self._exporter.load(
             file=file,
             output_dir=output_dir,
             jobs=self._config.definitions.tool.storm.exporter.jobs
             if self._config
             else 2,  # nqa
+            checkpoint=checkpoint,
             **kwargs,
         )
 
+        checkpoint.clear()
+
         # updating the `data.json` path
         data_file = next(output_dir.glob("*datapackage.json"))
         if data_file:
@@ -6,12 +6,39 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import json
+import os
+import tempfile
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Union, List
+from typing import Dict, Iterable, List, Union
 
+from pydash import py_
+from storm_core.index.graph import VertexStatus
 from storm_core.parser import ShellCommandParser, load_stormfile
 
-from storm_workbench.api.backstage.database.model import ExecutionCompendiumModel
+from storm_workbench import constants
+from storm_workbench.api.backstage.cache import ExecutionCache
+from storm_workbench.api.backstage.database import db
+from storm_workbench.api.backstage.database.model import (
+    ExecutionCompendiumModel,
+    ExecutionDurationModel,
+    ExecutionFingerprintModel,
+)
+from storm_workbench.api.backstage.fingerprint import (
+    ExecutionMemo,
+    execution_environment,
+    relative_key,
+    request_digest,
+)
+from storm_workbench.api.backstage.graph import ancestors_subgraph
+from storm_workbench.api.backstage.schedule import execution_schedule
+from storm_workbench.api.backstage.verification import (
+    VERIFICATION_REPORT_FILE,
+    save_verification_report,
+    verification_report,
+    verify_outputs,
+)
 from storm_workbench.api.stage.base import BaseStageService
 from storm_workbench.api.stage.decorator import pass_database_service
 from storm_workbench.exceptions import InvalidCommand
@@ -39,8 +66,529 @@ class ExecutionOperationService(BaseStageService):
 
         self._database_service = database_service
 
+    def _execute(self, operation, *args, rewritten: Iterable[str] = (), **kwargs):
+        """Execute an operation, keeping the compendia packages in the content store.
+
+        The packages of the compendia rewritten by the operation are unshared from the
+        stored objects (copy-on-write) before the operation, so the execution engine can
+        rewrite them without modifying the stored objects. The other packages remain
+        linked to the store (the stored objects modified in place anyway are discarded).
+        After the operation, the new and rewritten packages are added to the store
+        (deduplicated).
+
+        Args:
+            operation (Callable): Operation to be executed.
+
+            rewritten (Iterable[str]): Names of the compendia rewritten by the operation.
+        """
+        store = self._backstage.store
+        index_lookup = self._backstage.execution.lookup
+
+        rewritten = set(map(str, rewritten))
+        indexed_packages = index_lookup.packages()
+
+        store.unshare(
+            package[0]
+            for name, package in indexed_packages.items()
+            if name in rewritten
+        )
+
+        linked_objects = store.stat_objects(
+            (package[1], package[2])
+            for name, package in indexed_packages.items()
+            if name not in rewritten
+        )
+
+        try:
+            result = operation(*args, **kwargs)
+            self._backstage.session.bump_generation()
+        finally:
+            store.discard_modified(linked_objects)
+            store.attach(index_lookup.packages().values())
+
+        return result
+
+    def _execution_memo(self, shared: bool = False) -> ExecutionMemo:
+        """Create the execution memo (with the current environment and executor definitions).
+
+        Args:
+            shared (bool): Flag indicating if the memoization is used with the shared execution
+            cache. In this case, only the environment variables defined in the ``[tool.storm.cache]``
+            section are used.
+        """
+        storm_definitions = self._config.definitions.tool.storm
+        executor_definitions = storm_definitions.executor
+
+        included_environment_variables = None
+
+        if shared:
+            cache_definitions = storm_definitions.get("cache") or {}
+            included_environment_variables = cache_definitions.get("environment") or []
+
+        return ExecutionMemo(
+            self._backstage.checksums,
+            storm_definitions.basepath,
+            execution_environment(
+                storm_definitions.get("ignored_environment_variables"),
+                included_environment_variables,
+            ),
+            dict(
+                type=executor_definitions.get("type", constants.WB_DEFAULT_EXECUTOR),
+                options=dict(executor_definitions.get("options") or {}),
+            ),
+        )
+
+    def _reusable_compendia(
+        self, request: str, memo: ExecutionMemo
+    ) -> Union[None, List[object]]:
+        """Compendia produced by a previous execution of a request (if they can be reused).
+
+        Args:
+            request (str): Request digest (see ``storm_workbench.api.backstage.fingerprint.request_digest``).
+
+            memo (ExecutionMemo): Execution memoization.
+
+        Returns:
+            Union[None, List[object]]: Indexed compendia. If the request was not executed (or any of
+            its compendia is outdated or has a different fingerprint), None is returned.
+        """
+        fingerprints = list(
+            ExecutionFingerprintModel.select().where(
+                ExecutionFingerprintModel.request == request
+            )
+        )
+
+        if not fingerprints:
+            return None
+
+        index_lookup = self._backstage.execution.lookup
+        compendia = []
+
+        for record in fingerprints:
+            compendium = index_lookup.compendium(record.uuid)
+
+            if (
+                compendium is None
+                or index_lookup.status(record.uuid) != VertexStatus.Updated
+                or memo.current_fingerprint(compendium) != record.fingerprint
+            ):
+                return None
+
+            compendia.append(compendium)
+
+        return compendia
+
+    def _cached_compendia(self, request: str) -> Union[None, List[object]]:
+        """Compendia of an execution published in the shared execution cache.
+
+        Args:
+            request (str): Request digest (see ``storm_workbench.api.backstage.fingerprint.request_digest``).
+
+        Returns:
+            Union[None, List[object]]: Indexed compendia. If the request was not published with the
+            current fingerprint (or its commands are already indexed), None is returned.
+        """
+        execution_cache = self._backstage.cache
+
+        if execution_cache is None:
+            return None
+
+        memo = self._execution_memo(shared=True)
+        graph = self._backstage.execution.index.graph_manager.graph
+
+        indexed_names, indexed_commands = set(), set()
+
+        if graph.vcount():
+            indexed_names = set(map(str, graph.vs["name"]))
+            indexed_commands = set(map(str, graph.vs["command"]))
+
+        for entry in execution_cache.entries(request):
+            compendia = entry["compendia"]
+
+            # the indexed commands are executed (the Storm Core updates them).
+            if any(
+                compendium["name"] in indexed_names
+                or compendium["command"] in indexed_commands
+                for compendium in compendia
+            ):
+                continue
+
+            # the inputs produced by the cached compendia are provided by the cache.
+            provided = {
+                output["key"]: output["checksum"]
+                for compendium in compendia
+                for output in compendium["outputs"]
+            }
+
+            if all(
+                memo.current_fingerprint(compendium, provided, check_outputs=False)
+                == compendium["fingerprint"]
+                for compendium in compendia
+            ):
+                cached_compendia = self._checkout_cached_compendia(
+                    execution_cache, entry
+                )
+
+                if cached_compendia is not None:
+                    return cached_compendia
+
+        return None
+
+    def _checkout_cached_compendia(
+        self, execution_cache: ExecutionCache, entry: Dict
+    ) -> Union[None, List[object]]:
+        """Link the compendia of a cache entry in the workbench and index them.
+
+        The compendia packages and outputs are linked in the workbench. Then, the indexed
+        documents of the compendia are indexed (in execution order) as the executed
+        compendia are, so the graph index is the same of a real execution.
+
+        Args:
+            execution_cache (ExecutionCache): Shared execution cache.
+
+            entry (Dict): Cache entry.
+
+        Returns:
+            Union[None, List[object]]: Indexed compendia. If the entry files are not available (or
+            were modified), None is returned.
+        """
+        working_directory = Path(self._config.definitions.tool.storm.basepath)
+        compendia_dir = self._backstage.storage / "compendia"
+
+        packages = {
+            compendium["name"]: compendium["package"]
+            for compendium in entry["compendia"]
+        }
+        packages_file = [
+            (package["algorithm"], package["checksum"], compendia_dir / package["name"])
+            for package in packages.values()
+        ]
+
+        files = packages_file + [
+            (output["algorithm"], output["checksum"], working_directory / output["key"])
+            for compendium in entry["compendia"]
+            for output in compendium["outputs"]
+        ]
+
+        if not execution_cache.checkout(entry, files):
+            return None
+
+        # verifying the linked files (cached files modified in place are discarded).
+        checksum_cache = self._backstage.checksums
+
+        for algorithm, algorithm_files in py_.group_by(files, lambda x: x[0]).items():
+            checksums = checksum_cache.digest_many(
+                [file for _, _, file in algorithm_files], algorithm, os.cpu_count()
+            )
+
+            if any(
+                checksum != expected
+                for checksum, (_, expected, _) in zip(checksums, algorithm_files)
+            ):
+                execution_cache.remove(entry)
+
+                for _, _, package_file in packages_file:
+                    package_file.unlink(missing_ok=True)
+
+                return None
+
+        # indexing the compendia (the absolute files keys are moved
+        # to the current working directory).
+        def _local_files(files_description):
+            local_files = []
+
+            for file in files_description or []:
+                file_key = file["key"]
+
+                if Path(file_key).is_absolute():
+                    file_key = str(
+                        working_directory
+                        / relative_key(file_key, entry["working_directory"])
+                    )
+
+                local_files.append(dict(file, key=file_key))
+
+            return local_files
+
+        execution_index = self._backstage.execution.index
+
+        for compendium in execution_cache.documents(entry):
+            package = packages[str(compendium.name)]
+
+            py_.set(compendium, "inputs", _local_files(py_.get(compendium, "inputs")))
+            py_.set(compendium, "outputs", _local_files(py_.get(compendium, "outputs")))
+            py_.set(
+                compendium,
+                "compendium_package",
+                dict(
+                    py_.get(compendium, "compendium_package") or {},
+                    key=str(compendia_dir / package["name"]),
+                ),
+            )
+
+            execution_index.index_execution(compendium)
+
+        self._backstage.store.attach(
+            (package_file, algorithm, checksum)
+            for algorithm, checksum, package_file in packages_file
+        )
+        self._backstage.session.bump_generation()
+
+        index_lookup = self._backstage.execution.lookup
+        return [index_lookup.compendium(name) for name in packages]
+
+    def _publish_compendia(self, request: str, compendia: List[object]):
+        """Publish executed compendia in the shared execution cache (if defined).
+
+        Args:
+            request (str): Request digest (see ``storm_workbench.api.backstage.fingerprint.request_digest``).
+
+            compendia (List[object]): Indexed compendia.
+        """
+        execution_cache = self._backstage.cache
+
+        if execution_cache is None or not compendia:
+            return
+
+        memo = self._execution_memo(shared=True)
+        working_directory = Path(self._config.definitions.tool.storm.basepath)
+
+        compendia_description = []
+        compendia_files = {}
+
+        for compendium in compendia:
+            package = py_.get(compendium, "compendium_package")
+
+            if not package:
+                return
+
+            inputs = memo.files(compendium, "inputs")
+            outputs = memo.files(compendium, "outputs")
+
+            compendia_files[(package["algorithm"], package["checksum"])] = Path(
+                package["key"]
+            )
+            compendia_files.update(
+                {
+                    (algorithm, checksum): working_directory / key
+                    for key, algorithm, checksum in outputs
+                }
+            )
+
+            compendia_description.append(
+                dict(
+                    name=str(compendium.name),
+                    command=str(compendium.command),
+                    fingerprint=memo.fingerprint(compendium),
+                    inputs=[
+                        dict(key=key, algorithm=algorithm, checksum=checksum)
+                        for key, algorithm, checksum in inputs
+                    ],
+                    outputs=[
+                        dict(key=key, algorithm=algorithm, checksum=checksum)
+                        for key, algorithm, checksum in outputs
+                    ],
+                    package=dict(
+                        name=Path(package["key"]).name,
+                        algorithm=package["algorithm"],
+                        checksum=package["checksum"],
+                    ),
+                )
+            )
+
+        # only the files not modified since the execution are published.
+        checksum_cache = self._backstage.checksums
+
+        if not all(file.is_file() for file in compendia_files.values()):
+            return
+
+        for algorithm, algorithm_files in py_.group_by(
+            list(compendia_files.items()), lambda x: x[0][0]
+        ).items():
+            checksums = checksum_cache.digest_many(
+                [file for _, file in algorithm_files], algorithm, os.cpu_count()
+            )
+
+            if any(
+                checksum != expected
+                for checksum, ((_, expected), _) in zip(checksums, algorithm_files)
+            ):
+                return
+
+        execution_cache.publish(
+            request, working_directory, compendia_description, compendia, compendia_files
+        )
+
+    def _reusable_outdated_compendia(self, memo: ExecutionMemo) -> List[int]:
+        """Search the outdated compendia whose fingerprint is unchanged.
+
+        The compendia are checked in topological order. A compendium is reusable only if
+        all its predecessors are updated (or reusable), since the outdated predecessors
+        will be re-executed and may change its inputs.
+
+        Args:
+            memo (ExecutionMemo): Execution memoization.
+
+        Returns:
+            List[int]: Vertices (in topological order) of the reusable compendia.
+        """
+        graph = self._backstage.execution.index.graph_manager.graph
+        index_lookup = self._backstage.execution.lookup
+
+        names = [str(name) for name in graph.vs["name"]] if graph.vcount() else []
+        status = {name: index_lookup.status(name) for name in names}
+
+        fingerprints = {
+            str(uuid): fingerprint
+            for uuid, fingerprint in ExecutionFingerprintModel.select(
+                ExecutionFingerprintModel.uuid, ExecutionFingerprintModel.fingerprint
+            ).tuples()
+        }
+
+        reusable = []
+
+        for vertex in graph.topological_sorting():
+            name = names[vertex]
+
+            if status[name] != VertexStatus.Outdated or name not in fingerprints:
+                continue
+
+            if any(
+                status[names[predecessor]] != VertexStatus.Updated
+                for predecessor in graph.predecessors(vertex)
+            ):
+                continue
+
+            compendium = index_lookup.compendium(name)
+
+            if memo.current_fingerprint(compendium) == fingerprints[name]:
+                status[name] = VertexStatus.Updated
+                reusable.append(vertex)
+
+        return reusable
+
+    def _reuse_outdated_compendia(self, memo: ExecutionMemo) -> List[str]:
+        """Mark as ``updated`` the outdated compendia whose fingerprint is unchanged.
+
+        Args:
+            memo (ExecutionMemo): Execution memoization.
+
+        Returns:
+            List[str]: Names of the reused compendia.
+        """
+        graph = self._backstage.execution.index.graph_manager.graph
+        reused = []
+
+        for vertex in self._reusable_outdated_compendia(memo):
+            # note: the status is stored as a vertex attribute by the Storm Core.
+            graph.vs[vertex]["status"] = VertexStatus.Updated
+            reused.append(str(graph.vs[vertex]["name"]))
+
+        if reused:
+            self._backstage.session.bump_generation()
+
+        return reused
+
+    def _save_fingerprints(
+        self, compendia: List[object], memo: ExecutionMemo, request: str = None
+    ):
+        """Save the fingerprints of executed compendia.
+
+        Args:
+            compendia (List[object]): Indexed compendia.
+
+            memo (ExecutionMemo): Execution memoization.
+
+            request (str): Request digest. If defined, the previous records of the request
+            are replaced. Otherwise, the request of the existing records is kept.
+        """
+        preserved_fields = [
+            ExecutionFingerprintModel.fingerprint,
+            ExecutionFingerprintModel.updated,
+        ]
+
+        if request:
+            preserved_fields.append(ExecutionFingerprintModel.request)
+
+        with db.atomic():
+            if request:
+                ExecutionFingerprintModel.delete().where(
+                    ExecutionFingerprintModel.request == request
+                ).execute()
+
+            for compendium in compendia:
+                ExecutionFingerprintModel.insert(
+                    uuid=str(compendium.name),
+                    request=request,
+                    fingerprint=memo.fingerprint(compendium),
+                    updated=datetime.utcnow(),
+                ).on_conflict(
+                    conflict_target=[ExecutionFingerprintModel.uuid],
+                    preserve=preserved_fields,
+                ).execute()
+
+    def _save_durations(self, names: List[str], wall_time: float):
+        """Record the duration of executed compendia.
+
+        The Storm Core executors don't report the duration of each compendium, so the
+        recorded durations are not measured per compendium: the wall time of the operation
+        is split among the executed compendia, proportionally to their previous durations
+        (or evenly, when no duration was recorded). Only the durations of compendia executed
+        alone are the actual execution times.
+
+        Args:
+            names (List[str]): Names of the executed compendia.
+
+            wall_time (float): Wall time (in seconds) of the operation.
+        """
+        names = [str(name) for name in names]
+
+        if not names:
+            return
+
+        recorded = {
+            str(uuid): (duration, executions)
+            for uuid, duration, executions in ExecutionDurationModel.select(
+                ExecutionDurationModel.uuid,
+                ExecutionDurationModel.duration,
+                ExecutionDurationModel.executions,
+            )
+            .where(ExecutionDurationModel.uuid.in_(names))
+            .tuples()
+        }
+
+        weights = {
+            name: recorded[name][0] if recorded.get(name, (0,))[0] else 1.0
+            for name in names
+        }
+        total_weight = sum(weights.values())
+
+        with db.atomic():
+            for name in names:
+                duration = wall_time * weights[name] / total_weight
+                mean_duration, executions = recorded.get(name, (0.0, 0))
+
+                ExecutionDurationModel.insert(
+                    uuid=name,
+                    duration=(mean_duration * executions + duration) / (executions + 1),
+                    executions=executions + 1,
+                    updated=datetime.utcnow(),
+                ).on_conflict(
+                    conflict_target=[ExecutionDurationModel.uuid],
+                    preserve=[
+                        ExecutionDurationModel.duration,
+                        ExecutionDurationModel.executions,
+                        ExecutionDurationModel.updated,
+                    ],
+                ).execute()
+
     def run(
-        self, name: str = None, description=None, command=None, stormfile=None
+        self,
+        name: str = None,
+        description=None,
+        command=None,
+        stormfile=None,
+        force: bool = False,
     ) -> List[ExecutionCompendiumModel]:
         """Execute a command and save it in an Execution Compendium.
 
@@ -58,8 +606,20 @@ class ExecutionOperationService(BaseStageService):
 
             stormfile (Union[str, Path]): Stormfile with the description of an execution workflow.
 
+            force (bool): Flag indicating if the command must be executed even if a previous
+            execution (with the same command, inputs, environment and executor) can be reused.
+
         Returns:
             List[ExecutionCompendiumModel]: List of the created/updated execution compendium.
+
+        Note:
+            When the same command (or Stormfile) was already executed, its compendia are
+            ``updated`` and their fingerprint (command, inputs checksums, environment and
+            executor options) is unchanged, the compendia are reused and nothing is executed.
+
+            If the shared execution cache is defined (``[tool.storm.cache]`` section), the
+            executions are published in the cache and the executions already published (e.g.,
+            by other workbenches) are linked in the workbench instead of executed.
         """
         if command:
             execution_plan = ShellCommandParser.parse(list(command))
@@ -73,43 +633,205 @@ class ExecutionOperationService(BaseStageService):
                 "a Stormfile (``--stormfile``)."
             )
 
-        # running the execution plan!
-        executed_compendia = self._backstage.execution.op.run(execution_plan)
+        # reusing a previous execution of the same request.
+        request = request_digest(command, stormfile)
+        memo = self._execution_memo()
 
-        # saving (or updating) the generated compendia.
-        result_compendia = []
+        executed_compendia = None if force else self._reusable_compendia(request, memo)
+
+        if executed_compendia is None and not force:
+            # reusing an execution published in the shared execution cache.
+            executed_compendia = self._cached_compendia(request)
+
+            if executed_compendia is not None:
+                self._save_fingerprints(executed_compendia, memo, request)
+
+        if executed_compendia is None:
+            # running the execution plan!
+            start_time = time.perf_counter()
+
+            # the compendia of previous executions of the request are rewritten.
+            previous_compendia = [
+                record.uuid
+                for record in ExecutionFingerprintModel.select(
+                    ExecutionFingerprintModel.uuid
+                ).where(ExecutionFingerprintModel.request == request)
+            ]
+
+            executed_compendia = self._execute(
+                self._backstage.execution.op.run,
+                execution_plan,
+                rewritten=previous_compendia,
+            )
+
+            self._backstage.session.mark_modified(
+                compendium.name for compendium in executed_compendia
+            )
+
+            self._save_durations(
+                [compendium.name for compendium in executed_compendia],
+                time.perf_counter() - start_time,
+            )
 
-        for executed_compendium in executed_compendia:
-            # base object
-            compendium_object = ExecutionCompendiumModel(
+            index_lookup = self._backstage.execution.lookup
+            indexed_compendia = [
+                index_lookup.compendium(executed_compendium.name)
+                for executed_compendium in executed_compendia
+            ]
+
+            self._save_fingerprints(indexed_compendia, memo, request)
+            self._publish_compendia(request, indexed_compendia)
+
+        # saving (or updating) the generated compendia.
+        compendia_objects = [
+            ExecutionCompendiumModel(
                 name=name,
                 description=description,
                 uuid=executed_compendium.name,
                 command=str(executed_compendium.command),
             )
+            for executed_compendium in executed_compendia
+        ]
 
-            # saving in the database.
-            record_compendium = self._database_service.upsert_record(compendium_object)
-            result_compendia.append(record_compendium)
+        # saving in the database.
+        result_compendia = self._database_service.upsert_records(compendia_objects)
 
         # saving the session modifications.
         self._backstage.session.save()
 
         return result_compendia
 
-    def update(self):
+    def update(self, force: bool = False):
         """Update the ``outdated`` Execution Compendia.
 
         This method re-executes all compendia with the ``outdated`` status. An Execution
         Compendium is marked as ``outdated`` when any of its predecessors have been executed
         after its creation or last execution.
+
+        Args:
+            force (bool): Flag indicating if all outdated compendia must be re-executed. Otherwise,
+            the compendia whose fingerprint is unchanged (e.g., the predecessors were re-executed
+            but generated the same outputs) are marked as ``updated`` without re-execution.
+
+        Note:
+            Use the ``plan`` method to preview the compendia that will be re-executed (and the
+            estimated duration of the update).
         """
+        memo = self._execution_memo()
+        index_lookup = self._backstage.execution.lookup
+
+        outdated_compendia = [
+            name
+            for name, (_, _, status) in index_lookup.entries.items()
+            if status == VertexStatus.Outdated
+        ]
+
+        reused_compendia = [] if force else self._reuse_outdated_compendia(memo)
+
         # search the outdated compendia and re-execute them!
-        self._backstage.execution.op.update()
+        start_time = time.perf_counter()
+
+        self._execute(
+            self._backstage.execution.op.update, rewritten=outdated_compendia
+        )
+        self._backstage.session.mark_modified(outdated_compendia)
+
+        wall_time = time.perf_counter() - start_time
+
+        updated_compendia = [
+            name
+            for name in outdated_compendia
+            if name not in reused_compendia
+            and index_lookup.status(name) == VertexStatus.Updated
+        ]
+
+        self._save_fingerprints(
+            [index_lookup.compendium(name) for name in updated_compendia], memo
+        )
+        self._save_durations(updated_compendia, wall_time)
+
+        # updating the status of the database records.
+        self._database_service.synchronize()
 
         # saving the session modifications.
         self._backstage.session.save()
 
+    def plan(self, jobs: int = None, force: bool = False) -> dict:
+        """Plan the update of the ``outdated`` Execution Compendia (nothing is executed).
+
+        The outdated compendia (except the reusable ones, see ``update``) are scheduled in
+        topological order, and the wall time of the update is estimated with the recorded
+        durations of the compendia (a split of the wall time of their previous runs, see
+        ``_save_durations``). The compendia without recorded durations are estimated with
+        the mean of the recorded durations.
+
+        Args:
+            jobs (int): Number of compendia executed at the same time. If not defined, the
+            ``jobs`` of the executor definition (``[tool.storm.executor]``) is used (default: 1).
+
+            force (bool): Flag indicating if all outdated compendia will be re-executed.
+
+        Returns:
+            dict: Update plan with the schedule (see ``storm_workbench.api.backstage.schedule``).
+            Each scheduled vertex also has the compendium ``name``, ``command`` and a flag
+            indicating if its duration was ``estimated``. The plan also has the ``reusable``
+            compendia (names) and the number of ``unknown`` durations.
+        """
+        graph = self._backstage.execution.index.graph_manager.graph
+        index_lookup = self._backstage.execution.lookup
+
+        names = [str(name) for name in graph.vs["name"]] if graph.vcount() else []
+
+        outdated_vertices = [
+            vertex
+            for vertex, name in enumerate(names)
+            if index_lookup.status(name) == VertexStatus.Outdated
+        ]
+
+        reusable_vertices = (
+            [] if force else self._reusable_outdated_compendia(self._execution_memo())
+        )
+
+        planned_vertices = [
+            vertex for vertex in outdated_vertices if vertex not in reusable_vertices
+        ]
+
+        # estimating the durations.
+        recorded = {
+            str(uuid): duration
+            for uuid, duration in ExecutionDurationModel.select(
+                ExecutionDurationModel.uuid, ExecutionDurationModel.duration
+            ).tuples()
+        }
+
+        default_duration = sum(recorded.values()) / len(recorded) if recorded else 0.0
+
+        durations = {
+            vertex: recorded.get(names[vertex], default_duration)
+            for vertex in planned_vertices
+        }
+
+        executor_definitions = self._config.definitions.tool.storm.executor
+        jobs = jobs or executor_definitions.get("jobs") or 1
+
+        schedule = execution_schedule(graph, planned_vertices, durations, jobs)
+
+        for scheduled_vertex in schedule["vertices"]:
+            name = names[scheduled_vertex["vertex"]]
+
+            scheduled_vertex.update(
+                name=name,
+                command=str(graph.vs[scheduled_vertex["vertex"]]["command"]),
+                estimated=name not in recorded,
+            )
+
+        schedule.update(
+            reusable=[names[vertex] for vertex in reusable_vertices],
+            unknown=len([v for v in schedule["vertices"] if v["estimated"]]),
+        )
+
+        return schedule
+
 
 class ReExecutionOperationService(BaseStageService):
     """ReExecution operation service class.
@@ -129,10 +851,145 @@ class ReExecutionOperationService(BaseStageService):
     by the `storm_workbench.api.stage.exporter.compendium.service.CompendiumExporterService` class.
     """
 
+    def __init__(self, config, backstage):
+        """Initializer.
+
+        Args:
+            config (WorkbenchDefinitionFile): Workbench configuration file.
+
+            backstage: (BackstageAccessor): Accessor to low-level operations API.
+        """
+        super(ReExecutionOperationService, self).__init__(config, backstage)
+
+        self._verification = None
+
+    @property
+    def verification(self) -> Union[None, dict]:
+        """Verification report of the last reproduction (if its outputs were verified)."""
+        return self._verification
+
+    @staticmethod
+    def _rerun(
+        reproducible_storage_dir: Path,
+        output_directory_results: Path,
+        graph,
+        dataset_descriptor: Dict,
+        required_environment_variables: List[str],
+    ):
+        """Reproduce the compendia of a graph.
+
+        The graph is used as the graph index of the reproduction workbench.
+        """
+        # temporary: import workbench here to avoid
+        # circular import error.
+        from storm_workbench import Workbench
+        from storm_workbench.persistence import GraphStorage, save_graph
+
+        with tempfile.TemporaryDirectory() as graph_dir:
+            graph_file = save_graph(graph, Path(graph_dir) / "meta")
+
+            wb = Workbench(
+                cwd=reproducible_storage_dir,
+                reproducible_storage=reproducible_storage_dir,
+                graph_storage=GraphStorage(graph_file),
+            )
+
+            wb.backstage.execution.op.rerun(
+                reproducible_storage=output_directory_results,
+                required_data_objects=dataset_descriptor,
+                required_environment_variables=required_environment_variables,
+            )
+
+    @staticmethod
+    def _limit_requirements(
+        graph,
+        dataset_descriptor: Dict,
+        required_environment_variables: List[str],
+    ) -> (Dict, List[str]):
+        """Limit the reproduction requirements to the files and variables used by a graph.
+
+        Args:
+            graph (Graph): Graph index that will be reproduced.
+
+            dataset_descriptor (Dict): Description of the input files (``checksum`` and ``files``).
+
+            required_environment_variables (List[str]): Environment variables (``name=value``).
+
+        Returns:
+            (Dict, List[str]): Dataset descriptor and environment variables used by the graph.
+
+        Raises:
+            ValueError: When a file (if the dataset descriptor is defined) or an environment
+            variable required by the graph is not defined.
+        """
+        required_files = set()
+        required_variables = set()
+
+        for vertex in graph.vs:
+            required_files.update(
+                Path(file).name
+                for file in py_.get(
+                    vertex, "metadata.others.unpacked_files.datasources", []
+                )
+            )
+            required_variables.update(
+                py_.get(vertex, "metadata.others.unpacked_environment_variables", [])
+            )
+
+        # files.
+        if dataset_descriptor:
+            dataset_descriptor = {
+                **dataset_descriptor,
+                "checksum": {
+                    name: checksum
+                    for name, checksum in dataset_descriptor.get("checksum", {}).items()
+                    if name in required_files
+                },
+                "files": [
+                    file
+                    for file in dataset_descriptor.get("files", [])
+                    if file["source"] in required_files
+                ],
+            }
+
+            missing_files = required_files - {
+                file["source"] for file in dataset_descriptor["files"]
+            }
+
+            if missing_files:
+                raise ValueError(
+                    "The dataset descriptor doesn't define the required files: "
+                    f"{', '.join(sorted(missing_files))}"
+                )
+
+        # environment variables.
+        environment_variables = {
+            variable.split("=", 1)[0]: variable
+            for variable in required_environment_variables
+        }
+
+        missing_variables = required_variables - set(environment_variables)
+
+        if missing_variables:
+            raise ValueError(
+                "The required environment variables are not defined: "
+                f"{', '.join(sorted(missing_variables))}"
+            )
+
+        return dataset_descriptor, [
+            variable
+            for name, variable in environment_variables.items()
+            if name in required_variables
+        ]
+
     def run(
         self,
         required_dataset_descriptor_file: Union[str, Path] = None,
         required_environment_variables: List[str] = None,
+        targets: List[str] = None,
+        verify: bool = False,
+        stop_on_mismatch: bool = False,
+        jobs: int = None,
     ) -> Path:
         """Reproduce a previous generated experiment.
 
@@ -143,6 +1000,22 @@ class ReExecutionOperationService(BaseStageService):
             required_environment_variables (List[str]): List with the required environment variables to reexecute the
             experiment.
 
+            targets (List[str]): Names (or unique name prefixes) of the Execution Compendia to be reproduced. If
+            defined, only the minimal subgraph required by them (the targets and their ancestors) is reproduced,
+            and only the files and environment variables used by this subgraph are required.
+
+            verify (bool): Flag indicating if the reproduced outputs must be verified against the checksums
+            recorded in the compendia. The verified reproduction is saved in a new results directory
+            (``reproduction-results/verification-<timestamp>``), with the verification report (see the
+            ``verification`` property).
+
+            stop_on_mismatch (bool): Flag indicating if the reproduction must stop at the first compendium
+            with divergent outputs (the outputs are verified). In this case, the compendia are reproduced one by one, in
+            topological order (each one in the ``steps/<position>`` results subdirectory), and the compendia
+            not reproduced are reported as ``skipped``.
+
+            jobs (int): Number of threads used to hash the reproduced outputs (default: number of CPUs).
+
         Returns:
             Path: Path to the directory where the results will be saved.
 
@@ -188,15 +1061,111 @@ class ReExecutionOperationService(BaseStageService):
         if wb.backstage.execution.index.graph_manager.is_empty:
             raise RuntimeError("Execution Compendia Index is empty! Nothing to do.")
 
-        # preparing the results directory
+        # targeted reproduction: only the targets and their ancestors are reproduced.
+        targets_graph = None
+
+        if targets:
+            targets_graph = ancestors_subgraph(
+                wb.backstage.execution.index.graph_manager.graph, targets
+            )
+
+            (
+                dataset_descriptor,
+                required_environment_variables,
+            ) = self._limit_requirements(
+                targets_graph, dataset_descriptor, required_environment_variables
+            )
+
+        # preparing the results directory. Verified reproductions use a new directory,
+        # so the results of previous reproductions are not verified as outputs of this one.
         output_directory_results = reproducible_storage_dir / "reproduction-results"
+        verify = verify or stop_on_mismatch
+
+        if verify:
+            output_directory_results = (
+                output_directory_results
+                / f"verification-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+            )
+
         output_directory_results.mkdir(exist_ok=True, parents=True)
 
-        # creating the reproduction workbench and run!
-        wb.backstage.execution.op.rerun(
-            reproducible_storage=output_directory_results,
-            required_data_objects=dataset_descriptor,
-            required_environment_variables=required_environment_variables,
+        graph = (
+            targets_graph
+            if targets_graph is not None
+            else wb.backstage.execution.index.graph_manager.graph
         )
+        jobs = jobs or os.cpu_count()
+
+        if stop_on_mismatch:
+            # step-by-step reproduction: the compendia packages are self-contained
+            # (only the unpacked files are external), so each compendium can be
+            # reproduced alone.
+            compendia_verified = []
+            execution_order = graph.topological_sorting()
+
+            for position, vertex in enumerate(execution_order):
+                vertex_graph = graph.induced_subgraph([vertex])
+
+                # each step has its own results directory (the outputs of a step
+                # are not matched with the files reproduced by the other steps).
+                step_directory_results = (
+                    output_directory_results / "steps" / f"{position:04d}"
+                )
+                step_directory_results.mkdir(parents=True)
+
+                self._rerun(
+                    reproducible_storage_dir,
+                    step_directory_results,
+                    vertex_graph,
+                    *self._limit_requirements(
+                        vertex_graph, dataset_descriptor, required_environment_variables
+                    ),
+                )
+
+                compendia_verified.extend(
+                    verify_outputs(graph, step_directory_results, [vertex], jobs)
+                )
+
+                if compendia_verified[-1]["status"] == "mismatch":
+                    compendia_verified.extend(
+                        dict(
+                            name=graph.vs[skipped]["name"], status="skipped", outputs=[]
+                        )
+                        for skipped in execution_order[position + 1 :]
+                    )
+                    break
+
+        else:
+            # the targets subgraph is the graph index of the reproduction workbench.
+            if targets_graph is not None:
+                self._rerun(
+                    reproducible_storage_dir,
+                    output_directory_results,
+                    targets_graph,
+                    dataset_descriptor,
+                    required_environment_variables,
+                )
+
+            else:
+                # creating the reproduction workbench and run!
+                wb.backstage.execution.op.rerun(
+                    reproducible_storage=output_directory_results,
+                    required_data_objects=dataset_descriptor,
+                    required_environment_variables=required_environment_variables,
+                )
+
+            compendia_verified = (
+                verify_outputs(graph, output_directory_results, jobs=jobs)
+                if verify
+                else None
+            )
+
+        # saving the verification report.
+        if compendia_verified is not None:
+            self._verification = verification_report(compendia_verified)
+
+            save_verification_report(
+                self._verification, output_directory_results / VERIFICATION_REPORT_FILE
+            )
 
         return output_directory_results
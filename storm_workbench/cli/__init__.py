@@ -8,13 +8,17 @@
 BASE_CLI_MODULE = "storm_workbench.cli.commands"
 """Module where the CLI commands are stored."""
 
-COMMAND_MODULES = [
-    "env",
-    "exec",
-    "index",
-    "export",
-    "import",
-    "service",
-    "workbench",
-]
-"""CLI Command modules (Relative to Base CLI module)."""
+COMMAND_MODULES = {
+    "env": "env",
+    "exec": "exec",
+    "index": "index",
+    "export": "export",
+    "import": "import",
+    "service": "service",
+    "init": "workbench",
+}
+"""CLI Command modules (Command name and module relative to Base CLI module).
+
+Note:
+    The command modules are only imported when the command is requested.
+"""
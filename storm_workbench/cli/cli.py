@@ -5,21 +5,56 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
-import click
 from importlib import import_module
 
+import click
+
 from . import BASE_CLI_MODULE, COMMAND_MODULES
 
 
-@click.group()
-@click.version_option()
-def workbench_cli():
-    """Storm Workbench CLI."""
+class LazyCommandGroup(click.Group):
+    """Click group that loads the commands on demand.
+
+    The command modules are only imported when the command is requested
+    (``--help`` requests all of them, to show their descriptions). The
+    Workbench API and its heavy dependencies (e.g., Storm Core, igraph and
+    peewee) are imported by the commands only when they run. So, simple
+    operations (e.g., ``--help``) are not slowed down by the whole API import.
+    """
+
+    def __init__(self, *args, command_modules=None, **kwargs):
+        """Initializer.
+
+        Args:
+            args: ``click.Group`` positional arguments.
 
+            command_modules (dict): Command name and the module (relative to the
+            Base CLI module) where the command is defined.
 
-# Registering the available commands.
-for command_module in COMMAND_MODULES:
-    command_module_path = f"{BASE_CLI_MODULE}.{command_module}"
+            kwargs: ``click.Group`` keyword arguments.
+        """
+        super(LazyCommandGroup, self).__init__(*args, **kwargs)
 
-    mod = import_module(command_module_path)
-    mod.register_command(workbench_cli)
+        self._command_modules = command_modules or {}
+
+    def list_commands(self, ctx):
+        """List the available commands (without importing them)."""
+        return sorted(set(super().list_commands(ctx)) | set(self._command_modules))
+
+    def get_command(self, ctx, cmd_name):
+        """Get a command, importing its module in the first access."""
+        if cmd_name not in self.commands and cmd_name in self._command_modules:
+            command_module_path = (
+                f"{BASE_CLI_MODULE}.{self._command_modules[cmd_name]}"
+            )
+
+            mod = import_module(command_module_path)
+            mod.register_command(self)
+
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyCommandGroup, command_modules=COMMAND_MODULES)
+@click.version_option()
+def workbench_cli():
+    """Storm Workbench CLI."""
@@ -9,7 +9,6 @@ import click
 
 from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
 from storm_workbench.cli.graphics.tree import aesthetic_tree_base
-from storm_workbench.workbench import Workbench
 
 
 @click.group(name="env")
@@ -20,6 +19,9 @@ def env(ctx):
         ctx.obj = dict()
 
     try:
+        # the Workbench API is loaded only when a command is invoked.
+        from storm_workbench.workbench import Workbench
+
         ctx.obj["workbench"] = Workbench()
     except:
         aesthetic_traceback(show_locals=True)
@@ -8,11 +8,13 @@
 from pathlib import Path
 
 import click
-import rich.markdown
 
-from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
+from storm_workbench.cli.graphics.aesthetic import (
+    aesthetic_markdown,
+    aesthetic_print,
+    aesthetic_traceback,
+)
 from storm_workbench.exceptions import InvalidCommand
-from storm_workbench.workbench import Workbench
 
 
 @click.group(name="exec")
@@ -23,6 +25,9 @@ def exec_(ctx):
         ctx.obj = dict()
 
     try:
+        # the Workbench API is loaded only when a command is invoked.
+        from storm_workbench.workbench import Workbench
+
         ctx.obj["workbench"] = Workbench()
     except:
         aesthetic_traceback(show_locals=True)
@@ -58,8 +63,18 @@ def exec_(ctx):
     ),
     help="Stormfile with the processing Pipeline definition.",
 )
+@click.option(
+    "--force",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if the command must be re-executed even if a previous execution can be reused.",
+)
 @click.pass_obj
-def exec_run(obj, command=None, name=None, description=None, stormfile=None):
+def exec_run(
+    obj, command=None, name=None, description=None, stormfile=None, force=False
+):
     """Execute an experiment in a reproducible way.
 
     When the execution is done by the `Storm Workbench`, all computational components used on the execution will be
@@ -77,6 +92,9 @@ def exec_run(obj, command=None, name=None, description=None, stormfile=None):
     The main difference here is that now, the execution is controlled by `Storm Workbench`, which allows you to extract
     information from the execution and save all the elements needed to reproduce the execution.
 
+    If the same command was already executed with the same inputs, environment and executor, the previous execution
+    is reused (use `--force` to re-execute it).
+
     This command was created using the ReproZip tool. Many thanks to the ReproZip team.
     """
     aesthetic_print(
@@ -91,26 +109,53 @@ def exec_run(obj, command=None, name=None, description=None, stormfile=None):
 
         workbench = obj["workbench"]
         workbench.stage.operation.execution.run(
-            name=name, description=description, command=command, stormfile=stormfile
+            name=name,
+            description=description,
+            command=command,
+            stormfile=stormfile,
+            force=force,
         )
 
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Finished!", 0)
 
     except InvalidCommand as error:
         aesthetic_print("[bold red]Storm Workbench[/bold red]: Problems founded", 0)
-        aesthetic_print(rich.markdown.Markdown(str(error)), 0)
+        aesthetic_print(aesthetic_markdown(str(error)), 0)
 
     except RuntimeError as error:
         aesthetic_print("[bold red]Storm Workbench[/bold red]: Problems founded", 0)
-        aesthetic_print(rich.markdown.Markdown(str(error)))
+        aesthetic_print(aesthetic_markdown(str(error)))
 
     except:
         aesthetic_traceback(show_locals=True)
 
 
 @exec_.command(name="update")
+@click.option(
+    "--force",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if the outdated compendia must be re-executed even if a previous execution can be reused.",
+)
+@click.option(
+    "--plan",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if only the update plan (with the estimated duration) must be presented.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    required=False,
+    type=int,
+    help="Number of compendia executed at the same time in the update plan (default: executor `jobs` definition).",
+)
 @click.pass_obj
-def update(obj):
+def update(obj, force, plan, jobs):
     """Re-execute the Execution Compendia outdated.
 
     This command identifies and re-executes all outdated Execution Compendia, which is useful when multiple runs need
@@ -123,17 +168,26 @@ def update(obj):
 
     All are up-to-date. If the `Execution 2` is executed again, all its subsequent ones will
     be out of date since they depend on the result generated by this Execution. Following this rule, in this
-    example, the `Execution 3` is outdated.
+    example, the `Execution 3` is outdated. If the inputs of the `Execution 3` are unchanged (e.g., the `Execution 2`
+    generated the same results), it is marked as up-to-date without re-execution (use `--force` to re-execute it).
+
+    With `--plan`, nothing is executed: the outdated Execution Compendia are presented in execution order, with
+    their estimated duration and the critical path of the update. The durations are not measured per compendium:
+    the wall time of each previous run is split among the compendia it executed.
     """
     aesthetic_print(
         "[bold cyan]Storm Workbench[/bold cyan]: Reproducible Execution (Update mode) :leftwards_arrow_with_hook:"
     )
 
+    if plan:
+        _update_plan(obj["workbench"], force, jobs)
+        return
+
     try:
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Running...", 0)
 
         workbench = obj["workbench"]
-        workbench.stage.operation.execution.update()
+        workbench.stage.operation.execution.update(force=force)
 
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Finished!", 0)
 
@@ -141,6 +195,70 @@ def update(obj):
         aesthetic_traceback(show_locals=True)
 
 
+def _update_plan(workbench, force, jobs):
+    """Show the update plan (table, ASCII DAG and estimated duration)."""
+    try:
+        from storm_workbench.cli.graphics.graph import show_ascii_graph
+        from storm_workbench.cli.graphics.table import (
+            aesthetic_table_plan,
+            format_duration,
+        )
+
+        aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Planning...", 0)
+
+        update_plan = workbench.stage.operation.execution.plan(jobs=jobs, force=force)
+
+        if update_plan["reusable"]:
+            aesthetic_print(
+                "[bold cyan]Storm Workbench[/bold cyan]: "
+                f"{len(update_plan['reusable'])} outdated compendia can be reused "
+                "(use `--force` to re-execute them)",
+                0,
+            )
+
+        if not update_plan["vertices"]:
+            aesthetic_print(
+                "[bold cyan]Storm Workbench[/bold cyan]: Nothing to update!", 0
+            )
+            return
+
+        aesthetic_table_plan(update_plan)
+
+        graph = workbench.backstage.execution.index.graph_manager.graph
+        show_ascii_graph(
+            graph.induced_subgraph(
+                [vertex["vertex"] for vertex in update_plan["vertices"]]
+            )
+        )
+
+        aesthetic_print(
+            "[bold cyan]Storm Workbench[/bold cyan]: Estimated duration: "
+            f"{format_duration(update_plan['estimated_time'])} "
+            f"({update_plan['parallelism']} parallel jobs; sequential: "
+            f"{format_duration(update_plan['sequential_time'])}, critical path: "
+            f"{format_duration(update_plan['critical_path_time'])})",
+            0,
+        )
+
+        aesthetic_print(
+            "[bold cyan]Storm Workbench[/bold cyan]: "
+            "The durations are splits of the wall time of the previous runs "
+            "(the executor doesn't report per-compendium timings)",
+            0,
+        )
+
+        if update_plan["unknown"]:
+            aesthetic_print(
+                "[bold yellow]Storm Workbench[/bold yellow]: "
+                f"{update_plan['unknown']} compendia without recorded durations "
+                "(estimated with the mean of the recorded durations)",
+                0,
+            )
+
+    except:
+        aesthetic_traceback(show_locals=True)
+
+
 @exec_.command(name="rerun")
 @click.option(
     "-f",
@@ -156,8 +274,38 @@ def update(obj):
     multiple=True,
     help="Environment variable required to reproduce the experiment (Multiple values allowed).",
 )
+@click.option(
+    "-t",
+    "--target",
+    required=False,
+    multiple=True,
+    help="Execution Compendium to be reproduced with its ancestors (Multiple values allowed).",
+)
+@click.option(
+    "--verify",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if the reproduced outputs must be verified against the recorded checksums.",
+)
+@click.option(
+    "--fail-fast",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if the reproduction must stop at the first compendium with divergent outputs.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    required=False,
+    type=int,
+    help="Number of threads used to verify the reproduced outputs.",
+)
 @click.pass_obj
-def rerun(obj, required_files_reference, env):
+def rerun(obj, required_files_reference, env, target, verify, fail_fast, jobs):
     """Reproduce a previous generated experiment."""
     aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Reproduction :repeat:")
 
@@ -165,7 +313,37 @@ def rerun(obj, required_files_reference, env):
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Running...", 0)
 
         workbench = obj["workbench"]
-        workbench.stage.operation.reexecution.run(required_files_reference, env)
+        reexecution_service = workbench.stage.operation.reexecution
+
+        results_dir = reexecution_service.run(
+            required_files_reference,
+            env,
+            targets=target,
+            verify=verify,
+            stop_on_mismatch=fail_fast,
+            jobs=jobs,
+        )
+
+        verification = reexecution_service.verification
+
+        if verification:
+            from storm_workbench.api.backstage.verification import (
+                VERIFICATION_REPORT_FILE,
+            )
+            from storm_workbench.cli.graphics.table import (
+                aesthetic_table_verification,
+            )
+
+            aesthetic_table_verification(verification)
+
+            summary = verification["summary"]
+            aesthetic_print(
+                "[bold cyan]Storm Workbench[/bold cyan]: Verification: "
+                f"{summary['match']} match, {summary['mismatch']} mismatch, "
+                f"{summary['skipped']} skipped (report: "
+                f"{results_dir / VERIFICATION_REPORT_FILE})",
+                0,
+            )
 
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Finished!", 0)
 
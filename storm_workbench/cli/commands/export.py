@@ -5,10 +5,73 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
+from pathlib import Path
+
 import click
 
 from storm_workbench.cli.graphics.aesthetic import aesthetic_traceback, aesthetic_print
-from storm_workbench.workbench import Workbench
+
+
+def _print_export_summary(summary: dict):
+    """Print the summary of an export (bytes saved by the compression and CPU time spent)."""
+    if not summary:
+        return
+
+    from hurry.filesize import size
+
+    saved_size = max(summary["saved_size"], 0)
+    saved_ratio = saved_size / summary["input_size"] if summary["input_size"] else 0
+
+    aesthetic_print(
+        f"[bold cyan]Storm Workbench[/bold cyan]: {summary['files']} files "
+        f"({size(summary['input_size'])}), {summary['stored_files']} stored without "
+        f"compression ({size(summary['stored_size'])})",
+        0,
+    )
+
+    if summary.get("resumed_files"):
+        aesthetic_print(
+            f"[bold cyan]Storm Workbench[/bold cyan]: {summary['resumed_files']} files "
+            "resumed from the interrupted export",
+            0,
+        )
+
+    aesthetic_print(
+        f"[bold cyan]Storm Workbench[/bold cyan]: Compression saved "
+        f"{size(saved_size)} ({saved_ratio:.1%}) using "
+        f"{summary['cpu_time']:.2f}s of CPU time ({summary['wall_time']:.2f}s elapsed)",
+        0,
+    )
+
+
+def _print_staging_summary(staging: list):
+    """Print the staged files with their copy throughput."""
+    if not staging:
+        return
+
+    from hurry.filesize import size
+
+    from storm_workbench.cli.graphics.table import aesthetic_table_base
+
+    rows = [
+        (
+            Path(file["source"]).name,
+            size(file["size"]),
+            "hash and copy" if file["algorithm"] else "copy",
+            f"{file['elapsed']:.2f}s",
+            f"{size(int(file['throughput']))}/s",
+        )
+        for file in staging
+    ]
+
+    aesthetic_print(
+        aesthetic_table_base(
+            title="Staged files",
+            columns=["File", "Size", "Mode", "Time", "Throughput"],
+            rows=rows,
+        ),
+        0,
+    )
 
 
 @click.group(name="export")
@@ -19,6 +82,9 @@ def export(ctx):
         ctx.obj = dict()
 
     try:
+        # the Workbench API is loaded only when a command is invoked.
+        from storm_workbench.workbench import Workbench
+
         ctx.obj["workbench"] = Workbench()
     except:
         aesthetic_traceback(show_locals=True)
@@ -58,8 +124,33 @@ def export(ctx):
     default=None,
     help="Exported file name (Default is the Workbench name).",
 )
+@click.option(
+    "-s",
+    "--since",
+    required=False,
+    default=None,
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+        dir_okay=False,
+        file_okay=True,
+    ),
+    help="Export manifest (export.json) or package of a previous export. If defined, "
+    "only the compendia changed since that export are packaged (delta export).",
+)
+@click.option(
+    "--resume",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if an interrupted export (with the same temporary directory) is "
+    "resumed: the staged and archived files are verified and reused.",
+)
 @click.pass_obj
-def export_compendia(obj, output_dir=None, temporary_dir=None, filename=None):
+def export_compendia(
+    obj, output_dir=None, temporary_dir=None, filename=None, since=None, resume=False
+):
     """Export all Workbench Execution Compendia."""
     aesthetic_print(
         "[bold cyan]Storm Workbench[/bold cyan]: Compendia Package Export :package:", 0
@@ -74,16 +165,20 @@ def export_compendia(obj, output_dir=None, temporary_dir=None, filename=None):
         # saving the compendia
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Exporting...", 0)
 
-        output_file = workbench.stage.exporter.compendium.save(
+        exporter_service = workbench.stage.exporter.compendium
+        output_file = exporter_service.save(
             compendia=execution_compendia,
             output_dir=output_dir,
             temp_dir=temporary_dir,
             filename=filename,
+            since=since,
+            resume=resume,
         )
 
         aesthetic_print(
             f"[bold cyan]Storm Workbench[/bold cyan]: Package exported to {output_file}"
         )
+        _print_export_summary(exporter_service.summary)
 
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Finished!", 0)
 
@@ -124,8 +219,28 @@ def export_compendia(obj, output_dir=None, temporary_dir=None, filename=None):
     default=None,
     help="Exported file name (Default is the Workbench name).",
 )
+@click.option(
+    "-m",
+    "--mode",
+    required=False,
+    default=None,
+    type=click.Choice(["copy", "fetch"]),
+    help="Export mode: pack the files (copy) or reference them in a holey bag (fetch). "
+    "Default is defined in the workbench.toml.",
+)
+@click.option(
+    "--resume",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if an interrupted export (with the same temporary directory) is "
+    "resumed: the staged and archived files are verified and reused.",
+)
 @click.pass_obj
-def export_dataset(obj, output_dir=None, temporary_dir=None, filename=None):
+def export_dataset(
+    obj, output_dir=None, temporary_dir=None, filename=None, mode=None, resume=False
+):
     """Export Workbench Execution Compendia Unpackaged files."""
     aesthetic_print(
         "[bold cyan]Storm Workbench[/bold cyan]: Compendia Dataset Export :card_file_box:",
@@ -141,16 +256,21 @@ def export_dataset(obj, output_dir=None, temporary_dir=None, filename=None):
         # saving the dataset
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Exporting...", 0)
 
-        output_file = workbench.stage.exporter.dataset.save(
+        exporter_service = workbench.stage.exporter.dataset
+        output_file = exporter_service.save(
             compendia=execution_compendia,
             output_dir=output_dir,
             temp_dir=temporary_dir,
             filename=filename,
+            mode=mode,
+            resume=resume,
         )
 
         aesthetic_print(
             f"[bold cyan]Storm Workbench[/bold cyan]: Dataset exported to {output_file}"
         )
+        _print_staging_summary((exporter_service.summary or {}).get("staging"))
+        _print_export_summary(exporter_service.summary)
 
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Finished!", 0)
 
@@ -7,10 +7,6 @@
 
 import click
 
-from storm_workbench.api.stage.exporter.compendium.service import (
-    CompendiumExporterService,
-)
-from storm_workbench.api.stage.exporter.dataset.service import DatasetExporterService
 from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
 
 
@@ -46,13 +42,26 @@ def import_(ctx):
     ),
     help="Output directory.",
 )
-def import_compendia(file=None, output_dir=None):
+@click.option(
+    "--resume",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if an interrupted import (in the same output directory) is "
+    "resumed: the extracted files are verified and reused.",
+)
+def import_compendia(file=None, output_dir=None, resume=False):
     """Import a Workbench Execution Compendia from a file."""
     aesthetic_print(
         "[bold cyan]Storm Workbench[/bold cyan]: Compendia Package Import :package:", 0
     )
 
     try:
+        from storm_workbench.api.stage.exporter.compendium.service import (
+            CompendiumExporterService,
+        )
+
         # creating the service object.
         # rework needed: we will improve this class relation to avoid the CLI
         # know how to create a service object.
@@ -61,7 +70,9 @@ def import_compendia(file=None, output_dir=None):
         # loading
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Loading...", 0)
 
-        output_file = standalone_compendium_exporter_service.load(file, output_dir)
+        output_file = standalone_compendium_exporter_service.load(
+            file, output_dir, resume=resume
+        )
 
         aesthetic_print(
             f"[bold cyan]Storm Workbench[/bold cyan]: Compendia import to {output_file}"
@@ -98,7 +109,24 @@ def import_compendia(file=None, output_dir=None):
     ),
     help="Output directory.",
 )
-def import_dataset(file=None, output_dir=None):
+@click.option(
+    "--fetch-mode",
+    required=False,
+    default="link",
+    type=click.Choice(["link", "copy"]),
+    help="Mode to resolve the local files referenced by the dataset: verify and link them "
+    "(link) or copy them (copy). Default is link.",
+)
+@click.option(
+    "--resume",
+    required=False,
+    default=False,
+    is_flag=True,
+    type=bool,
+    help="Flag indicating if an interrupted import (in the same output directory) is "
+    "resumed: the extracted files are verified and reused.",
+)
+def import_dataset(file=None, output_dir=None, fetch_mode="link", resume=False):
     """Import a Workbench Dataset from a file."""
     aesthetic_print(
         "[bold cyan]Storm Workbench[/bold cyan]: Compendia Dataset Import :card_file_box:",
@@ -106,13 +134,19 @@ def import_dataset(file=None, output_dir=None):
     )
 
     try:
+        from storm_workbench.api.stage.exporter.dataset.service import (
+            DatasetExporterService,
+        )
+
         # creating the service object.
         standalone_compendium_exporter_service = DatasetExporterService()
 
         # loading
         aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Loading...", 0)
 
-        output_file = standalone_compendium_exporter_service.load(file, output_dir)
+        output_file = standalone_compendium_exporter_service.load(
+            file, output_dir, fetch_mode=fetch_mode, resume=resume
+        )
 
         aesthetic_print(
             f"[bold cyan]Storm Workbench[/bold cyan]: Dataset import to {output_file}"
@@ -6,15 +6,9 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import click
-from storm_core.helper.plotting import (
-    plot_styled_indexed_executions,
-    plot_dot_indexed_executions,
-)
 
 from storm_workbench.cli.graphics.aesthetic import aesthetic_traceback, aesthetic_print
-from storm_workbench.cli.graphics.graph import show_ascii_graph
 from storm_workbench.cli.graphics.table import aesthetic_table_index_ls
-from storm_workbench.workbench import Workbench
 
 
 @click.group(name="index")
@@ -25,6 +19,9 @@ def index(ctx):
         ctx.obj = dict()
 
     try:
+        # the Workbench API is loaded only when a command is invoked.
+        from storm_workbench.workbench import Workbench
+
         ctx.obj["workbench"] = Workbench()
     except:
         aesthetic_traceback(show_locals=True)
@@ -142,6 +139,34 @@ def index_edit(obj, name=None, description=None):
         aesthetic_traceback(show_locals=True)
 
 
+@index.command(name="sync")
+@click.option(
+    "--full",
+    required=False,
+    is_flag=True,
+    default=False,
+    help="Flag indicating that all database records should be rewritten, even "
+    "if the index was not modified since the last synchronization.",
+)
+@click.pass_obj
+def index_sync(obj, full=False):
+    """Synchronize the Execution Compendia database with the index."""
+    # getting the workbench
+    workbench = obj["workbench"]
+
+    try:
+        aesthetic_print(
+            "[bold cyan]Storm Workbench[/bold cyan]: Synchronizing the Execution Compendia",
+            0,
+        )
+
+        workbench.stage.index.synchronize(full=full)
+
+        aesthetic_print("[bold cyan]Storm Workbench[/bold cyan]: Done!", 0)
+    except:
+        aesthetic_traceback(show_locals=True)
+
+
 @index.command(name="graph")
 @click.option(
     "--to-dot",
@@ -179,6 +204,13 @@ def index_edit(obj, name=None, description=None):
 @click.pass_obj
 def index_graph(obj, to_dot, render_dot, to_png, filename):
     """Visualize the Execution Index as a Directed Acyclic Graph (DAG)."""
+    from storm_core.helper.plotting import (
+        plot_styled_indexed_executions,
+        plot_dot_indexed_executions,
+    )
+
+    from storm_workbench.cli.graphics.graph import show_ascii_graph
+
     workbench = obj["workbench"]
     graph_manager = workbench.backstage.execution.index.graph_manager
 
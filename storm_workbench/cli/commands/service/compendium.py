@@ -6,10 +6,13 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import click
-import rich.markdown
 
 from storm_workbench.cli.commands.service.service import service
-from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
+from storm_workbench.cli.graphics.aesthetic import (
+    aesthetic_markdown,
+    aesthetic_print,
+    aesthetic_traceback,
+)
 from storm_workbench.cli.graphics.table import aesthetic_table_by_document
 from storm_workbench.cli.graphics.tree import aesthetic_tree_base
 from storm_workbench.exceptions import ExecutionCompendiumNotFound
@@ -48,7 +51,7 @@ def compendium_describe(obj, id=None, draft=False):
 
     except ExecutionCompendiumNotFound:
         aesthetic_print(
-            rich.markdown.Markdown("The defined Execution Compendium was not founded!"),
+            aesthetic_markdown("The defined Execution Compendium was not founded!"),
             0,
         )
 
@@ -131,7 +134,7 @@ def compendium_new_draft(obj, source=None):
 
     except ExecutionCompendiumNotFound:
         aesthetic_print(
-            rich.markdown.Markdown("The defined Execution Compendium was not founded!")
+            aesthetic_markdown("The defined Execution Compendium was not founded!")
         )
 
     except:
@@ -169,7 +172,7 @@ def compendium_publish(obj, id=None):
 
     except ValueError:
         aesthetic_print(
-            rich.markdown.Markdown(
+            aesthetic_markdown(
                 "You need to define a `--execution-compendium-name` or `--draft-pid` "
                 "to publish a Draft."
             )
@@ -177,7 +180,7 @@ def compendium_publish(obj, id=None):
 
     except ExecutionCompendiumNotFound:
         aesthetic_print(
-            rich.markdown.Markdown("The defined Execution Compendium was not founded!")
+            aesthetic_markdown("The defined Execution Compendium was not founded!")
         )
 
     except:
@@ -214,7 +217,7 @@ def compendium_upload_files(obj, source=None):
 
     except ExecutionCompendiumNotFound:
         aesthetic_print(
-            rich.markdown.Markdown("The defined Execution Compendium was not founded!")
+            aesthetic_markdown("The defined Execution Compendium was not founded!")
         )
 
     except:
@@ -283,12 +286,12 @@ def compendium_download_files(
 
     except ExecutionCompendiumNotFound:
         aesthetic_print(
-            rich.markdown.Markdown("The defined Execution Compendium was not founded!")
+            aesthetic_markdown("The defined Execution Compendium was not founded!")
         )
 
     except ValueError:
         aesthetic_print(
-            rich.markdown.Markdown(
+            aesthetic_markdown(
                 "Before downloading the files, you need to define a "
                 "`--execution-compendium-name` or `--draft-pid`"
             )
@@ -296,7 +299,7 @@ def compendium_download_files(
 
     except NotADirectoryError:
         aesthetic_print(
-            rich.markdown.Markdown(
+            aesthetic_markdown(
                 "The `-o/-output-dir` parameter should be a directory."
             )
         )
@@ -6,7 +6,6 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import click
-from storm_client.models.deposit import DepositJob
 
 from storm_workbench.cli.commands.service.service import service
 from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
@@ -55,6 +54,8 @@ def deposit_describe(obj, id=None):
 @click.pass_obj
 def deposit_create(obj, service=None, workflow_id=None):
     """Create a new Deposit."""
+    from storm_client.models.deposit import DepositJob
+
     workbench = obj["workbench"]
 
     try:
@@ -98,6 +99,8 @@ def deposit_create(obj, service=None, workflow_id=None):
 @click.pass_obj
 def deposit_update(obj, id=None, service=None, workflow_id=None):
     """Update an existing Storm WS Deposit."""
+    from storm_client.models.deposit import DepositJob
+
     workbench = obj["workbench"]
 
     try:
@@ -6,7 +6,6 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import click
-from storm_client.models.execution import ExecutionJob
 
 from storm_workbench.cli.commands.service.service import service
 from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
@@ -55,6 +54,8 @@ def execution_job_describe(obj, id=None):
 @click.pass_obj
 def execution_job_create(obj, workflow_id=None, service=None):
     """Create a new ExecutionJob."""
+    from storm_client.models.execution import ExecutionJob
+
     workbench = obj["workbench"]
 
     try:
@@ -98,6 +99,8 @@ def execution_job_create(obj, workflow_id=None, service=None):
 @click.pass_obj
 def execution_job_update(obj, id=None, workflow_id=None, service=None):
     """Update an existing Storm WS Execution Job."""
+    from storm_client.models.execution import ExecutionJob
+
     workbench = obj["workbench"]
 
     try:
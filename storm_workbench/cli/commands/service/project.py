@@ -9,11 +9,13 @@ import json
 from pathlib import Path
 
 import click
-import rich.markdown
-from storm_client.models.project import Project
 
 from storm_workbench.cli.commands.service.service import service
-from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
+from storm_workbench.cli.graphics.aesthetic import (
+    aesthetic_markdown,
+    aesthetic_print,
+    aesthetic_traceback,
+)
 from storm_workbench.cli.graphics.table import aesthetic_table_by_document
 from storm_workbench.cli.graphics.tree import aesthetic_tree_base
 
@@ -105,6 +107,8 @@ def project_finish(obj, id):
 @click.pass_obj
 def project_create(obj, id=None, title=None, description=None, metadata_file=None):
     """Create a new Project."""
+    from storm_client.models.project import Project
+
     workbench = obj["workbench"]
 
     # defining the metadata
@@ -119,7 +123,7 @@ def project_create(obj, id=None, title=None, description=None, metadata_file=Non
 
     else:
         aesthetic_print(
-            rich.markdown.Markdown(
+            aesthetic_markdown(
                 "To create a Project, you need to define the `--title` and "
                 "`--description` options or set the `--metadata-file`"
             )
@@ -8,7 +8,6 @@
 import click
 
 from storm_workbench.cli.graphics.aesthetic import aesthetic_traceback
-from storm_workbench.workbench import Workbench
 
 
 @click.group(name="service")
@@ -19,6 +18,9 @@ def service(ctx):
         ctx.obj = dict()
 
     try:
+        # the Workbench API is loaded only when a command is invoked.
+        from storm_workbench.workbench import Workbench
+
         ctx.obj["workbench"] = Workbench()
     except:
         aesthetic_traceback(show_locals=True)
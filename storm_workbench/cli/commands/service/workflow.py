@@ -6,7 +6,6 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 import click
-from storm_client.models.workflow import Workflow
 
 from storm_workbench.cli.commands.service.service import service
 from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
@@ -95,6 +94,8 @@ def workflow_finish(obj, id):
 @click.pass_obj
 def workflow_create(obj, id=None, title=None, description=None, version=None):
     """Create a new Workflow."""
+    from storm_client.models.workflow import Workflow
+
     workbench = obj["workbench"]
 
     try:
@@ -9,19 +9,19 @@ from pathlib import Path
 
 import click
 
-from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
-from storm_workbench.template import write_template
-from storm_workbench.workbench.settings import (
-    find_workbench_definition_file,
-    find_secrets_file,
-)
-
 from storm_workbench import constants
+from storm_workbench.cli.graphics.aesthetic import aesthetic_print, aesthetic_traceback
 
 
 @click.command(name="init")
 def init():
     """Initialize a new Workbench."""
+    from storm_workbench.template import write_template
+    from storm_workbench.workbench.settings import (
+        find_workbench_definition_file,
+        find_secrets_file,
+    )
+
     aesthetic_print(
         "[bold cyan]Storm Workbench[/bold cyan]: Workbench initialization", 1
     )
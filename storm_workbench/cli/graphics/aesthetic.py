@@ -8,8 +8,6 @@
 from time import sleep
 from typing import Any
 
-from rich.console import Console
-
 
 def aesthetic_print(message: Any, wait_time: int = 1, **kwargs):
     """Create aesthetic prints.
@@ -28,6 +26,8 @@ def aesthetic_print(message: Any, wait_time: int = 1, **kwargs):
     Returns:
         None: The messages will show on the terminal.
     """
+    from rich.console import Console
+
     console = Console(**kwargs.get("console_options", {}))
 
     console.print(message, **kwargs.get("print_options", {}))
@@ -44,5 +44,21 @@ def aesthetic_traceback(**kwargs):
         For more information about the ``rich.console.Console.print_exception``, please
         check the official documentation: <https://rich.readthedocs.io/en/latest/traceback.html>
     """
+    from rich.console import Console
+
     console = Console()
     console.print_exception(**kwargs)
+
+
+def aesthetic_markdown(message: str) -> "Markdown":
+    """Create a `rich.markdown.Markdown` to be presented with the ``aesthetic_print``.
+
+    Args:
+        message (str): Message in the Markdown format.
+
+    Returns:
+        Markdown: Markdown object.
+    """
+    from rich.markdown import Markdown
+
+    return Markdown(message)
@@ -8,14 +8,12 @@
 from typing import List, Tuple, Dict
 
 from pydash import py_
-from rich.table import Table
-from storm_core.index.graph import VertexStatus
 
 from storm_workbench import constants
 from storm_workbench.cli.graphics.aesthetic import aesthetic_print
 
 
-def aesthetic_table_base(title: str, columns: List[str], rows: List[Tuple]) -> Table:
+def aesthetic_table_base(title: str, columns: List[str], rows: List[Tuple]) -> "Table":
     """Create a simple `rich.table.Table`.
 
     Args:
@@ -28,6 +26,8 @@ def aesthetic_table_base(title: str, columns: List[str], rows: List[Tuple]) -> T
     Returns:
         Table: Created table.
     """
+    from rich.table import Table
+
     table = Table(
         show_header=True, header_style="bold", title_justify="center", title=title
     )
@@ -102,6 +102,8 @@ def aesthetic_table_index_ls(execution_compendia):
     Returns:
         None: The table will be printed in the terminal.
     """
+    from storm_core.index.graph import VertexStatus
+
     # defining icons for each status (the current available status is: `updated` and `outdated`)
     status_emoji = {
         VertexStatus.Updated: ":heavy_check_mark:",
@@ -143,3 +145,111 @@ def aesthetic_table_index_ls(execution_compendia):
     )
 
     aesthetic_print(table, 0)
+
+
+def aesthetic_table_verification(report: Dict):
+    """Show the verification of the reproduced outputs in a table.
+
+    Args:
+        report (Dict): Verification report (see ``storm_workbench.api.backstage.verification``).
+
+    Returns:
+        None: The table will be printed in the terminal.
+    """
+    # defining row style
+    status_color = {
+        "match": "green",
+        "mismatch": "red",
+        "missing": "red",
+        "skipped": "yellow",
+    }
+    row_template = "[bold {color}]{status}[/bold {color}]"
+
+    # creating the table with the following columns:
+    # compendium | output | expected | obtained | status
+    columns = ["Compendium", "Output", "Expected", "Obtained", "Status"]
+
+    rows_formated = []
+
+    for compendium in report["compendia"]:
+        outputs = compendium["outputs"] or [
+            dict(file="-", expected=None, obtained=None, status=compendium["status"])
+        ]
+
+        for output in outputs:
+            rows_formated.append(
+                (
+                    compendium["name"],
+                    output["file"],
+                    output["expected"] or "-",
+                    output["obtained"] or "-",
+                    row_template.format(
+                        color=status_color[output["status"]], status=output["status"]
+                    ),
+                )
+            )
+
+    table = aesthetic_table_base(
+        title="[bold]Reproduction Verification[/bold]",
+        columns=columns,
+        rows=rows_formated,
+    )
+
+    aesthetic_print(table, 0)
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration (in seconds) as ``HH:MM:SS``."""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def aesthetic_table_plan(plan: Dict):
+    """Show the update plan in a table.
+
+    Args:
+        plan (Dict): Update plan (see ``ExecutionOperationService.plan``).
+
+    Returns:
+        None: The table will be printed in the terminal.
+    """
+    # creating the table with the following columns:
+    # order | compendium | command | level | duration | start | finish | critical
+    columns = [
+        "Order",
+        "Compendium",
+        "Command",
+        "Level",
+        "Duration",
+        "Start",
+        "Finish",
+        "Critical",
+    ]
+
+    rows_formated = []
+
+    for order, vertex in enumerate(plan["vertices"], start=1):
+        duration = format_duration(vertex["duration"])
+
+        rows_formated.append(
+            (
+                str(order),
+                vertex["name"],
+                vertex["command"],
+                str(vertex["level"]),
+                f"[yellow]~{duration}[/yellow]" if vertex["estimated"] else duration,
+                format_duration(vertex["start"]),
+                format_duration(vertex["finish"]),
+                "[bold red]yes[/bold red]" if vertex["critical"] else "no",
+            )
+        )
+
+    table = aesthetic_table_base(
+        title="[bold]Update Plan[/bold]",
+        columns=columns,
+        rows=rows_formated,
+    )
+
+    aesthetic_print(table, 0)
@@ -8,10 +8,8 @@
 
 from typing import List
 
-from rich.tree import Tree
 
-
-def aesthetic_tree_base(title: str, children: List[str]) -> Tree:
+def aesthetic_tree_base(title: str, children: List[str]) -> "Tree":
     """Create a simple `rich.tree.Tree`.
 
     Args:
@@ -22,6 +20,7 @@ def aesthetic_tree_base(title: str, children: List[str]) -> Tree:
     Returns:
         Tree: Tree object.
     """
+    from rich.tree import Tree
 
     tree = Tree(title)
 
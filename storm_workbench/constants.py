@@ -13,12 +13,9 @@ CORE_EXECUTOR_ENTRYPOINT = "core.executors"
 #
 # Storm Core descriptor
 #
-import storm_core
-
 # ToDo: This metadata should be provided by the Storm Core ?
 CORE_DESCRIPTOR_NAME = "Storm Core"
 CORE_DESCRIPTOR_URI = "https://github.com/storm-platform/storm-core"
-CORE_DESCRIPTION_VERSION = storm_core.__version__
 
 #
 # Storm Workbench definitions.
@@ -29,7 +26,26 @@ WB_DEFINITION_FILE = "workbench.toml"
 
 WB_DEFAULT_EXECUTOR = "paradag.parallel"
 
+#
+# Graph index control definitions.
+#
+INDEX_GENERATION_ATTRIBUTE = "workbench_generation"
+"""Graph attribute used to count the modifications applied to the index."""
+
+INDEX_GENERATION_STATE_KEY = "index_generation"
+"""Database state key with the last index generation synchronized."""
+
 #
 # Graph default visualization definitions.
 #
 GRAPH_DEFAULT_VERTICES_COLOR = {"updated": "green", "outdated": "yellow"}
+
+
+def __getattr__(name):
+    """Load the Storm Core based definitions on the first access."""
+    if name == "CORE_DESCRIPTION_VERSION":
+        import storm_core
+
+        return storm_core.__version__
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
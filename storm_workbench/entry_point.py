@@ -5,22 +5,183 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
-import pkg_resources
+import hashlib
+import json
+import os
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import List, Union
 
+from storm_workbench.location import _get_user_cache_dir
 
-def load_entry_point(entry_point_group: str):
-    """Load entry point group.
+ENTRY_POINT_CACHE_FILE = "entry_points.json"
+"""File (in the Workbench user directory) where the resolved entry points are cached."""
+
+
+def _iter_entry_points(entry_point_group: str) -> List[metadata.EntryPoint]:
+    """List the entry points of a group (with ``importlib.metadata``).
+
+    Args:
+        entry_point_group (str): Entry Point group.
+
+    Returns:
+        List[metadata.EntryPoint]: Entry points of the group.
+    """
+    entry_points = metadata.entry_points()
+
+    # python < 3.10: the entry points are grouped in a dictionary.
+    if not hasattr(entry_points, "select"):
+        return list(entry_points.get(entry_point_group, []))
+
+    return list(entry_points.select(group=entry_point_group))
+
+
+def installed_distributions_fingerprint() -> str:
+    """Generate a fingerprint of the installed distributions.
+
+    The fingerprint is generated from the distribution metadata
+    directories (``*.dist-info`` and ``*.egg-info``) available in the
+    ``sys.path``. So, it changes when a distribution is installed, removed or
+    upgraded, without parsing the distribution metadata files.
+
+    Returns:
+        str: Fingerprint of the installed distributions.
+    """
+    fingerprint = hashlib.sha256(sys.executable.encode())
+
+    for path in sys.path:
+        fingerprint.update(path.encode())
+
+        if not os.path.isdir(path):
+            continue
+
+        distributions = sorted(
+            entry.name
+            for entry in os.scandir(path)
+            if entry.name.endswith((".dist-info", ".egg-info"))
+        )
+        fingerprint.update("\n".join(distributions).encode())
+
+    return fingerprint.hexdigest()
+
+
+class EntryPointCache:
+    """On-disk cache of the resolved entry points.
+
+    The cache maps a name (e.g., the Storm Core Executor name) to the entry point
+    value (``module:attribute``) that defines it. It is invalidated when the installed
+    distributions change.
+    """
+
+    def __init__(self, cache_file: Path = None):
+        """Initializer.
+
+        Args:
+            cache_file (Path): File where the cache is stored. If not defined, the file is
+            stored in the Workbench user directory.
+        """
+        self._cache_file = cache_file or (
+            _get_user_cache_dir("storm-workbench") / ENTRY_POINT_CACHE_FILE
+        )
+
+        self._fingerprint = installed_distributions_fingerprint()
+        self._groups = self._read()
+
+    def _read(self) -> dict:
+        """Read the cache file (an outdated or invalid cache is discarded)."""
+        try:
+            cache = json.loads(self._cache_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cache, dict) or cache.get("fingerprint") != self._fingerprint:
+            return {}
+
+        return cache.get("groups", {})
+
+    def get(self, entry_point_group: str, name: str) -> Union[None, str]:
+        """Get the entry point value of a name."""
+        return self._groups.get(entry_point_group, {}).get(name)
+
+    def set(self, entry_point_group: str, name: str, value: str):
+        """Set the entry point value of a name (the cache file is updated)."""
+        self._groups.setdefault(entry_point_group, {})[name] = value
+
+        cache_file_tmp = self._cache_file.with_name(
+            f".{self._cache_file.name}.{os.getpid()}.tmp"
+        )
+
+        # the cache is an optimization: errors saving it are ignored.
+        try:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+            cache_file_tmp.write_text(
+                json.dumps({"fingerprint": self._fingerprint, "groups": self._groups})
+            )
+            os.replace(cache_file_tmp, self._cache_file)
+        except OSError:
+            cache_file_tmp.unlink(missing_ok=True)
+
+
+def find_entry_point(
+    entry_point_group: str,
+    name: str,
+    attribute: str = "name",
+    cache: EntryPointCache = None,
+):
+    """Find and load a single object from an entry point group.
+
+    Only the required object is loaded. The entry points are checked in the
+    following order: (1) the entry point cached for the ``name``; (2) the entry
+    points registered with the ``name``; (3) the remaining entry points of the group.
+    The resolved entry point is saved in the cache.
 
     Args:
-        entry_point_group (str): Entry Point group to load.
+        entry_point_group (str): Entry Point group.
+
+        name (str): Name of the object. It is compared with the ``attribute`` of the
+        loaded objects (or the entry point name, if the object doesn't have the ``attribute``).
+
+        attribute (str): Object attribute with the object name.
+
+        cache (EntryPointCache): Entry point cache. If not defined, the default
+        user cache is used.
 
     Returns:
-        List[object]: List with the loaded objects from the
-        entry point group.
+        Union[None, object]: Loaded object. If no object is found, ``None`` is returned.
     """
-    entry_point_definitions = []
-    for entry_point in pkg_resources.iter_entry_points(group=entry_point_group):
+    cache = cache or EntryPointCache()
+
+    def _matches(entry_point_obj, entry_point_name):
+        return getattr(entry_point_obj, attribute, entry_point_name) == name
+
+    # cached entry point
+    cached_value = cache.get(entry_point_group, name)
+
+    if cached_value:
+        entry_point = metadata.EntryPoint(
+            name=name, value=cached_value, group=entry_point_group
+        )
+
+        try:
+            entry_point_obj = entry_point.load()
+
+            if _matches(entry_point_obj, name):
+                return entry_point_obj
+        except (ImportError, AttributeError):
+            pass  # invalid cache: resolving the entry point again.
+
+    # registered entry points (the ones with the searched name are checked first).
+    entry_points = sorted(
+        _iter_entry_points(entry_point_group), key=lambda x: x.name != name
+    )
+
+    for entry_point in entry_points:
         entry_point_obj = entry_point.load()
 
-        entry_point_definitions.append(entry_point_obj)
-    return entry_point_definitions
+        if _matches(entry_point_obj, entry_point.name):
+            cache.set(entry_point_group, name, entry_point.value)
+            return entry_point_obj
+
+    return None
@@ -0,0 +1,880 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Columnar persistence of the graph index."""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import uuid
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from igraph import Graph
+
+from storm_workbench import constants
+
+GRAPH_FILE_MAGIC = b"SWBGRAPH"
+"""Magic bytes of the columnar graph file."""
+
+GRAPH_FILE_VERSION = 1
+"""Version of the columnar graph file format."""
+
+_HEADER_PREFIX = struct.Struct("<8sIQ")
+"""File prefix: magic, format version and header length."""
+
+_ALIGNMENT = 8
+"""Alignment (in bytes) of the file sections."""
+
+JOURNAL_FILE_MAGIC = b"SWBJOURNAL"
+"""Magic bytes of the graph journal file."""
+
+JOURNAL_COMPACTION_RECORDS = 128
+"""Number of journal records that triggers the journal compaction."""
+
+_JOURNAL_RECORD = struct.Struct("<II")
+"""Journal record prefix: content length and checksum (crc32)."""
+
+
+#
+# Column encoding
+#
+_SCALAR_ENCODINGS = {
+    "int64": (int, "q"),
+    "float64": (float, "d"),
+    "bool": (bool, "B"),
+}
+"""Typed encodings of the scalar columns (Python type and array typecode)."""
+
+_INT64_RANGE = (-(2 ** 63), 2 ** 63 - 1)
+"""Range of the values stored in ``int64`` columns."""
+
+
+def _column_encoding(values: List[Any]) -> str:
+    """Select the encoding of a column (the most specific one for its values)."""
+    if all(isinstance(v, str) for v in values):
+        return "str"
+
+    for encoding, (value_type, _) in _SCALAR_ENCODINGS.items():
+        # note: ``type`` is used since ``bool`` is a subclass of ``int``.
+        if values and all(type(v) is value_type for v in values):
+            if encoding != "int64" or (
+                _INT64_RANGE[0] <= min(values) and max(values) <= _INT64_RANGE[1]
+            ):
+                return encoding
+
+    return "pickle-list"
+
+
+def _encode_column(values: List[Any]) -> (str, bytes, bytes):
+    """Encode a list of attribute values as a column.
+
+    Columns with only string values are stored as ``UTF-8`` with an offsets table
+    (``len(values) + 1`` unsigned 64 bits integers), so each value can be decoded
+    alone. Scalar columns (``int``, ``float`` and ``bool`` values) are stored as typed
+    arrays. Other columns are stored as a single pickled list.
+
+    Args:
+        values (List[Any]): Column values.
+
+    Returns:
+        Tuple[str, bytes, bytes]: Column encoding, offsets table (empty for the columns
+        without offsets) and data buffer.
+    """
+    encoding = _column_encoding(values)
+
+    if encoding == "str":
+        offsets = array("Q", [0])
+        data = bytearray()
+
+        for value in values:
+            data.extend(value.encode("utf-8"))
+            offsets.append(len(data))
+
+        return encoding, _to_little_endian(offsets).tobytes(), bytes(data)
+
+    if encoding in _SCALAR_ENCODINGS:
+        data = array(_SCALAR_ENCODINGS[encoding][1], values)
+        return encoding, b"", _to_little_endian(data).tobytes()
+
+    return encoding, b"", pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _to_little_endian(values: array) -> array:
+    """Convert an array to the little-endian byte order used in the file."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _from_buffer(typecode: str, buffer: memoryview) -> Union[memoryview, array]:
+    """Read (without copy, when possible) a little-endian typed buffer."""
+    if sys.byteorder == "little":
+        return buffer.cast(typecode)
+
+    values = array(typecode, buffer.tobytes())
+    values.byteswap()
+    return values
+
+
+class LazyColumn:
+    """Attribute column decoded on access.
+
+    The values of the column are decoded from the memory-mapped file only
+    when they are accessed. String columns are decoded value by value, the
+    other columns are decoded at once. The decoded values are cached.
+    """
+
+    def __init__(self, encoding: str, offsets, data: memoryview):
+        """Initializer.
+
+        Args:
+            encoding (str): Column encoding (``str``, ``int64``, ``float64``, ``bool``
+            or ``pickle-list``).
+
+            offsets: Offsets table of the column values in ``data`` (only for the
+            ``str`` encoding).
+
+            data (memoryview): Buffer with the encoded values.
+        """
+        self._encoding = encoding
+        self._offsets = offsets
+        self._data = data
+
+        self._cache = {}
+        self._values = None
+
+        if encoding in _SCALAR_ENCODINGS:
+            self._values = _from_buffer(_SCALAR_ENCODINGS[encoding][1], data)
+            self._length = len(self._values)
+
+        elif encoding == "pickle-list":
+            self._length = None
+        else:
+            self._length = len(offsets) - 1
+
+    @property
+    def encoding(self) -> str:
+        """Column encoding."""
+        return self._encoding
+
+    def __len__(self):
+        """Get the number of values in the column."""
+        if self._length is None:
+            self._length = len(self._decode_all())
+        return self._length
+
+    def __getitem__(self, index: int) -> Any:
+        """Decode a column value."""
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("Column index out of range")
+
+        if self._encoding == "pickle-list":
+            return self._decode_all()[index]
+
+        if self._encoding in _SCALAR_ENCODINGS:
+            return _SCALAR_ENCODINGS[self._encoding][0](self._values[index])
+
+        if index not in self._cache:
+            value = self._data[self._offsets[index] : self._offsets[index + 1]]
+            self._cache[index] = str(value, "utf-8")
+
+        return self._cache[index]
+
+    def _decode_all(self) -> List[Any]:
+        """Decode a ``pickle-list`` column."""
+        if self._values is None:
+            self._values = pickle.loads(self._data)
+        return self._values
+
+    def to_list(self) -> List[Any]:
+        """Decode all column values."""
+        if self._encoding == "pickle-list":
+            return list(self._decode_all())
+
+        if self._encoding in _SCALAR_ENCODINGS:
+            value_type = _SCALAR_ENCODINGS[self._encoding][0]
+            return [value_type(value) for value in self._values]
+
+        if self._encoding == "str" and not self._cache:
+            data = str(self._data, "utf-8") if self._data.nbytes else ""
+
+            # note: the offsets are in bytes, so only ASCII columns are sliced directly.
+            if len(data) == self._data.nbytes:
+                offsets = self._offsets
+                return [data[offsets[i] : offsets[i + 1]] for i in range(len(self))]
+
+        return [self[index] for index in range(len(self))]
+
+    def release(self):
+        """Release the column buffers. Only the cached values remain available."""
+        for buffer in (self._values, self._offsets, self._data):
+            if isinstance(buffer, memoryview):
+                buffer.release()
+
+
+class ColumnarGraphFile:
+    """Memory-mapped columnar graph file.
+
+    In the Storm Workbench, the graph index is persisted in a columnar file
+    with the following sections:
+
+        - Prefix (magic bytes, format version and header length);
+        - Header (JSON document with the graph description and sections location,
+          relative to the end of the header);
+        - Edges (``2 * edges`` signed 64 bits integers);
+        - Columns (one data buffer for each vertex/edge attribute, with an offsets
+          table for the string attributes).
+
+    The file is memory-mapped and the attributes are decoded only when
+    accessed, so reading a few attributes (e.g., the vertex names) does not
+    require decoding the complete graph. Scalar attributes are stored as typed
+    arrays and the other attributes as a pickled list (see ``_encode_column``).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initializer.
+
+        Args:
+            path (Union[str, Path]): Path to the columnar graph file.
+        """
+        self._file = Path(path).open("rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, version, header_length = _HEADER_PREFIX.unpack_from(self._buffer)
+
+        if magic != GRAPH_FILE_MAGIC:
+            raise ValueError(f"`{path}` is not a columnar graph file!")
+
+        if version != GRAPH_FILE_VERSION:
+            raise ValueError(f"Unsupported columnar graph file version ({version}).")
+
+        header_start = _HEADER_PREFIX.size
+        self._header = json.loads(
+            bytes(self._buffer[header_start : header_start + header_length])
+        )
+        self._data_start = _align(header_start + header_length)
+
+        self._columns = {}
+
+    def __enter__(self):
+        """Open the graph file in a ``with`` statement."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the graph file at the end of the ``with`` statement."""
+        self.close()
+
+    def close(self):
+        """Release the memory-mapped file."""
+        for column in self._columns.values():
+            column.release()
+
+        self._columns = {}
+        self._buffer.release()
+
+        self._mmap.close()
+        self._file.close()
+
+    def _section(self, section: Dict) -> memoryview:
+        """Get a file section."""
+        start = self._data_start + section["offset"]
+        return self._buffer[start : start + section["length"]]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """File metadata."""
+        return self._header.get("metadata", {})
+
+    @property
+    def directed(self) -> bool:
+        """Flag indicating if the graph is directed."""
+        return self._header["directed"]
+
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices."""
+        return self._header["vertex_count"]
+
+    @property
+    def edge_count(self) -> int:
+        """Number of edges."""
+        return self._header["edge_count"]
+
+    @property
+    def graph_attributes(self) -> Dict[str, Any]:
+        """Graph attributes."""
+        return pickle.loads(self._section(self._header["graph_attributes"]))
+
+    @property
+    def vertex_attributes(self) -> List[str]:
+        """Vertex attributes names."""
+        return list(self._header["vertex_columns"].keys())
+
+    @property
+    def edge_attributes(self) -> List[str]:
+        """Edge attributes names."""
+        return list(self._header["edge_columns"].keys())
+
+    @property
+    def edges(self) -> List[tuple]:
+        """Graph edge list."""
+        values = _from_buffer("q", self._section(self._header["edges"]))
+        return list(zip(values[0::2], values[1::2]))
+
+    def _column(self, kind: str, name: str) -> LazyColumn:
+        """Get a lazy column."""
+        key = (kind, name)
+
+        if key not in self._columns:
+            column = self._header[kind][name]
+
+            self._columns[key] = LazyColumn(
+                column["encoding"],
+                _from_buffer("Q", self._section(column["offsets"]))
+                if "offsets" in column
+                else None,
+                self._section(column["data"]),
+            )
+
+        return self._columns[key]
+
+    def vertex_column(self, name: str) -> LazyColumn:
+        """Get a vertex attribute column."""
+        return self._column("vertex_columns", name)
+
+    def edge_column(self, name: str) -> LazyColumn:
+        """Get an edge attribute column."""
+        return self._column("edge_columns", name)
+
+    def to_graph(self, vertex_attributes: List[str] = None) -> Graph:
+        """Create a graph from the file content.
+
+        Args:
+            vertex_attributes (List[str]): Vertex attributes to decode. If not
+            defined, all attributes are decoded.
+
+        Returns:
+            Graph: Graph object.
+        """
+        vertex_attributes = (
+            self.vertex_attributes if vertex_attributes is None else vertex_attributes
+        )
+
+        return Graph(
+            n=self.vertex_count,
+            edges=self.edges,
+            directed=self.directed,
+            graph_attrs=self.graph_attributes,
+            vertex_attrs={
+                name: self.vertex_column(name).to_list() for name in vertex_attributes
+            },
+            edge_attrs={
+                name: self.edge_column(name).to_list()
+                for name in self.edge_attributes
+            },
+        )
+
+    @classmethod
+    def write(
+        cls, graph: Graph, path: Union[str, Path], metadata: Dict[str, Any] = None
+    ) -> Path:
+        """Write a graph in a columnar graph file.
+
+        The file is written in a temporary file and moved to the
+        final location, so a failure never corrupts the existing file.
+
+        Args:
+            graph (Graph): Graph object.
+
+            path (Union[str, Path]): Path where the file will be written.
+
+            metadata (Dict[str, Any]): JSON-serializable metadata stored in the file header.
+
+        Returns:
+            Path: Path to the written file.
+        """
+        path = Path(path)
+        sections = []
+
+        def _add_section(content: bytes) -> Dict:
+            descriptor = {"offset": 0, "length": len(content)}
+
+            sections.append((descriptor, content))
+            return descriptor
+
+        def _add_columns(sequence) -> Dict:
+            columns = {}
+
+            for name in sequence.attributes():
+                encoding, offsets, data = _encode_column(sequence[name])
+
+                columns[name] = {"encoding": encoding, "data": _add_section(data)}
+
+                if encoding == "str":
+                    columns[name]["offsets"] = _add_section(offsets)
+
+            return columns
+
+        edges = array("q", [vertex for edge in graph.get_edgelist() for vertex in edge])
+
+        header = {
+            "metadata": metadata or {},
+            "directed": graph.is_directed(),
+            "vertex_count": graph.vcount(),
+            "edge_count": graph.ecount(),
+            "graph_attributes": _add_section(
+                pickle.dumps(
+                    {name: graph[name] for name in graph.attributes()},
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            ),
+            "edges": _add_section(_to_little_endian(edges).tobytes()),
+            "vertex_columns": _add_columns(graph.vs),
+            "edge_columns": _add_columns(graph.es),
+        }
+
+        # defining the sections location (relative to the end of the header).
+        position = 0
+
+        for descriptor, _ in sections:
+            descriptor["offset"] = position
+            position = _align(position + descriptor["length"])
+
+        header_content = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        data_start = _align(_HEADER_PREFIX.size + len(header_content))
+
+        tmp_path = path.parent / f".{path.name}.tmp"
+        with tmp_path.open("wb") as ofile:
+            ofile.write(
+                _HEADER_PREFIX.pack(
+                    GRAPH_FILE_MAGIC, GRAPH_FILE_VERSION, len(header_content)
+                )
+            )
+            ofile.write(header_content)
+
+            for descriptor, content in sections:
+                ofile.write(b"\0" * (data_start + descriptor["offset"] - ofile.tell()))
+                ofile.write(content)
+
+            ofile.flush()
+            os.fsync(ofile.fileno())
+
+        os.replace(tmp_path, path)
+        return path
+
+
+def _align(position: int) -> int:
+    """Align a file position."""
+    return position + (-position % _ALIGNMENT)
+
+
+def is_columnar_graph_file(path: Union[str, Path]) -> bool:
+    """Check if a file is a columnar graph file.
+
+    Args:
+        path (Union[str, Path]): Path to the file.
+
+    Returns:
+        bool: Flag indicating if the file is a columnar graph file.
+    """
+    with Path(path).open("rb") as ifile:
+        return ifile.read(len(GRAPH_FILE_MAGIC)) == GRAPH_FILE_MAGIC
+
+
+def _apply_mutations(graph: Graph, mutations: List[tuple]):
+    """Apply mutations (generated by ``GraphStorage._mutations``) in a graph."""
+    for mutation, *args in mutations:
+        if mutation == "delete_edge":
+            graph.delete_edges(graph.get_eid(*args))
+
+        elif mutation == "delete_vertex":
+            graph.delete_vertices(graph.vs.find(name=args[0]).index)
+
+        elif mutation == "add_vertex":
+            graph.add_vertex(**args[1])
+
+        elif mutation == "update_vertex":
+            vertex = graph.vs.find(name=args[0])
+
+            for attr, value in args[1].items():
+                vertex[attr] = value
+
+        elif mutation == "add_edge":
+            graph.add_edge(args[0], args[1], **args[2])
+
+        elif mutation == "graph_attributes":
+            for attr in graph.attributes():
+                del graph[attr]
+
+            for attr, value in args[0].items():
+                graph[attr] = value
+
+        else:
+            raise ValueError(f"Invalid graph mutation: {mutation}")
+
+
+class GraphStorage:
+    """Journaled graph storage.
+
+    The graph index is stored as a snapshot (columnar graph file) and an
+    append-only journal, written next to the snapshot. Each save appends
+    to the journal only the mutations applied in the graph since the last
+    save (added/removed vertices and edges, vertex attributes changes like
+    status updates). When the journal grows, it is compacted: the graph is
+    written in a new snapshot and the journal is restarted.
+
+    The storage keeps a digest of the attributes of each vertex. When the index
+    generation is unchanged (see ``SessionService.bump_generation``) and no vertex
+    was marked as modified (``mark_modified``), nothing is read or written.
+    Otherwise, the added/removed vertices and edges are found by name, and the
+    vertices whose digest changed are written. Changes in the set of vertex
+    attributes (e.g., a new attribute) write a new snapshot.
+
+    Each journal record is protected by a checksum. If the Workbench stops
+    in the middle of a save, the partial record is discarded in the next
+    load and the snapshot is never affected.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initializer.
+
+        Args:
+            path (Union[str, Path]): Path to the snapshot file. The journal is
+            stored in the same directory with the ``.journal`` suffix.
+        """
+        self._path = Path(path)
+        self._journal_path = self._path.with_name(f"{self._path.name}.journal")
+
+        self._snapshot_id = None
+
+        self._journal_size = 0
+        self._journal_records = 0
+
+        # state of the graph in the last load/save.
+        self._generation = None
+        self._names = []
+        self._edges = Counter()
+        self._digests = {}
+        self._vertex_attributes = set()
+        self._graph_attributes = {}
+
+        self._modified = set()
+
+    @property
+    def path(self) -> Path:
+        """Path to the snapshot file."""
+        return self._path
+
+    def mark_modified(self, names: Iterable[str]):
+        """Mark vertices whose attributes were modified without a new index generation.
+
+        The next save looks for the modified vertices even if the index generation
+        is unchanged.
+
+        Args:
+            names (Iterable[str]): Names of the modified vertices.
+        """
+        self._modified.update(str(name) for name in names)
+
+    def load(self) -> Union[None, Graph]:
+        """Load the graph (snapshot and journal).
+
+        Returns:
+            Union[None, Graph]: Graph object. If the storage is empty, None is returned.
+        """
+        if not self._path.exists():
+            return None
+
+        if is_columnar_graph_file(self._path):
+            with ColumnarGraphFile(self._path) as graph_file:
+                graph = graph_file.to_graph()
+                self._snapshot_id = graph_file.metadata.get("snapshot")
+
+        else:
+            # graph indexes saved before the columnar format (storm_core pickle
+            # container), migrated to a snapshot in the next save.
+            from storm_core.helper import persistence as core_persistence
+
+            graph = core_persistence.PicklePersistenceContainer.load(self._path)
+
+        if self._snapshot_id and self._has_journal():
+            for mutations in self._read_journal():
+                _apply_mutations(graph, mutations)
+        else:
+            # without a valid journal, the next save writes a new snapshot.
+            self._snapshot_id = None
+
+        self._track(graph)
+        return graph
+
+    def save(self, graph: Graph):
+        """Save the graph.
+
+        Args:
+            graph (Graph): Graph object.
+
+        Returns:
+            None: The graph mutations will be appended to the journal.
+        """
+        if self._snapshot_id is None:
+            return self.compact(graph)
+
+        if _index_generation(graph) == self._generation and not self._modified:
+            return
+
+        if set(graph.vertex_attributes()) != self._vertex_attributes:
+            return self.compact(graph)
+
+        digests = _vertex_digests(graph)
+        mutations = self._mutations(graph, digests)
+
+        if mutations:
+            self._append_journal(mutations)
+
+        self._track(graph, digests)
+
+        if self._journal_records >= JOURNAL_COMPACTION_RECORDS or (
+            self._journal_size > self._path.stat().st_size
+        ):
+            self.compact(graph)
+
+    def compact(self, graph: Graph):
+        """Write the graph in a new snapshot and restart the journal.
+
+        Args:
+            graph (Graph): Graph object.
+        """
+        snapshot_id = uuid.uuid4().hex
+
+        self._path.parent.mkdir(exist_ok=True, parents=True)
+        ColumnarGraphFile.write(graph, self._path, metadata={"snapshot": snapshot_id})
+
+        # the journal of the previous snapshot is ignored from now on (its
+        # header has a different snapshot id), so it is safe to replace it.
+        tmp_path = self._journal_path.with_name(f".{self._journal_path.name}.tmp")
+        with tmp_path.open("wb") as ofile:
+            ofile.write(_journal_header(snapshot_id))
+
+            ofile.flush()
+            os.fsync(ofile.fileno())
+
+        os.replace(tmp_path, self._journal_path)
+
+        self._track(graph)
+        self._snapshot_id = snapshot_id
+
+        self._journal_size = len(_journal_header(snapshot_id))
+        self._journal_records = 0
+
+    def _track(self, graph: Graph, digests: Dict[str, bytes] = None):
+        """Keep the state of the graph used to find the next mutations.
+
+        Only the vertex names, the edges (by vertex name), the digest of the vertex
+        attributes and the graph attributes are kept.
+
+        Args:
+            graph (Graph): Graph object.
+
+            digests (Dict[str, bytes]): Digests of the vertices (see ``_vertex_digests``).
+            If not defined, they are generated.
+        """
+        names = [str(name) for name in graph.vs["name"]] if graph.vcount() else []
+
+        self._generation = _index_generation(graph)
+        self._names = names
+
+        self._edges = Counter(
+            (names[source], names[target]) for source, target in graph.get_edgelist()
+        )
+
+        self._digests = _vertex_digests(graph) if digests is None else digests
+        self._vertex_attributes = set(graph.vertex_attributes())
+
+        self._graph_attributes = {attr: graph[attr] for attr in graph.attributes()}
+        self._modified = set()
+
+    def _mutations(self, graph: Graph, digests: Dict[str, bytes]) -> List[tuple]:
+        """List the mutations applied in the graph since the last load/save.
+
+        Args:
+            graph (Graph): Graph object (with the vertex attributes of the last load/save).
+
+            digests (Dict[str, bytes]): Digests of the graph vertices.
+
+        Returns:
+            List[tuple]: Graph mutations.
+        """
+        names = [str(name) for name in graph.vs["name"]] if graph.vcount() else []
+        positions = {name: position for position, name in enumerate(names)}
+
+        edges = Counter(
+            (names[source], names[target]) for source, target in graph.get_edgelist()
+        )
+
+        mutations = []
+
+        for (source, target), count in (self._edges - edges).items():
+            mutations.extend([("delete_edge", source, target)] * count)
+
+        for name in self._names:
+            if name not in positions:
+                mutations.append(("delete_vertex", name))
+
+        for name in names:
+            if name not in self._digests:
+                mutations.append(
+                    ("add_vertex", name, graph.vs[positions[name]].attributes())
+                )
+
+            elif self._digests[name] != digests[name]:
+                mutations.append(
+                    ("update_vertex", name, graph.vs[positions[name]].attributes())
+                )
+
+        added_edges = edges - self._edges
+        if added_edges:
+            has_attributes = bool(graph.edge_attributes())
+
+            for (source, target), count in added_edges.items():
+                attributes = {}
+
+                if has_attributes:
+                    edge_id = graph.get_eid(positions[source], positions[target])
+                    attributes = graph.es[edge_id].attributes()
+
+                mutations.extend([("add_edge", source, target, attributes)] * count)
+
+        graph_attributes = {attr: graph[attr] for attr in graph.attributes()}
+        if graph_attributes != self._graph_attributes:
+            mutations.append(("graph_attributes", graph_attributes))
+
+        return mutations
+
+    def _has_journal(self) -> bool:
+        """Check if the journal exists and belongs to the current snapshot."""
+        if not self._journal_path.exists():
+            return False
+
+        header = _journal_header(self._snapshot_id)
+
+        with self._journal_path.open("rb") as ifile:
+            return ifile.read(len(header)) == header
+
+    def _read_journal(self) -> Iterator[List[tuple]]:
+        """Read the valid journal records of the current snapshot."""
+        with self._journal_path.open("rb") as ifile:
+            self._journal_size = len(_journal_header(self._snapshot_id))
+            self._journal_records = 0
+
+            ifile.seek(self._journal_size)
+
+            while True:
+                record_header = ifile.read(_JOURNAL_RECORD.size)
+                if len(record_header) < _JOURNAL_RECORD.size:
+                    break
+
+                length, checksum = _JOURNAL_RECORD.unpack(record_header)
+                content = ifile.read(length)
+
+                if len(content) < length or zlib.crc32(content) != checksum:
+                    break  # partial record (interrupted save).
+
+                yield pickle.loads(content)
+
+                self._journal_size += _JOURNAL_RECORD.size + length
+                self._journal_records += 1
+
+    def _append_journal(self, mutations: List[tuple]):
+        """Append a record in the journal."""
+        content = pickle.dumps(mutations, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._journal_path.open("r+b") as ofile:
+            # discarding partial records.
+            ofile.truncate(self._journal_size)
+            ofile.seek(self._journal_size)
+
+            ofile.write(_JOURNAL_RECORD.pack(len(content), zlib.crc32(content)))
+            ofile.write(content)
+
+            ofile.flush()
+            os.fsync(ofile.fileno())
+
+        self._journal_size += _JOURNAL_RECORD.size + len(content)
+        self._journal_records += 1
+
+
+def _vertex_digests(graph: Graph) -> Dict[str, bytes]:
+    """Generate a digest of the attributes of each vertex (by vertex name)."""
+    if not graph.vcount():
+        return {}
+
+    attributes = sorted(graph.vertex_attributes())
+    columns = [graph.vs[attr] for attr in attributes]
+
+    return {
+        str(name): hashlib.blake2b(
+            pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16
+        ).digest()
+        for name, values in zip(graph.vs["name"], zip(*columns))
+    }
+
+
+def _index_generation(graph: Graph) -> Union[None, int]:
+    """Index generation stored in the graph (see ``SessionService.bump_generation``)."""
+    if constants.INDEX_GENERATION_ATTRIBUTE not in graph.attributes():
+        return None
+
+    return graph[constants.INDEX_GENERATION_ATTRIBUTE]
+
+
+def _journal_header(snapshot_id: str) -> bytes:
+    """Journal header (with the snapshot id)."""
+    return JOURNAL_FILE_MAGIC + snapshot_id.encode("ascii")
+
+
+def save_graph(graph: Graph, path: Union[str, Path]) -> Path:
+    """Save a graph index.
+
+    Args:
+        graph (Graph): Graph object.
+
+        path (Union[str, Path]): Path where the graph will be saved.
+
+    Returns:
+        Path: Path to the saved file.
+    """
+    return ColumnarGraphFile.write(graph, path)
+
+
+def load_graph(path: Union[str, Path]) -> Graph:
+    """Load a graph index.
+
+    Args:
+        path (Union[str, Path]): Path to the graph file.
+
+    Returns:
+        Graph: Loaded graph object (with the journal mutations applied).
+
+    Note:
+        Graph files saved by previous versions of the Storm Workbench (``pickle``
+        format) are also supported. They are migrated to the columnar format
+        in the next save.
+    """
+    return GraphStorage(path).load()
@@ -5,7 +5,14 @@
 # storm-workbench is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
-from .workbench import Workbench
+__all__ = "Workbench"
 
 
-__all__ = "Workbench"
+def __getattr__(name):
+    """Load the Workbench on the first access (avoid the heavy imports on startup)."""
+    if name == "Workbench":
+        from .workbench import Workbench
+
+        return Workbench
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Storm Project.
+#
+# storm-workbench is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Lazily created components of the Workbench."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from storm_workbench.workbench.settings import WorkbenchDefinitionFile
+
+if TYPE_CHECKING:
+    from storm_workbench.persistence import GraphStorage
+
+
+class WorkbenchComponents:
+    """Workbench components.
+
+    The Workbench components (reproducible session, graph index and database)
+    are expensive to create: the graph index must be loaded from the disk and
+    the execution engine must be configured. Many operations (e.g., environment
+    information and Storm WS operations) don't use them. So, in the Workbench,
+    each component (and the libraries used by it) is loaded only when it is
+    accessed for the first time.
+    """
+
+    def __init__(
+        self,
+        reproducible_storage: Path,
+        config: WorkbenchDefinitionFile,
+        graph_storage: "GraphStorage" = None,
+    ):
+        """Initializer.
+
+        Args:
+            reproducible_storage (Path): Directory where the Workbench session files (e.g., Configuration
+            file, database file and so on) are stored.
+
+            config (WorkbenchDefinitionFile): Workbench configuration object.
+
+            graph_storage (GraphStorage): Storage of the graph index. If not defined, the
+            ``workflow/meta`` file of the ``reproducible_storage`` is used.
+        """
+        self._config = config
+        self._reproducible_storage = reproducible_storage
+
+        self._session = None
+        self._graph_storage = graph_storage
+        self._index_lookup = None
+
+        self._is_database_initialized = False
+
+    @property
+    def graph_storage(self):
+        """Storage of the graph index (snapshot and journal)."""
+        if self._graph_storage is None:
+            from storm_workbench.persistence import GraphStorage
+
+            self._graph_storage = GraphStorage(
+                self._reproducible_storage / "workflow" / "meta"
+            )
+
+        return self._graph_storage
+
+    @property
+    def session(self):
+        """Reproducible session, to manage and access the reproducible operations."""
+        if self._session is None:
+            from storm_workbench.workbench import session as session_module
+
+            self._session = session_module.create_reproducible_session(
+                self._reproducible_storage, self._config, self.graph_storage
+            )
+
+        return self._session
+
+    @property
+    def index_lookup(self):
+        """Name-keyed lookup table of the graph index (shared by all accessors)."""
+        if self._index_lookup is None:
+            from storm_workbench.api.backstage.lookup import IndexLookupTable
+
+            self._index_lookup = IndexLookupTable(self.session)
+
+        return self._index_lookup
+
+    @property
+    def database(self):
+        """Workbench database.
+
+        The database stores the relation between the local and online compendia.
+        It also provides a high-level identifier system to the compendia.
+        """
+        from storm_workbench.api.backstage.database import db, init_database
+
+        if not self._is_database_initialized:
+            database_path = self._reproducible_storage / "register"
+            database_path.mkdir(exist_ok=True, parents=True)
+
+            init_database(database_path / "register.db")
+            self._is_database_initialized = True
+
+        return db
@@ -7,24 +7,25 @@
 
 from pathlib import Path
 
-from pydash import py_
 from storm_core import ReproducibleSession
 from storm_core.execution import (
     ExecutionEngine,
     ExecutionEngineFilesConfig,
     ExecutionEngineServicesConfig,
 )
-from storm_core.helper.persistence import PicklePersistenceContainer
 from storm_core.index.graph import GraphManager
 
 from storm_workbench import constants
-from storm_workbench.entry_point import load_entry_point
+from storm_workbench.entry_point import find_entry_point
+from storm_workbench.exceptions import ConfigurationError
+from storm_workbench.persistence import GraphStorage
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 
 
 def create_reproducible_session(
     reproducible_storage: Path,
     workbench_definition: WorkbenchDefinitionFile,
+    graph_storage: GraphStorage = None,
 ) -> ReproducibleSession:
     """Create a reproducible session for the current workbench.
 
@@ -34,6 +35,9 @@ def create_reproducible_session(
 
         workbench_definition (WorkbenchDefinitionFile): Workbench configuration object.
 
+        graph_storage (GraphStorage): Storage used to load the graph index. If not defined,
+        the ``workflow/meta`` file of the ``reproducible_storage`` is used.
+
     Returns:
         ReproducibleSession: Reproducible Session object.
     """
@@ -42,18 +46,18 @@ def create_reproducible_session(
         "type", constants.WB_DEFAULT_EXECUTOR
     )
 
-    # getting the available Storm Core Executor classes
-    # from the entry point.
-    executor_classes = load_entry_point(constants.CORE_EXECUTOR_ENTRYPOINT)
-
-    # filtering by the user defined executor class name.
-    executor_cls = (
-        py_.chain(executor_classes)
-        .filter(lambda x: x.name == executor_cls_name)
-        .head()
-        .value()
+    # loading only the user defined Storm Core Executor class
+    # from the entry point (the resolved entry point is cached).
+    executor_cls = find_entry_point(
+        constants.CORE_EXECUTOR_ENTRYPOINT, executor_cls_name
     )
 
+    if executor_cls is None:
+        raise ConfigurationError(
+            f"Executor `{executor_cls_name}` is not available. Please, check "
+            "the `tool.storm.executor.type` option."
+        )
+
     executor_obj = executor_cls(
         **workbench_definition.definitions.tool.storm.executor.get("options") or {}
     )
@@ -79,15 +83,11 @@ def create_reproducible_session(
     engine = ExecutionEngine(engine_configuration, engine_files)
 
     # Graph manager
-    graph_index = None
-
     meta_dir = reproducible_storage / "workflow"
     meta_dir.mkdir(exist_ok=True, parents=True)
 
-    meta = meta_dir / "meta"
-
-    if meta.exists():
-        graph_index = PicklePersistenceContainer.load(meta)
+    graph_storage = graph_storage or GraphStorage(meta_dir / "meta")
+    graph_index = graph_storage.load()
 
     graph_manager = GraphManager(graph_index)
     return ReproducibleSession(engine, graph_manager)
@@ -6,16 +6,18 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from storm_workbench.api.backstage.accessor import BackstageAccessor
-from storm_workbench.api.backstage.database import init_database
 from storm_workbench.api.stage.accessor import StageAccessor
 from storm_workbench.location import create_reproducible_storage
-from storm_workbench.workbench.session import create_reproducible_session
+from storm_workbench.workbench.components import WorkbenchComponents
 from storm_workbench.workbench.settings import WorkbenchDefinitionFile
 from storm_workbench.workbench.store import pass_config
 
+if TYPE_CHECKING:
+    from storm_workbench.persistence import GraphStorage
+
 
 class Workbench:
     """Workbench class."""
@@ -26,6 +28,7 @@ class Workbench:
         cwd: Path = None,
         config: WorkbenchDefinitionFile = None,
         reproducible_storage: Union[str, Path] = None,
+        graph_storage: "GraphStorage" = None,
     ):
         """Initializer.
 
@@ -36,6 +39,9 @@ class Workbench:
 
             reproducible_storage (Path): Directory where the Workbench session files (e.g., Configuration
             file, database file and so on) are stored.
+
+            graph_storage (GraphStorage): Storage of the graph index. If not defined, the
+            ``workflow/meta`` file of the ``reproducible_storage`` is used.
         """
         self._config = config
 
@@ -49,20 +55,13 @@ class Workbench:
             )
         )
 
-        # session: to manage and access the
-        # reproducible operations
-        self._reproducible_session = create_reproducible_session(
-            self._reproducible_storage, self._config
+        # components: the session (to manage and access the reproducible
+        # operations), the graph index and the database. They are created
+        # only when accessed.
+        self._components = WorkbenchComponents(
+            self._reproducible_storage, config, graph_storage
         )
 
-        # database: to store the relation between the local
-        # and online compendia. The database also provides a high-level
-        # identifier system to the compendia.
-        database_path = self._reproducible_storage / "register"
-        database_path.mkdir(exist_ok=True, parents=True)
-
-        init_database(database_path / "register.db")
-
     @property
     def stage(self):
         """Stage API services accessor."""
@@ -71,4 +70,4 @@ class Workbench:
     @property
     def backstage(self):
         """Backstage API services accessor."""
-        return BackstageAccessor(self._reproducible_storage, self._reproducible_session)
+        return BackstageAccessor(self._reproducible_storage, self._components)
@@ -0,0 +1,93 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the archive writers."""
+
+import os
+import zipfile
+
+import pytest
+
+from storm_workbench.api.stage.exporter import archive
+
+
+def _input_files(tmp_path):
+    """Create files with many deflate blocks (and an empty one)."""
+    input_files = {}
+
+    for name, size in [("empty.txt", 0), ("dir/ação.txt", 10), ("large.bin", 3000)]:
+        input_file = tmp_path / "input" / name
+        input_file.parent.mkdir(parents=True, exist_ok=True)
+
+        input_file.write_bytes(os.urandom(size // 2) + b"a" * (size - size // 2))
+        input_files[name] = input_file
+
+    return input_files
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_zip_archive(tmp_path, monkeypatch, threads):
+    """Test that the (parallel) zip archives are regular zip files."""
+    monkeypatch.setattr(archive, "DEFLATE_BLOCK_SIZE", 512)
+    input_files = _input_files(tmp_path)
+
+    read_blocks = []
+
+    with archive.ZipArchiveWriter(tmp_path / "archive.zip", threads=threads) as writer:
+        for name, input_file in input_files.items():
+            assert writer.add_file(input_file, name, read_blocks.append) == (
+                input_file.stat().st_size
+            )
+
+        writer.add_bytes("tag.txt", b"tag content")
+
+    assert b"".join(read_blocks) == b"".join(
+        input_file.read_bytes() for input_file in input_files.values()
+    )
+
+    with zipfile.ZipFile(tmp_path / "archive.zip") as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.getinfo("large.bin").compress_type == zipfile.ZIP_DEFLATED
+
+    contents = {
+        name: ifile.read()
+        for name, ifile in archive.iter_archive(tmp_path / "archive.zip")
+    }
+
+    assert contents.pop("tag.txt") == b"tag content"
+    assert contents == {
+        name: input_file.read_bytes() for name, input_file in input_files.items()
+    }
+
+
+def test_compression_policy(tmp_path):
+    """Test the selection of the files stored without compression."""
+    text_file = tmp_path / "text.txt"
+    text_file.write_bytes(b"a" * 100_000)
+
+    random_file = tmp_path / "random.bin"
+    random_file.write_bytes(os.urandom(100_000))
+
+    policy = archive.CompressionPolicy(
+        store=["data/raw/*"], compress=["*.rpz", "data/raw/*.csv"]
+    )
+
+    # probed files.
+    assert policy.compress(text_file, "text.txt")
+    assert not policy.compress(random_file, "random.bin")
+
+    # already-compressed extensions.
+    assert not policy.compress(text_file, "images/scene.TIF")
+
+    # patterns (the ``compress`` patterns are checked first).
+    assert not policy.compress(text_file, "data/raw/values.txt")
+    assert policy.compress(text_file, "data/raw/values.csv")
+    assert policy.compress(random_file, "compendium.rpz")
+
+    # without the probe, the remaining files are compressed.
+    assert archive.CompressionPolicy(probe=False).compress(random_file, "random.bin")
@@ -0,0 +1,220 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the BagIt exporter."""
+
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import bagit
+import pytest
+
+from storm_workbench.api.stage.exporter import archive
+from storm_workbench.api.stage.exporter.bagit import BagItExporter
+from storm_workbench.api.stage.exporter.checkpoint import Checkpoint
+
+
+class _Interruption(Exception):
+    """Interruption of an export (e.g., the process was killed)."""
+
+
+def _input_dir(tmp_path):
+    """Create a directory with files to be exported."""
+    input_dir = tmp_path / "input"
+
+    for idx in range(20):
+        input_file = input_dir / f"dir{idx % 3}" / f"file{idx:02d}.txt"
+        input_file.parent.mkdir(parents=True, exist_ok=True)
+
+        input_file.write_bytes(os.urandom(500) + b"a" * 500)
+
+    return input_dir
+
+
+def _assert_same_files(output_dir, input_dir):
+    """Check that two directories have the same files."""
+    input_files = sorted(path for path in input_dir.rglob("*") if path.is_file())
+
+    assert sorted(
+        path.relative_to(output_dir) for path in output_dir.rglob("*") if path.is_file()
+    ) == [path.relative_to(input_dir) for path in input_files]
+
+    for input_file in input_files:
+        output_file = output_dir / input_file.relative_to(input_dir)
+        assert output_file.read_bytes() == input_file.read_bytes()
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.zst"])
+def test_bag_round_trip(tmp_path, archive_format):
+    """Test the export and the import of a BagIt."""
+    input_dir = _input_dir(tmp_path)
+
+    exporter = BagItExporter()
+    output_file = exporter.save(
+        input_dir, tmp_path / "bag", archive_format=archive_format
+    )
+
+    assert output_file.name == f"bag.{archive_format}"
+    assert exporter.summary["resumed_files"] == 0
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    exporter.load(output_file, tmp_path / "output")
+
+    _assert_same_files(tmp_path / "output", input_dir)
+
+
+def test_bag_new_output_dir(tmp_path):
+    """Test the export to a directory that doesn't exist yet."""
+    input_dir = _input_dir(tmp_path)
+
+    exporter = BagItExporter()
+    output_file = exporter.save(input_dir, str(tmp_path / "new" / "dir" / "bag"))
+
+    assert output_file == tmp_path / "new" / "dir" / "bag.zip"
+
+    exporter.load(output_file, tmp_path / "output")
+
+    _assert_same_files(tmp_path / "output", input_dir)
+
+
+def test_invalid_bag_import(tmp_path, monkeypatch):
+    """Test that nothing is imported (or overwritten) from an invalid BagIt."""
+    input_dir = _input_dir(tmp_path)
+    output_file = BagItExporter().save(input_dir, tmp_path / "bag")
+
+    # same size, other content: only the checksums detect the modification.
+    invalid_file = tmp_path / "invalid.zip"
+
+    with zipfile.ZipFile(output_file) as zip_file, zipfile.ZipFile(
+        invalid_file, "w"
+    ) as invalid_zip_file:
+        for name in zip_file.namelist():
+            content = zip_file.read(name)
+
+            if name == "data/dir0/file00.txt":
+                content = bytes(255 - byte for byte in content)
+
+            invalid_zip_file.writestr(name, content)
+
+    output_dir = tmp_path / "output"
+    existing_file = output_dir / "dir0" / "file00.txt"
+    existing_file.parent.mkdir(parents=True)
+    existing_file.write_text("existing content")
+
+    with pytest.raises(bagit.BagValidationError):
+        BagItExporter().load(invalid_file, output_dir)
+
+    assert [path for path in output_dir.rglob("*") if path.is_file()] == [
+        existing_file
+    ]
+    assert existing_file.read_text() == "existing content"
+
+    # the files are written straight to the output directory (no extraction directory).
+    def _no_temp_dir(*args, **kwargs):
+        raise AssertionError("temporary directory used in the import")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", _no_temp_dir)
+
+    BagItExporter().load(output_file, output_dir)
+
+    _assert_same_files(output_dir, input_dir)
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.zst"])
+def test_bag_resume(tmp_path, monkeypatch, archive_format):
+    """Test the resume of an interrupted export (from the last valid resume point)."""
+    input_dir = _input_dir(tmp_path)
+    monkeypatch.setattr(archive, "ARCHIVE_CHECKPOINT_SIZE", 3000)
+
+    writer_class = archive.ARCHIVE_WRITERS[archive_format]
+    add_file = writer_class.add_file
+
+    added_files = []
+
+    def _interrupted_add_file(self, *args, **kwargs):
+        added_files.append(args)
+
+        if len(added_files) == 15:
+            raise _Interruption()
+
+        return add_file(self, *args, **kwargs)
+
+    monkeypatch.setattr(writer_class, "add_file", _interrupted_add_file)
+
+    exporter = BagItExporter()
+
+    with pytest.raises(_Interruption):
+        exporter.save(
+            input_dir,
+            tmp_path / "bag",
+            archive_format=archive_format,
+            checkpoint=Checkpoint(tmp_path / "checkpoint"),
+        )
+
+    monkeypatch.setattr(writer_class, "add_file", add_file)
+
+    # the partial archive is kept, but its end was not written (hard kill).
+    partial_file = tmp_path / f".bag.{archive_format}.tmp"
+
+    with partial_file.open("r+b") as ofile:
+        ofile.truncate(partial_file.stat().st_size - 10)
+
+    output_file = exporter.save(
+        input_dir,
+        tmp_path / "bag",
+        archive_format=archive_format,
+        checkpoint=Checkpoint(tmp_path / "checkpoint", resume=True),
+    )
+
+    assert 0 < exporter.summary["resumed_files"] < 14
+    assert not partial_file.exists()
+
+    exporter.load(output_file, tmp_path / "output")
+
+    _assert_same_files(tmp_path / "output", input_dir)
+
+
+@pytest.mark.parametrize("fetch_mode", ["link", "copy"])
+def test_holey_bag(tmp_path, fetch_mode):
+    """Test the import of a BagIt with fetched files."""
+    input_dir = _input_dir(tmp_path)
+
+    fetched_file = tmp_path / "remote" / "fetched.txt"
+    fetched_file.parent.mkdir()
+    fetched_file.write_text("fetched content")
+
+    checksums = {
+        "fetched.txt": {
+            "sha256": hashlib.sha256(fetched_file.read_bytes()).hexdigest()
+        }
+    }
+    fetch = {"fetched.txt": (fetched_file.as_uri(), fetched_file.stat().st_size)}
+
+    exporter = BagItExporter()
+
+    with pytest.raises(ValueError):
+        exporter.save(input_dir, tmp_path / "bag", fetch=fetch)
+
+    output_file = exporter.save(
+        input_dir, tmp_path / "bag", checksums=checksums, fetch=fetch
+    )
+
+    exporter.load(output_file, tmp_path / "output", fetch_mode=fetch_mode)
+
+    assert (tmp_path / "output" / "fetched.txt").read_text() == "fetched content"
+    assert (tmp_path / "output" / "fetched.txt").is_symlink() == (fetch_mode == "link")
+
+    # modified fetched file: the BagIt is invalid and no files are imported.
+    fetched_file.write_text("modified content")
+
+    with pytest.raises(bagit.BagValidationError):
+        exporter.load(output_file, tmp_path / "invalid", fetch_mode=fetch_mode)
+
+    assert not list((tmp_path / "invalid").rglob("*.txt"))
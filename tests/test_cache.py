@@ -0,0 +1,160 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the shared execution cache."""
+
+import hashlib
+import os
+
+from storm_workbench.api.backstage.cache import ExecutionCache
+
+
+def _execution(tmp_path, name: str, content: str):
+    """Create the description and files of an execution with one compendium."""
+    package_file = tmp_path / f"{name}.zip"
+    package_file.write_text(f"package of {name}")
+
+    output_file = tmp_path / f"{name}.txt"
+    output_file.write_text(content)
+
+    package_checksum = hashlib.sha256(package_file.read_bytes()).hexdigest()
+    output_checksum = hashlib.sha256(output_file.read_bytes()).hexdigest()
+
+    compendium = {
+        "name": name,
+        "command": f"python {name}.py",
+        "fingerprint": hashlib.sha256(name.encode("utf-8")).hexdigest(),
+        "inputs": [],
+        "outputs": [
+            {
+                "path": f"outputs/{name}.txt",
+                "algorithm": "sha256",
+                "checksum": output_checksum,
+            }
+        ],
+        "package": {"algorithm": "sha256", "checksum": package_checksum},
+    }
+
+    documents = [{"name": name, "command": compendium["command"]}]
+
+    files = {
+        ("sha256", package_checksum): package_file,
+        ("sha256", output_checksum): output_file,
+    }
+
+    return [compendium], documents, files
+
+
+def _publish(cache, tmp_path, request: str, content: str):
+    """Publish an execution in the cache."""
+    compendia, documents, files = _execution(tmp_path, request, content)
+
+    assert cache.publish(request, tmp_path, compendia, documents, files)
+    return cache.entries(request)[0]
+
+
+def test_publish_and_checkout(tmp_path):
+    """Test the publish of an execution and the checkout of its files."""
+    cache = ExecutionCache(tmp_path / "cache")
+    compendia, documents, files = _execution(tmp_path, "first", "result")
+
+    assert cache.publish("request", tmp_path, compendia, documents, files)
+
+    # already published: only marked as used.
+    assert not cache.publish("request", tmp_path, compendia, documents, files)
+
+    entries = cache.entries("request")
+
+    assert len(entries) == 1
+    assert entries[0]["compendia"] == compendia
+    assert cache.documents(entries[0]) == documents
+    assert cache.entries("other") == []
+
+    # no temporary entries are left.
+    assert [path.name for path in (tmp_path / "cache" / "entries").iterdir()] == [
+        entries[0]["id"]
+    ]
+
+    output = compendia[0]["outputs"][0]
+    target = tmp_path / "workbench" / output["path"]
+
+    assert cache.checkout(
+        entries[0], [(output["algorithm"], output["checksum"], target)]
+    )
+    assert target.read_text() == "result"
+
+
+def test_checkout_unshared_files(tmp_path):
+    """Test that the checked out files (default link mode) don't share the cache content."""
+    cache = ExecutionCache(tmp_path / "cache")
+    entry = _publish(cache, tmp_path, "first", "result")
+
+    output = entry["compendia"][0]["outputs"][0]
+    target = tmp_path / "workbench" / "result.txt"
+
+    assert cache.checkout(
+        entry, [(output["algorithm"], output["checksum"], target)]
+    )
+
+    # modified in place (e.g., by an analyst).
+    with target.open("a") as ofile:
+        ofile.write(" modified")
+
+    other_target = tmp_path / "other" / "result.txt"
+
+    assert cache.checkout(
+        entry, [(output["algorithm"], output["checksum"], other_target)]
+    )
+    assert other_target.read_text() == "result"
+
+
+def test_checkout_removed_entry(tmp_path):
+    """Test that the checkout of a removed entry fails."""
+    cache = ExecutionCache(tmp_path / "cache")
+    entry = _publish(cache, tmp_path, "first", "result")
+
+    cache.remove(entry)
+
+    output = entry["compendia"][0]["outputs"][0]
+
+    assert cache.entries("first") == []
+    assert not cache.checkout(
+        entry, [(output["algorithm"], output["checksum"], tmp_path / "out.txt")]
+    )
+    assert not (tmp_path / "out.txt").exists()
+
+
+def test_evict_least_recently_used(tmp_path):
+    """Test that the least recently used entries (and their objects) are evicted."""
+    cache = ExecutionCache(tmp_path / "cache")
+
+    first = _publish(cache, tmp_path, "first", "first result")
+    second = _publish(cache, tmp_path, "second", "second result")
+
+    # the first entry is used after the second one.
+    manifest_file = tmp_path / "cache" / "entries" / second["id"] / "manifest.json"
+    os.utime(manifest_file, (0, 0))
+
+    cache.touch(first)
+
+    objects = list((tmp_path / "cache" / "objects").glob("*/*/*"))
+    objects_size = sum(object_path.stat().st_size for object_path in objects)
+
+    # room for only one entry.
+    bounded_cache = ExecutionCache(tmp_path / "cache", max_size=objects_size - 1)
+    released = bounded_cache.evict()
+
+    assert cache.entries("second") == []
+    assert len(cache.entries("first")) == 1
+
+    remaining = list((tmp_path / "cache" / "objects").glob("*/*/*"))
+
+    assert len(remaining) == 2
+    assert released == objects_size - sum(
+        object_path.stat().st_size for object_path in remaining
+    )
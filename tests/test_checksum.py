@@ -0,0 +1,116 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the checksum cache."""
+
+import hashlib
+import os
+
+import pytest
+
+from storm_workbench.api.backstage import checksum
+from storm_workbench.api.backstage.checksum import ChecksumCache
+from storm_workbench.api.backstage.database import init_database
+
+
+@pytest.fixture()
+def checksum_cache(tmp_path):
+    """Checksum cache with a temporary database."""
+    init_database(tmp_path / "register")
+
+    return ChecksumCache()
+
+
+@pytest.fixture()
+def hashed_files(monkeypatch):
+    """Files hashed by the checksum cache."""
+    hashed = []
+
+    def _hash_file(path, algorithm):
+        hashed.append(str(path))
+        return hashlib.new(algorithm, open(path, "rb").read()).hexdigest()
+
+    monkeypatch.setattr(checksum, "hash_file", _hash_file)
+
+    return hashed
+
+
+def test_cached_checksum(tmp_path, checksum_cache, hashed_files):
+    """Test that unchanged files are hashed only once."""
+    file = tmp_path / "data.txt"
+    file.write_text("content")
+
+    expected = hashlib.sha256(b"content").hexdigest()
+
+    assert checksum_cache.get(file, "sha256") is None
+    assert checksum_cache.digest(file, "sha256") == expected
+    assert checksum_cache.digest(file, "sha256") == expected
+    assert checksum_cache.get(file, "sha256") == expected
+
+    assert len(hashed_files) == 1
+
+
+def test_modified_file_invalidation(tmp_path, checksum_cache, hashed_files):
+    """Test that modified files (size or modification time) are hashed again."""
+    file = tmp_path / "data.txt"
+    file.write_text("content")
+
+    checksum_cache.digest(file, "sha256")
+
+    # same size, other modification time.
+    file.write_text("CONTENT")
+    os.utime(file, ns=(0, file.stat().st_mtime_ns + 1))
+
+    assert checksum_cache.get(file, "sha256") is None
+    assert checksum_cache.digest(file, "sha256") == (
+        hashlib.sha256(b"CONTENT").hexdigest()
+    )
+
+    assert len(hashed_files) == 2
+
+
+def test_replaced_file_invalidation(tmp_path, checksum_cache, hashed_files):
+    """Test that replaced files (other inode) are hashed again."""
+    file = tmp_path / "data.txt"
+    file.write_text("content")
+
+    checksum_cache.digest(file, "sha256")
+    file_stat = file.stat()
+
+    # replaced by a file with the same size and modification time.
+    replacement = tmp_path / "replacement.txt"
+    replacement.write_text("another")
+    os.utime(replacement, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+    os.replace(replacement, file)
+
+    assert checksum_cache.get(file, "sha256") is None
+    assert checksum_cache.digest(file, "sha256") == (
+        hashlib.sha256(b"another").hexdigest()
+    )
+
+    assert len(hashed_files) == 2
+
+
+def test_digest_many(tmp_path, checksum_cache, hashed_files):
+    """Test that only the files not cached are hashed (in the paths order)."""
+    files = []
+
+    for idx in range(8):
+        files.append(tmp_path / f"data-{idx}.txt")
+        files[-1].write_text(f"content {idx}")
+
+    checksum_cache.digest(files[0], "sha256")
+
+    expected = [hashlib.sha256(file.read_bytes()).hexdigest() for file in files]
+
+    assert checksum_cache.digest_many(files, "sha256", jobs=4) == expected
+    assert sorted(hashed_files) == sorted(str(file) for file in files)
+
+    assert checksum_cache.digest_many(files, "sha256", jobs=4) == expected
+    assert len(hashed_files) == len(files)
@@ -0,0 +1,65 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the on-demand loading of the CLI commands."""
+
+import sys
+
+import click
+from click.testing import CliRunner
+
+from storm_workbench.cli import BASE_CLI_MODULE, COMMAND_MODULES
+from storm_workbench.cli.cli import LazyCommandGroup, workbench_cli
+
+HEAVY_MODULES = ["igraph", "peewee", "storm_core", "storm_workbench.api"]
+"""Modules that must not be imported to show the CLI help."""
+
+
+def _unload(monkeypatch, prefixes):
+    """Remove the imported modules (and submodules) with the given prefixes."""
+    for module in list(sys.modules):
+        if any(
+            module == prefix or module.startswith(f"{prefix}.") for prefix in prefixes
+        ):
+            monkeypatch.delitem(sys.modules, module)
+
+
+def test_help_without_api_import(monkeypatch):
+    """Test that the CLI help is shown without importing the Workbench API."""
+    _unload(monkeypatch, HEAVY_MODULES + [BASE_CLI_MODULE])
+
+    result = CliRunner().invoke(workbench_cli, ["--help"])
+
+    assert result.exit_code == 0
+
+    for command_name in COMMAND_MODULES:
+        assert command_name in result.output
+
+    assert not [module for module in HEAVY_MODULES if module in sys.modules]
+
+
+def test_command_import_on_demand(monkeypatch):
+    """Test that only the requested command module is imported."""
+    _unload(monkeypatch, [BASE_CLI_MODULE])
+
+    @click.group(cls=LazyCommandGroup, command_modules=COMMAND_MODULES)
+    def cli():
+        """CLI with the Workbench commands."""
+
+    with click.Context(cli) as ctx:
+        assert cli.list_commands(ctx) == sorted(COMMAND_MODULES)
+        assert f"{BASE_CLI_MODULE}.index" not in sys.modules
+
+        command = cli.get_command(ctx, "index")
+
+    assert command.name == "index"
+    assert [
+        command_name
+        for command_name, command_module in COMMAND_MODULES.items()
+        if f"{BASE_CLI_MODULE}.{command_module}" in sys.modules
+    ] == ["index"]
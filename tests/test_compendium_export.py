@@ -0,0 +1,124 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the compendia export (full and delta packages)."""
+
+import json
+
+import pytest
+
+from storm_workbench.api.stage.exporter.bagit import BagItExporter
+from storm_workbench.api.stage.exporter.compendium.service import (
+    EXPORT_MANIFEST_FILE, CompendiumExporterService, read_export_manifest)
+
+
+def _export_package(tmp_path, name, manifest, packages):
+    """Create an exported package with an export manifest and compendia packages."""
+    input_dir = tmp_path / name
+
+    for package, content in packages.items():
+        package_file = input_dir / package
+        package_file.parent.mkdir(parents=True, exist_ok=True)
+
+        package_file.write_text(content)
+
+    (input_dir / EXPORT_MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    return BagItExporter().save(input_dir, tmp_path / f"{name}-package")
+
+
+@pytest.fixture()
+def exported_packages(tmp_path):
+    """Full export and a delta export based on it."""
+    full_package = _export_package(
+        tmp_path,
+        "full",
+        {"id": "full", "base": None, "removed": {}},
+        {
+            "compendia/first.zip": "first compendium",
+            "compendia/second.zip": "second compendium",
+        },
+    )
+
+    delta_package = _export_package(
+        tmp_path,
+        "delta",
+        {"id": "delta", "base": "full", "removed": {"second": "compendia/second.zip"}},
+        {"compendia/first.zip": "first compendium (updated)"},
+    )
+
+    return full_package, delta_package
+
+
+def test_read_export_manifest(tmp_path, exported_packages):
+    """Test the reading of the export manifest (from the package or the file)."""
+    full_package, delta_package = exported_packages
+
+    assert read_export_manifest(full_package)["id"] == "full"
+    assert read_export_manifest(delta_package)["base"] == "full"
+    assert read_export_manifest(tmp_path / "full" / EXPORT_MANIFEST_FILE) == {
+        "id": "full",
+        "base": None,
+        "removed": {},
+    }
+
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "file.txt").write_text("content")
+
+    other_package = BagItExporter().save(tmp_path / "other", tmp_path / "other")
+
+    with pytest.raises(ValueError):
+        read_export_manifest(other_package)
+
+
+def test_delta_import(tmp_path, exported_packages):
+    """Test the import of a delta package on its base export."""
+    full_package, delta_package = exported_packages
+    output_dir = tmp_path / "output"
+
+    service = CompendiumExporterService()
+
+    service.load(full_package, output_dir)
+
+    assert (output_dir / "compendia" / "second.zip").read_text() == (
+        "second compendium"
+    )
+
+    service.load(delta_package, output_dir)
+
+    assert read_export_manifest(output_dir / EXPORT_MANIFEST_FILE)["id"] == "delta"
+    assert (output_dir / "compendia" / "first.zip").read_text() == (
+        "first compendium (updated)"
+    )
+    assert not (output_dir / "compendia" / "second.zip").exists()
+    assert not (output_dir / ".import").exists()
+
+
+def test_delta_import_without_base(tmp_path, exported_packages):
+    """Test that a delta package is not imported without its base export."""
+    full_package, delta_package = exported_packages
+    output_dir = tmp_path / "output"
+
+    service = CompendiumExporterService()
+
+    with pytest.raises(RuntimeError):
+        service.load(delta_package, output_dir)
+
+    assert not (output_dir / EXPORT_MANIFEST_FILE).exists()
+    assert not (output_dir / "compendia").exists()
+    assert not (output_dir / ".import").exists()
+
+    # delta package already applied (the current export is not its base).
+    service.load(full_package, output_dir)
+    service.load(delta_package, output_dir)
+
+    with pytest.raises(RuntimeError):
+        service.load(delta_package, output_dir)
+
+    assert read_export_manifest(output_dir / EXPORT_MANIFEST_FILE)["id"] == "delta"
+    assert (output_dir / "compendia" / "first.zip").exists()
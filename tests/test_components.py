@@ -0,0 +1,53 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the lazily created Workbench components."""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from storm_workbench.exceptions import ConfigurationError
+from storm_workbench.persistence import GraphStorage
+from storm_workbench.workbench.components import WorkbenchComponents
+
+
+def _config(executor):
+    """Workbench configuration with the given executor."""
+    storm = SimpleNamespace(executor={"type": executor}, basepath=".")
+    tool = SimpleNamespace(storm=storm)
+
+    return SimpleNamespace(definitions=SimpleNamespace(tool=tool))
+
+
+def test_lazy_components(tmp_path, monkeypatch):
+    """Test that the database is created without loading the reproducible session."""
+    monkeypatch.delitem(sys.modules, "storm_workbench.workbench.session", raising=False)
+
+    components = WorkbenchComponents(tmp_path, _config("paradag.parallel"))
+
+    assert not (tmp_path / "register").exists()
+
+    components.database
+
+    assert (tmp_path / "register" / "register.db").exists()
+    assert isinstance(components.graph_storage, GraphStorage)
+
+    # the session module (and the Storm Core) is imported only by the session.
+    assert "storm_workbench.workbench.session" not in sys.modules
+
+
+def test_unknown_executor(tmp_path):
+    """Test that an executor that is not installed is reported."""
+    pytest.importorskip("storm_core")
+
+    components = WorkbenchComponents(tmp_path, _config("unknown.executor"))
+
+    with pytest.raises(ConfigurationError, match="unknown.executor"):
+        components.session
@@ -0,0 +1,171 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the database service."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from igraph import Graph
+
+from storm_workbench.api.backstage.database import init_database, model
+from storm_workbench.api.backstage.lookup import IndexLookupTable
+from storm_workbench.api.backstage.session import SessionService
+from storm_workbench.api.stage.database.service import DatabaseService
+from storm_workbench.exceptions import ExecutionCompendiumNotFound
+
+
+class _Index:
+    """Graph index with the indexed compendia and their status."""
+
+    def __init__(self, names):
+        """Initializer."""
+        self.graph_manager = SimpleNamespace(graph=Graph(directed=True))
+        self.graph_manager.graph.add_vertices(len(names))
+        self.graph_manager.graph.vs["name"] = names
+
+        self.search = SimpleNamespace(query=self)
+        self.status = {name: "updated" for name in names}
+
+    def query(self):
+        """Query all indexed compendia."""
+        return [
+            (SimpleNamespace(name=name, compendium_package=None), status)
+            for name, status in self.status.items()
+        ]
+
+
+@pytest.fixture()
+def names():
+    """Names of the indexed compendia."""
+    return [str(uuid.uuid4()) for _ in range(3)]
+
+
+@pytest.fixture()
+def index(names):
+    """In-memory graph index."""
+    return _Index(names)
+
+
+@pytest.fixture()
+def backstage(tmp_path, index):
+    """Backstage with a temporary database and an in-memory index."""
+    init_database(tmp_path / "register")
+
+    session = SimpleNamespace(index=index)
+
+    return SimpleNamespace(
+        database=None,
+        session=SessionService(tmp_path, session, graph_storage=object()),
+        execution=SimpleNamespace(lookup=IndexLookupTable(session)),
+    )
+
+
+def _records():
+    """Status of the database records."""
+    return {
+        str(record.uuid): record.status
+        for record in model.ExecutionCompendiumModel.select()
+    }
+
+
+def test_synchronize(backstage, index, names):
+    """Test that the records are updated/removed only when the index is modified."""
+    database_service = DatabaseService(backstage=backstage)
+
+    removed_name = str(uuid.uuid4())
+
+    for name in names + [removed_name]:
+        model.ExecutionCompendiumModel.create(
+            uuid=name, command="python", status="updated"
+        )
+
+    database_service.synchronize()
+
+    assert _records() == {name: "updated" for name in names}
+
+    # modified index, but the generation is unchanged: the records are not checked.
+    index.status[names[0]] = "outdated"
+
+    database_service.synchronize()
+    assert _records()[names[0]] == "updated"
+
+    backstage.session.bump_generation()
+    database_service.synchronize()
+
+    assert _records() == {
+        names[0]: "outdated",
+        names[1]: "updated",
+        names[2]: "updated",
+    }
+
+
+def test_full_synchronize(backstage, names):
+    """Test that a full synchronization checks the records of an unchanged index."""
+    database_service = DatabaseService(backstage=backstage)
+
+    model.ExecutionCompendiumModel.create(
+        uuid=names[0], command="python", status="updated"
+    )
+    database_service.synchronize()
+
+    # inconsistent database (e.g., modified outside the Workbench).
+    model.ExecutionCompendiumModel.update(status="outdated").execute()
+
+    database_service.synchronize()
+    assert _records() == {names[0]: "outdated"}
+
+    database_service.synchronize(full=True)
+    assert _records() == {names[0]: "updated"}
+
+
+def test_upsert_records(backstage, index, names):
+    """Test that existing records keep the attributes not defined in the upsert."""
+    database_service = DatabaseService(backstage=backstage)
+
+    created = database_service.upsert_records(
+        [
+            model.ExecutionCompendiumModel(
+                uuid=name, name=f"execution-{idx}", command="python"
+            )
+            for idx, name in enumerate(names[:2])
+        ]
+    )
+    assert [str(record.uuid) for record in created] == names[:2]
+
+    index.status[names[0]] = "outdated"
+    backstage.session.bump_generation()
+
+    upserted = database_service.upsert_records(
+        [
+            model.ExecutionCompendiumModel(uuid=names[2], name="new", command="R"),
+            model.ExecutionCompendiumModel(
+                uuid=names[0], name=None, description="rerun", command="python"
+            ),
+        ]
+    )
+
+    assert [str(record.uuid) for record in upserted] == [names[2], names[0]]
+    assert upserted[1].name == "execution-0"
+    assert upserted[1].description == "rerun"
+    assert upserted[1].status == "outdated"
+
+    assert model.ExecutionCompendiumModel.select().count() == 3
+
+
+def test_upsert_not_indexed_record(backstage):
+    """Test that compendia missing from the index are not written."""
+    database_service = DatabaseService(backstage=backstage)
+
+    with pytest.raises(ExecutionCompendiumNotFound):
+        database_service.upsert_records(
+            [model.ExecutionCompendiumModel(uuid=str(uuid.uuid4()), command="python")]
+        )
+
+    assert model.ExecutionCompendiumModel.select().count() == 0
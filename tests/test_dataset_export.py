@@ -0,0 +1,159 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the dataset export."""
+
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from storm_workbench.api.backstage.checksum import ChecksumCache
+from storm_workbench.api.backstage.database import init_database
+from storm_workbench.api.stage.exporter import archive
+from storm_workbench.api.stage.exporter.bagit import BagItExporter
+from storm_workbench.api.stage.exporter.dataset import service
+
+
+class _Definitions(dict):
+    """Configuration section (keys also available as attributes)."""
+
+    def __getattr__(self, name):
+        """Get a configuration key."""
+        return self.get(name)
+
+
+def _config(**dataset_definitions):
+    """Workbench configuration with the given dataset export definitions."""
+    exporter = _Definitions(jobs=2, dataset=dataset_definitions)
+    storm = _Definitions(name="workbench", exporter=exporter)
+
+    return SimpleNamespace(definitions=_Definitions(tool=_Definitions(storm=storm)))
+
+
+def _compendium(*files):
+    """Compendium using the given input files (all of them unpacked)."""
+    inputs = [
+        {
+            "key": str(file),
+            "algorithm": "sha256",
+            "checksum": hashlib.sha256(file.read_bytes()).hexdigest(),
+        }
+        for file in files
+    ]
+
+    return SimpleNamespace(
+        inputs=inputs,
+        metadata={
+            "others": {"unpacked_files": {"datasources": [str(file) for file in files]}}
+        },
+    )
+
+
+@pytest.fixture()
+def backstage(tmp_path):
+    """Backstage with a checksum cache."""
+    init_database(tmp_path / "register")
+
+    return SimpleNamespace(checksums=ChecksumCache(), storage=tmp_path / "storage")
+
+
+@pytest.fixture()
+def input_files(tmp_path):
+    """Input files (two of them with the same content)."""
+    input_files = {
+        "first.csv": b"shared content",
+        "copy/second.csv": b"shared content",
+        "third.csv": b"other content",
+    }
+
+    for name, content in input_files.items():
+        (tmp_path / "data" / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "data" / name).write_bytes(content)
+
+    return {name: tmp_path / "data" / name for name in input_files}
+
+
+def test_dataset_deduplication(tmp_path, backstage, input_files):
+    """Test that files with the same checksum are packed once."""
+    exporter_service = service.DatasetExporterService(_config(mode="copy"), backstage)
+
+    compendia = [
+        (_compendium(input_files["first.csv"], input_files["third.csv"]), "updated"),
+        (_compendium(input_files["copy/second.csv"]), "updated"),
+    ]
+
+    output_file = exporter_service.save(
+        compendia, tmp_path / "output", tmp_path / "temp"
+    )
+
+    BagItExporter().load(output_file, tmp_path / "imported")
+
+    packed_files = sorted(
+        path.read_bytes()
+        for path in (tmp_path / "imported" / "files").rglob("*")
+        if path.is_file()
+    )
+    assert packed_files == [b"other content", b"shared content"]
+
+    files_description = json.loads(
+        (tmp_path / "imported" / "datapackage.json").read_text()
+    )
+    files_target = {
+        file["source"]: file["target"] for file in files_description["files"]
+    }
+
+    assert sorted(files_target) == ["first.csv", "second.csv", "third.csv"]
+    assert files_target["first.csv"] == files_target["second.csv"]
+    assert files_target["first.csv"] != files_target["third.csv"]
+
+
+def test_file_url(tmp_path):
+    """Test the URLs of the referenced files."""
+    base_url = "https://data.example.org/share/"
+
+    assert service._file_url(tmp_path / "data" / "a b.csv", tmp_path, base_url) == (
+        "https://data.example.org/share/data/a%20b.csv"
+    )
+    assert service._file_url(tmp_path / "a.csv", tmp_path / "data", base_url) == (
+        (tmp_path / "a.csv").as_uri()
+    )
+    assert service._file_url(tmp_path / "a.csv") == (tmp_path / "a.csv").as_uri()
+
+
+def test_dataset_fetch(tmp_path, backstage, input_files):
+    """Test that the files are referenced in the ``fetch.txt`` instead of packed."""
+    exporter_service = service.DatasetExporterService(_config(mode="fetch"), backstage)
+
+    compendia = [
+        (_compendium(input_files["first.csv"], input_files["third.csv"]), "updated"),
+        (_compendium(input_files["copy/second.csv"]), "updated"),
+    ]
+
+    output_file = exporter_service.save(
+        compendia, tmp_path / "output", tmp_path / "temp"
+    )
+
+    archived_files = {
+        name: ifile.read() for name, ifile in archive.iter_archive(output_file)
+    }
+    fetch_entries = archived_files["fetch.txt"].decode().splitlines()
+
+    assert not [name for name in archived_files if name.startswith("data/files")]
+    assert len(fetch_entries) == 2
+    assert input_files["third.csv"].as_uri() in archived_files["fetch.txt"].decode()
+
+    BagItExporter().load(output_file, tmp_path / "imported", fetch_mode="copy")
+
+    packed_files = sorted(
+        path.read_bytes()
+        for path in (tmp_path / "imported" / "files").rglob("*")
+        if path.is_file()
+    )
+    assert packed_files == [b"other content", b"shared content"]
@@ -0,0 +1,113 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the entry point resolution and its cache."""
+
+import json
+from importlib import metadata
+
+from storm_workbench import entry_point
+from storm_workbench.entry_point import EntryPointCache, find_entry_point
+
+ENTRY_POINT_GROUP = "storm_workbench.tests"
+"""Entry point group used in the tests."""
+
+
+def _registered_entry_points(monkeypatch, entry_points):
+    """Register the entry points of the test group."""
+    listed_groups = []
+
+    def _iter_entry_points(entry_point_group):
+        listed_groups.append(entry_point_group)
+        return entry_points
+
+    monkeypatch.setattr(entry_point, "_iter_entry_points", _iter_entry_points)
+
+    return listed_groups
+
+
+def test_cache_invalidation(tmp_path, monkeypatch):
+    """Test that the cache is discarded when the installed distributions change."""
+    cache_file = tmp_path / "cache" / "entry_points.json"
+
+    cache = EntryPointCache(cache_file)
+    cache.set(ENTRY_POINT_GROUP, "decoder", "json:JSONDecoder")
+
+    assert EntryPointCache(cache_file).get(ENTRY_POINT_GROUP, "decoder") == (
+        "json:JSONDecoder"
+    )
+
+    monkeypatch.setattr(
+        entry_point, "installed_distributions_fingerprint", lambda: "other"
+    )
+
+    assert EntryPointCache(cache_file).get(ENTRY_POINT_GROUP, "decoder") is None
+
+
+def test_invalid_cache_file(tmp_path):
+    """Test that an invalid cache file is discarded."""
+    cache_file = tmp_path / "entry_points.json"
+    cache_file.write_text("{invalid")
+
+    assert EntryPointCache(cache_file).get(ENTRY_POINT_GROUP, "decoder") is None
+
+    cache_file.write_text(json.dumps(["decoder"]))
+
+    assert EntryPointCache(cache_file).get(ENTRY_POINT_GROUP, "decoder") is None
+
+
+def test_find_cached_entry_point(tmp_path, monkeypatch):
+    """Test that the cached entry point is loaded without listing the group."""
+    listed_groups = _registered_entry_points(
+        monkeypatch,
+        [
+            metadata.EntryPoint(
+                name="encoder", value="json:JSONEncoder", group=ENTRY_POINT_GROUP
+            ),
+            metadata.EntryPoint(
+                name="decoder", value="json:JSONDecoder", group=ENTRY_POINT_GROUP
+            ),
+        ],
+    )
+
+    cache = EntryPointCache(tmp_path / "entry_points.json")
+
+    assert find_entry_point(ENTRY_POINT_GROUP, "decoder", cache=cache) is (
+        json.JSONDecoder
+    )
+    assert len(listed_groups) == 1
+
+    cache = EntryPointCache(tmp_path / "entry_points.json")
+
+    assert cache.get(ENTRY_POINT_GROUP, "decoder") == "json:JSONDecoder"
+    assert find_entry_point(ENTRY_POINT_GROUP, "decoder", cache=cache) is (
+        json.JSONDecoder
+    )
+    assert len(listed_groups) == 1
+
+
+def test_find_stale_entry_point(tmp_path, monkeypatch):
+    """Test that a cached entry point that can't be loaded is resolved again."""
+    _registered_entry_points(
+        monkeypatch,
+        [
+            metadata.EntryPoint(
+                name="decoder", value="json:JSONDecoder", group=ENTRY_POINT_GROUP
+            )
+        ],
+    )
+
+    cache = EntryPointCache(tmp_path / "entry_points.json")
+    cache.set(ENTRY_POINT_GROUP, "decoder", "json:RemovedDecoder")
+
+    assert find_entry_point(ENTRY_POINT_GROUP, "decoder", cache=cache) is (
+        json.JSONDecoder
+    )
+    assert cache.get(ENTRY_POINT_GROUP, "decoder") == "json:JSONDecoder"
+
+    assert find_entry_point(ENTRY_POINT_GROUP, "encoder", cache=cache) is None
@@ -0,0 +1,146 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the execution fingerprints."""
+
+import hashlib
+
+import pytest
+
+from storm_workbench.api.backstage import fingerprint
+from storm_workbench.api.backstage.checksum import ChecksumCache
+from storm_workbench.api.backstage.database import init_database
+
+
+def _file_description(path):
+    """Description of a file recorded in a compendium."""
+    return {
+        "key": str(path),
+        "algorithm": "sha256",
+        "checksum": hashlib.sha256(path.read_bytes()).hexdigest(),
+    }
+
+
+@pytest.fixture()
+def working_directory(tmp_path):
+    """Working directory with an input and an output file."""
+    working_directory = tmp_path / "workbench"
+    (working_directory / "data").mkdir(parents=True)
+
+    (working_directory / "data" / "input.csv").write_text("input")
+    (working_directory / "data" / "output.csv").write_text("output")
+
+    return working_directory
+
+
+@pytest.fixture()
+def compendium(working_directory):
+    """Compendium description of an execution in the working directory."""
+    return {
+        "command": "python process.py",
+        "inputs": [_file_description(working_directory / "data" / "input.csv")],
+        "outputs": [_file_description(working_directory / "data" / "output.csv")],
+    }
+
+
+@pytest.fixture()
+def memo(tmp_path, working_directory):
+    """Execution memo of the working directory."""
+    init_database(tmp_path / "register")
+
+    return fingerprint.ExecutionMemo(
+        ChecksumCache(), working_directory, {"LANG": "C"}, {"type": "paradag"}, jobs=2
+    )
+
+
+def test_unchanged_execution(memo, compendium):
+    """Test that the fingerprint of an unchanged execution is reused."""
+    assert memo.files(compendium, "inputs")[0][0] == "data/input.csv"
+    assert memo.current_fingerprint(compendium) == memo.fingerprint(compendium)
+
+
+def test_changed_execution(working_directory, memo, compendium):
+    """Test that modified inputs and outputs invalidate the execution."""
+    recorded_fingerprint = memo.fingerprint(compendium)
+
+    (working_directory / "data" / "output.csv").write_text("modified output")
+
+    assert memo.current_fingerprint(compendium) is None
+    assert memo.current_fingerprint(compendium, check_outputs=False) == (
+        recorded_fingerprint
+    )
+
+    (working_directory / "data" / "input.csv").write_text("modified input")
+
+    assert memo.current_fingerprint(compendium, check_outputs=False) not in (
+        None,
+        recorded_fingerprint,
+    )
+
+    (working_directory / "data" / "input.csv").unlink()
+
+    assert memo.current_fingerprint(compendium, check_outputs=False) is None
+
+
+def test_provided_inputs(working_directory, memo, compendium):
+    """Test that the inputs provided by other compendia are not read."""
+    recorded_fingerprint = memo.fingerprint(compendium)
+    input_checksum = compendium["inputs"][0]["checksum"]
+
+    (working_directory / "data" / "input.csv").unlink()
+
+    assert memo.current_fingerprint(
+        compendium, provided={"data/input.csv": input_checksum}
+    ) == recorded_fingerprint
+
+
+def test_relocated_workbench(tmp_path, working_directory, memo, compendium):
+    """Test that the fingerprint doesn't depend on the working directory path."""
+    relocated_directory = tmp_path / "relocated"
+    working_directory.rename(relocated_directory)
+
+    relocated_memo = fingerprint.ExecutionMemo(
+        ChecksumCache(), relocated_directory, {"LANG": "C"}, {"type": "paradag"}
+    )
+    relocated_compendium = {
+        "command": compendium["command"],
+        "inputs": [_file_description(relocated_directory / "data" / "input.csv")],
+    }
+
+    assert relocated_memo.fingerprint(relocated_compendium) == memo.fingerprint(
+        compendium
+    )
+
+
+def test_fingerprint_definitions(memo, compendium):
+    """Test that the environment and the executor are part of the fingerprint."""
+    inputs = memo.files(compendium, "inputs")
+    executor = {"type": "paradag"}
+
+    assert fingerprint.execution_fingerprint(
+        "python process.py", inputs, {"LANG": "C"}, executor
+    ) == memo.fingerprint(compendium)
+
+    assert fingerprint.execution_fingerprint(
+        "python process.py", inputs, {"LANG": "pt_BR"}, executor
+    ) != memo.fingerprint(compendium)
+
+    assert fingerprint.execution_fingerprint(
+        "python process.py", inputs, {"LANG": "C"}, {"type": "paradag.parallel"}
+    ) != memo.fingerprint(compendium)
+
+
+def test_execution_environment(monkeypatch):
+    """Test that the ignored and volatile variables are not fingerprinted."""
+    monkeypatch.setenv("STORM_DATA", "data")
+    monkeypatch.setenv("STORM_TOKEN", "secret")
+    monkeypatch.setenv("SHLVL", "2")
+
+    environment = fingerprint.execution_environment(["*_TOKEN"], ["STORM_*", "SHLVL"])
+
+    assert environment == {"STORM_DATA": "data"}
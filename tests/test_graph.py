@@ -0,0 +1,61 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the ancestor subgraphs of the graph index."""
+
+import pytest
+from igraph import Graph
+
+from storm_workbench.api.backstage import graph as graph_index
+from storm_workbench.exceptions import ExecutionCompendiumNotFound
+
+
+@pytest.fixture()
+def graph():
+    """Graph index (``a1 -> b1 -> c1``, ``a2 -> c1`` and ``a2 -> d1``)."""
+    graph = Graph(directed=True)
+
+    graph.add_vertices(["a1", "a2", "b1", "c1", "d1"])
+    graph.add_edges([("a1", "b1"), ("b1", "c1"), ("a2", "c1"), ("a2", "d1")])
+    graph.vs["command"] = ["a", "a", "b", "c", "d"]
+
+    return graph
+
+
+def test_find_vertex(graph):
+    """Test the vertex search by name and by unique prefix."""
+    assert graph_index.find_vertex(graph, "c1") == 3
+    assert graph_index.find_vertex(graph, "d") == 4
+
+    with pytest.raises(ValueError, match="a1, a2"):
+        graph_index.find_vertex(graph, "a")
+
+    with pytest.raises(ExecutionCompendiumNotFound):
+        graph_index.find_vertex(graph, "e1")
+
+    with pytest.raises(ExecutionCompendiumNotFound):
+        graph_index.find_vertex(Graph(directed=True), "a1")
+
+
+def test_ancestors(graph):
+    """Test that the named vertices and their ancestors are selected."""
+    assert graph_index.ancestors(graph, ["b1"]) == [0, 2]
+    assert graph_index.ancestors(graph, ["c1"]) == [0, 1, 2, 3]
+    assert graph_index.ancestors(graph, ["b1", "d1"]) == [0, 1, 2, 4]
+
+
+def test_ancestors_subgraph(graph):
+    """Test that the subgraph keeps the vertices and edges attributes."""
+    subgraph = graph_index.ancestors_subgraph(graph, ["c1"])
+
+    assert subgraph.vs["name"] == ["a1", "a2", "b1", "c1"]
+    assert subgraph.vs["command"] == ["a", "a", "b", "c"]
+    assert sorted(
+        (subgraph.vs[edge.source]["name"], subgraph.vs[edge.target]["name"])
+        for edge in subgraph.es
+    ) == [("a1", "b1"), ("a2", "c1"), ("b1", "c1")]
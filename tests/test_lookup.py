@@ -0,0 +1,86 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the index lookup table."""
+
+from types import SimpleNamespace
+
+from igraph import Graph
+
+from storm_workbench import constants
+from storm_workbench.api.backstage.lookup import IndexLookupTable
+
+
+class _IndexQuery:
+    """Index search with the indexed compendia and their status."""
+
+    def __init__(self):
+        """Initializer."""
+        self.records = []
+        self.queries = 0
+
+    def query(self):
+        """Query all indexed compendia."""
+        self.queries += 1
+        return list(self.records)
+
+
+def _session(names):
+    """Create a session whose index has the given compendia."""
+    graph = Graph(directed=True)
+    graph.add_vertices(len(names))
+    graph.vs["name"] = names
+
+    index_query = _IndexQuery()
+    index_query.records = [
+        (SimpleNamespace(name=name, compendium_package=None), "updated")
+        for name in names
+    ]
+
+    return SimpleNamespace(
+        index=SimpleNamespace(
+            graph_manager=SimpleNamespace(graph=graph),
+            search=SimpleNamespace(query=index_query),
+        )
+    )
+
+
+def test_lookup_entries():
+    """Test the lookup of the indexed compendia."""
+    session = _session(["a", "b", "c"])
+    index_lookup = IndexLookupTable(session)
+
+    assert index_lookup.vertex("b") == 1
+    assert index_lookup.status("c") == "updated"
+    assert index_lookup.compendium("a").name == "a"
+    assert index_lookup.get("d") is None
+    assert index_lookup.packages() == {}
+
+
+def test_lookup_invalidation():
+    """Test that the table is rebuilt only when the index generation changes."""
+    session = _session(["a", "b"])
+    index_query = session.index.search.query
+    graph = session.index.graph_manager.graph
+
+    index_lookup = IndexLookupTable(session)
+
+    assert index_lookup.status("a") == "updated"
+    assert index_lookup.status("b") == "updated"
+    assert index_query.queries == 1
+
+    # modified index, but the generation is unchanged: the table is not rebuilt.
+    index_query.records[0] = (index_query.records[0][0], "outdated")
+
+    assert index_lookup.status("a") == "updated"
+    assert index_query.queries == 1
+
+    graph[constants.INDEX_GENERATION_ATTRIBUTE] = 1
+
+    assert index_lookup.status("a") == "outdated"
+    assert index_query.queries == 2
@@ -0,0 +1,204 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the graph index persistence."""
+
+from igraph import Graph
+
+from storm_workbench.persistence import (ColumnarGraphFile, GraphStorage,
+                                         load_graph, save_graph)
+
+
+def _graph_index() -> Graph:
+    """Create a graph index with attributes of all supported types."""
+    graph = Graph(directed=True)
+    graph.add_vertices(3)
+
+    graph.vs["name"] = ["a", "b", "ç"]
+    graph.vs["status"] = ["updated", "outdated", "updated"]
+    graph.vs["size"] = [1, -(2 ** 40), 3]
+    graph.vs["duration"] = [0.5, 1.25, 2.0]
+    graph.vs["cached"] = [True, False, True]
+    graph.vs["metadata"] = [{"inputs": ["x"]}, None, {"outputs": [1, 2]}]
+
+    graph.add_edges([(0, 1), (1, 2)])
+    graph.es["label"] = ["first", "second"]
+
+    graph["workbench_generation"] = 7
+
+    return graph
+
+
+def _assert_same_graph(graph: Graph, expected: Graph):
+    """Check that two graphs have the same structure and attributes."""
+    assert graph.is_directed() == expected.is_directed()
+    assert graph.get_edgelist() == expected.get_edgelist()
+    assert sorted(graph.attributes()) == sorted(expected.attributes())
+
+    for attribute in expected.attributes():
+        assert graph[attribute] == expected[attribute]
+
+    assert sorted(graph.vertex_attributes()) == sorted(expected.vertex_attributes())
+
+    for attribute in expected.vertex_attributes():
+        assert graph.vs[attribute] == expected.vs[attribute]
+
+        assert [type(value) for value in graph.vs[attribute]] == [
+            type(value) for value in expected.vs[attribute]
+        ]
+
+    for attribute in expected.edge_attributes():
+        assert graph.es[attribute] == expected.es[attribute]
+
+
+def test_columnar_round_trip(tmp_path):
+    """Test the columnar graph file round trip (with typed scalar columns)."""
+    graph = _graph_index()
+    save_graph(graph, tmp_path / "meta")
+
+    with ColumnarGraphFile(tmp_path / "meta") as graph_file:
+        assert graph_file.vertex_count == 3
+        assert graph_file.edge_count == 2
+
+        assert graph_file.vertex_column("name").encoding == "str"
+        assert graph_file.vertex_column("size").encoding == "int64"
+        assert graph_file.vertex_column("duration").encoding == "float64"
+        assert graph_file.vertex_column("cached").encoding == "bool"
+        assert graph_file.vertex_column("metadata").encoding == "pickle-list"
+
+        _assert_same_graph(graph_file.to_graph(), graph)
+
+    _assert_same_graph(load_graph(tmp_path / "meta"), graph)
+
+
+def test_columnar_partial_decoding(tmp_path):
+    """Test the decoding of only some vertex attributes."""
+    graph = _graph_index()
+    save_graph(graph, tmp_path / "meta")
+
+    with ColumnarGraphFile(tmp_path / "meta") as graph_file:
+        assert graph_file.vertex_column("name")[2] == "ç"
+        assert graph_file.vertex_column("size")[-2] == -(2 ** 40)
+
+        partial_graph = graph_file.to_graph(vertex_attributes=["name", "status"])
+
+    assert sorted(partial_graph.vertex_attributes()) == ["name", "status"]
+    assert partial_graph.vs["name"] == ["a", "b", "ç"]
+    assert partial_graph.get_edgelist() == graph.get_edgelist()
+
+
+def _journal_size(tmp_path) -> int:
+    """Size of the journal of the graph index stored in ``tmp_path``."""
+    return (tmp_path / "meta.journal").stat().st_size
+
+
+def test_journal_replay(tmp_path):
+    """Test the replay of the journaled mutations (the snapshot is not rewritten)."""
+    GraphStorage(tmp_path / "meta").save(_graph_index())
+    snapshot = (tmp_path / "meta").read_bytes()
+
+    storage = GraphStorage(tmp_path / "meta")
+    graph = storage.load()
+
+    graph.vs[1]["status"] = "updated"
+    graph.add_vertex(name="d", status="outdated", metadata={"inputs": ["z"]})
+    graph.add_edge("ç", "d", label="third")
+    graph.delete_vertices([0])
+    graph["workbench_generation"] = 8
+
+    storage.save(graph)
+
+    assert (tmp_path / "meta").read_bytes() == snapshot
+    _assert_same_graph(GraphStorage(tmp_path / "meta").load(), graph)
+
+
+def test_journal_tracked_modifications(tmp_path):
+    """Test that only the tracked modifications are journaled."""
+    GraphStorage(tmp_path / "meta").save(_graph_index())
+
+    storage = GraphStorage(tmp_path / "meta")
+    graph = storage.load()
+
+    # unchanged generation and no modified vertices: nothing is written.
+    journal_size = _journal_size(tmp_path)
+    storage.save(graph)
+
+    assert _journal_size(tmp_path) == journal_size
+
+    # marked vertices are written (even without a new generation).
+    graph.vs[0]["duration"] = 9.5
+    storage.mark_modified(["a"])
+    storage.save(graph)
+
+    assert _journal_size(tmp_path) > journal_size
+    assert GraphStorage(tmp_path / "meta").load().vs[0]["duration"] == 9.5
+
+
+def test_journal_attribute_changes(tmp_path):
+    """Test that any vertex attribute change is journaled with a new generation."""
+    GraphStorage(tmp_path / "meta").save(_graph_index())
+    snapshot = (tmp_path / "meta").read_bytes()
+
+    storage = GraphStorage(tmp_path / "meta")
+    graph = storage.load()
+
+    graph.vs[0]["metadata"] = {"inputs": ["x", "y"]}
+    graph.vs[2]["size"] = 4
+    graph["workbench_generation"] = 8
+
+    storage.save(graph)
+
+    assert (tmp_path / "meta").read_bytes() == snapshot
+
+    loaded_graph = GraphStorage(tmp_path / "meta").load()
+
+    assert loaded_graph.vs["metadata"][0] == {"inputs": ["x", "y"]}
+    assert loaded_graph.vs["size"] == [1, -(2 ** 40), 4]
+
+    # new vertex attributes are written in a new snapshot.
+    graph.vs["environment_package"] = ["a.zip", "b.zip", "c.zip"]
+    graph["workbench_generation"] = 9
+
+    storage.save(graph)
+
+    assert (tmp_path / "meta").read_bytes() != snapshot
+    _assert_same_graph(GraphStorage(tmp_path / "meta").load(), graph)
+
+
+def test_journal_crash_recovery(tmp_path):
+    """Test that a partial journal record (interrupted save) is discarded."""
+    GraphStorage(tmp_path / "meta").save(_graph_index())
+
+    storage = GraphStorage(tmp_path / "meta")
+    graph = storage.load()
+
+    graph.vs[1]["status"] = "updated"
+    graph["workbench_generation"] = 8
+    storage.save(graph)
+
+    expected = GraphStorage(tmp_path / "meta").load()
+
+    # interrupted save: the last record is truncated.
+    graph.vs[2]["status"] = "outdated"
+    graph["workbench_generation"] = 9
+    storage.save(graph)
+
+    with (tmp_path / "meta.journal").open("r+b") as journal_file:
+        journal_file.truncate(_journal_size(tmp_path) - 3)
+
+    storage = GraphStorage(tmp_path / "meta")
+    graph = storage.load()
+
+    _assert_same_graph(graph, expected)
+
+    # the next save replaces the partial record.
+    graph.vs[0]["status"] = "outdated"
+    graph["workbench_generation"] = 10
+    storage.save(graph)
+
+    _assert_same_graph(GraphStorage(tmp_path / "meta").load(), graph)
@@ -0,0 +1,77 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the execution schedule."""
+
+from igraph import Graph
+
+from storm_workbench.api.backstage.schedule import execution_schedule
+
+
+def _graph_index() -> Graph:
+    """Create a graph index (0 -> 1 -> 3, 0 -> 2 -> 3 and the independent 4)."""
+    graph = Graph(directed=True)
+    graph.add_vertices(5)
+    graph.add_edges([(0, 1), (0, 2), (1, 3), (2, 3)])
+
+    return graph
+
+
+def test_sequential_schedule():
+    """Test the schedule with a single worker."""
+    durations = {0: 1.0, 1: 4.0, 2: 2.0, 3: 1.0, 4: 3.0}
+    schedule = execution_schedule(_graph_index(), range(5), durations)
+
+    assert schedule["parallelism"] == 1
+    assert schedule["sequential_time"] == 11.0
+    assert schedule["estimated_time"] == 11.0
+
+    assert schedule["critical_path"] == [0, 1, 3]
+    assert schedule["critical_path_time"] == 6.0
+
+    levels = {item["vertex"]: item["level"] for item in schedule["vertices"]}
+    assert levels == {0: 0, 1: 1, 2: 1, 3: 2, 4: 0}
+
+    # predecessors finish before their successors start.
+    finish = {item["vertex"]: item["finish"] for item in schedule["vertices"]}
+    start = {item["vertex"]: item["start"] for item in schedule["vertices"]}
+
+    for source, target in _graph_index().get_edgelist():
+        assert finish[source] <= start[target]
+
+
+def test_parallel_schedule():
+    """Test the schedule with many workers (critical path first)."""
+    durations = {0: 1.0, 1: 4.0, 2: 2.0, 3: 1.0, 4: 3.0}
+    schedule = execution_schedule(_graph_index(), range(5), durations, parallelism=2)
+
+    assert schedule["estimated_time"] == 6.0
+    assert schedule["estimated_time"] >= schedule["critical_path_time"]
+
+    # the longest remaining path is started first.
+    assert schedule["vertices"][0]["vertex"] == 0
+    assert schedule["vertices"][0]["critical"]
+
+    critical = [item["vertex"] for item in schedule["vertices"] if item["critical"]]
+    assert sorted(critical) == [0, 1, 3]
+
+
+def test_partial_schedule():
+    """Test the schedule of some vertices (the others are considered up-to-date)."""
+    durations = {2: 2.0, 3: 1.0}
+    schedule = execution_schedule(_graph_index(), [3, 2], durations, parallelism=4)
+
+    assert [item["vertex"] for item in schedule["vertices"]] == [2, 3]
+    assert schedule["vertices"][1]["start"] == 2.0
+    assert schedule["estimated_time"] == 3.0
+
+    empty = execution_schedule(_graph_index(), [], {})
+
+    assert empty["vertices"] == []
+    assert empty["critical_path"] == []
+    assert empty["estimated_time"] == 0.0
@@ -0,0 +1,90 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the staging of files."""
+
+import hashlib
+import os
+
+import pytest
+
+from storm_workbench.api.backstage import staging
+
+
+@pytest.fixture()
+def source_file(tmp_path):
+    """File to be staged."""
+    source_file = tmp_path / "source.bin"
+    source_file.write_bytes(os.urandom(1000) + b"a" * 1000)
+    source_file.chmod(0o750)
+
+    return source_file
+
+
+def test_copy_file_hash(tmp_path, source_file):
+    """Test the copy of a file hashed while it is copied."""
+    target_file = tmp_path / "target.bin"
+    checksum = staging.copy_file(source_file, target_file, "sha256")
+
+    assert checksum == hashlib.sha256(source_file.read_bytes()).hexdigest()
+    assert target_file.read_bytes() == source_file.read_bytes()
+    assert target_file.stat().st_mode == source_file.stat().st_mode
+
+    # without algorithm: kernel copy (when supported).
+    assert staging.copy_file(source_file, target_file) is None
+    assert target_file.read_bytes() == source_file.read_bytes()
+
+
+def test_unsupported_kernel_copy(tmp_path, monkeypatch, source_file):
+    """Test the fallback copy when the kernel copies nothing."""
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *args: 0, raising=False)
+
+    target_file = tmp_path / "target.bin"
+    staging.copy_file(source_file, target_file)
+
+    assert target_file.read_bytes() == source_file.read_bytes()
+
+
+def test_incomplete_kernel_copy(tmp_path, monkeypatch, source_file):
+    """Test that a kernel copy that stops before the end of the file fails."""
+    copied = []
+
+    def _copy_file_range(source_fd, target_fd, count):
+        if copied:
+            return 0
+
+        copied.append(count)
+        return os.write(target_fd, os.read(source_fd, 100))
+
+    monkeypatch.setattr(os, "copy_file_range", _copy_file_range, raising=False)
+
+    with pytest.raises(OSError):
+        staging.copy_file(source_file, tmp_path / "target.bin")
+
+
+def test_stage_files(tmp_path, source_file):
+    """Test the staging of many files with a thread pool."""
+    staged = {}
+
+    results = staging.stage_files(
+        [
+            (source_file, tmp_path / "staging" / f"file{idx}.bin", algorithm)
+            for idx, algorithm in enumerate(["md5", None, "sha256"])
+        ],
+        jobs=2,
+        callback=lambda idx, result: staged.update({idx: result}),
+    )
+
+    assert [result["checksum"] for result in results] == [
+        hashlib.md5(source_file.read_bytes()).hexdigest(),
+        None,
+        hashlib.sha256(source_file.read_bytes()).hexdigest(),
+    ]
+    assert [result["size"] for result in results] == [2000] * 3
+    assert staged == dict(enumerate(results))
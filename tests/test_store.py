@@ -0,0 +1,136 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the content-addressed store."""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from storm_workbench.api.backstage.store import ContentStore
+
+
+def _file(path, content):
+    """Create a file with the given content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+    return path, hashlib.sha256(content).hexdigest()
+
+
+def test_add_deduplication(tmp_path):
+    """Test that files with the same content share the stored object."""
+    store = ContentStore(tmp_path / "objects")
+
+    first_file, checksum = _file(tmp_path / "a" / "package.zip", b"package")
+    second_file, _ = _file(tmp_path / "b" / "package.zip", b"package")
+
+    object_path = store.add(first_file, "sha256", checksum)
+
+    assert object_path == store.object_path("sha256", checksum)
+    assert store.add(second_file, "sha256") == object_path
+
+    assert os.path.samefile(first_file, object_path)
+    assert os.path.samefile(second_file, object_path)
+    assert object_path.stat().st_nlink == 3
+
+
+def test_concurrent_add(tmp_path):
+    """Test that the same object can be added by many threads at once."""
+    store = ContentStore(tmp_path / "objects")
+
+    files = [
+        _file(tmp_path / str(idx) / "package.zip", b"package")[0] for idx in range(8)
+    ]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        object_paths = set(executor.map(lambda file: store.add(file, "sha256"), files))
+
+    assert len(object_paths) == 1
+
+    object_path = object_paths.pop()
+    assert object_path.read_bytes() == b"package"
+    assert all(os.path.samefile(file, object_path) for file in files)
+
+    # no temporary file is left.
+    assert [path for path in tmp_path.rglob(".*") if path.is_file()] == []
+
+
+def test_add_invalid_checksum(tmp_path):
+    """Test that files that don't match their checksum are not stored."""
+    store = ContentStore(tmp_path / "objects")
+
+    file, _ = _file(tmp_path / "package.zip", b"package")
+
+    with pytest.raises(ValueError):
+        store.add(file, "sha256", hashlib.sha256(b"other").hexdigest())
+
+    assert not list(store.path.rglob("*"))
+
+
+def test_unshare_and_attach(tmp_path):
+    """Test that unshared files are rewritten without modifying the stored object."""
+    store = ContentStore(tmp_path / "objects")
+
+    file, checksum = _file(tmp_path / "package.zip", b"package")
+    object_path = store.add(file, "sha256")
+
+    store.unshare([file])
+
+    assert not os.path.samefile(file, object_path)
+
+    file.write_bytes(b"rewritten")
+    assert object_path.read_bytes() == b"package"
+
+    # the rewritten file is stored again and the missing file is restored.
+    missing_file = tmp_path / "restored" / "package.zip"
+    rewritten_checksum = hashlib.sha256(b"rewritten").hexdigest()
+
+    store.attach(
+        [(file, "sha256", rewritten_checksum), (missing_file, "sha256", checksum)]
+    )
+
+    assert store.contains("sha256", rewritten_checksum)
+    assert os.path.samefile(missing_file, object_path)
+
+
+def test_discard_modified(tmp_path):
+    """Test that objects modified in place (through a linked file) are removed."""
+    store = ContentStore(tmp_path / "objects")
+
+    file, checksum = _file(tmp_path / "package.zip", b"package")
+    store.add(file, "sha256")
+
+    objects_state = store.stat_objects([("sha256", checksum)])
+
+    with open(file, "ab") as ofile:
+        ofile.write(b" modified")
+
+    store.discard_modified(objects_state)
+
+    assert not store.contains("sha256", checksum)
+    assert file.read_bytes() == b"package modified"
+
+
+def test_prune(tmp_path):
+    """Test that only the referenced objects are kept."""
+    store = ContentStore(tmp_path / "objects")
+
+    _, used_checksum = _file(tmp_path / "used.zip", b"used")
+    _, unused_checksum = _file(tmp_path / "unused.zip", b"unused package")
+
+    store.add(tmp_path / "used.zip", "sha256")
+    store.add(tmp_path / "unused.zip", "sha256")
+
+    assert store.prune([("sha256", used_checksum)]) == len(b"unused package")
+
+    assert store.contains("sha256", used_checksum)
+    assert not store.contains("sha256", unused_checksum)
+    assert (tmp_path / "unused.zip").read_bytes() == b"unused package"
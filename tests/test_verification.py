@@ -0,0 +1,107 @@
+#
+# This file is part of Workbench manager for Storm platform.
+# Copyright (C) 2021 INPE.
+#
+# Workbench manager for Storm platform is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Unit-test for the verification of the reproduced outputs."""
+
+import hashlib
+import json
+
+from igraph import Graph
+
+from storm_workbench.api.backstage.verification import (
+    save_verification_report, verification_report, verify_outputs)
+
+
+def _output(key, content):
+    """Description of an output recorded in a compendium."""
+    return dict(
+        key=key,
+        algorithm="sha256",
+        checksum=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+    )
+
+
+def _graph_index() -> Graph:
+    """Create a graph index with the recorded outputs of two compendia."""
+    graph = Graph(directed=True)
+
+    graph.add_vertex(
+        name="first",
+        outputs=[_output("data/result.txt", "first"), _output("/data/log.txt", "log")],
+    )
+    graph.add_vertex(name="second", outputs=[_output("data/result.txt", "second")])
+
+    graph.add_edge(0, 1)
+
+    return graph
+
+
+def _reproduce(results_dir, name, key, content):
+    """Write a reproduced output in the results directory of a compendium."""
+    output_file = results_dir / name / key
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    output_file.write_text(content)
+
+
+def test_verify_outputs(tmp_path):
+    """Test the verification of the reproduced outputs by key."""
+    _reproduce(tmp_path, "first", "data/result.txt", "first")
+    _reproduce(tmp_path, "first", "data/log.txt", "log")
+    _reproduce(tmp_path, "second", "data/result.txt", "changed")
+
+    compendia = verify_outputs(_graph_index(), tmp_path, jobs=2)
+
+    assert [compendium["status"] for compendium in compendia] == ["match", "mismatch"]
+    assert [output["file"] for output in compendia[0]["outputs"]] == [
+        "data/result.txt",
+        "data/log.txt",
+    ]
+
+    mismatch = compendia[1]["outputs"][0]
+
+    assert mismatch["status"] == "mismatch"
+    assert mismatch["path"] == str(tmp_path / "second" / "data" / "result.txt")
+    assert mismatch["obtained"] == hashlib.sha256(b"changed").hexdigest()
+
+
+def test_verify_missing_outputs(tmp_path):
+    """Test that outputs of other compendia are not used (missing outputs)."""
+    _reproduce(tmp_path, "first", "data/result.txt", "first")
+    _reproduce(tmp_path, "other", "data/log.txt", "log")
+
+    compendia = verify_outputs(_graph_index(), tmp_path, vertices=[0])
+
+    assert len(compendia) == 1
+    assert compendia[0]["status"] == "mismatch"
+    assert [output["status"] for output in compendia[0]["outputs"]] == [
+        "match",
+        "missing",
+    ]
+    assert compendia[0]["outputs"][1]["obtained"] is None
+
+
+def test_verification_report(tmp_path):
+    """Test the verification report summary (and its file)."""
+    _reproduce(tmp_path, "first", "data/result.txt", "first")
+    _reproduce(tmp_path, "first", "data/log.txt", "log")
+
+    compendia = verify_outputs(_graph_index(), tmp_path, vertices=[0])
+    compendia.append(dict(name="second", status="skipped", outputs=[]))
+
+    report = verification_report(compendia)
+
+    assert report["summary"] == {
+        "compendia": 2,
+        "match": 1,
+        "mismatch": 0,
+        "skipped": 1,
+    }
+
+    report_file = save_verification_report(report, tmp_path / "verification.json")
+    assert json.loads(report_file.read_text()) == report